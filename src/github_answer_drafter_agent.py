@@ -5,18 +5,162 @@ This module defines the answer drafter agent that processes research findings
 and formulates well-structured answers based on the collected information.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import TYPE_CHECKING, Dict, Any, AsyncIterator, Callable, Iterator, List, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
 import json
-from dotenv import load_dotenv
+import re
+import time
 import os
 
-# Import Azure AI SDK for GitHub model
-from azure.ai.inference import ChatCompletionsClient
-from azure.ai.inference.models import SystemMessage, UserMessage
-from azure.core.credentials import AzureKeyCredential
+from github_compaction import STOPWORDS, compact_findings
+from github_findings import ResearchFindings, format_findings, format_source
+from github_models import answer_check, budget_exhausted, resolve_fast_model, resolve_model
+from github_scheduler import CallScheduler, default_scheduler
+from github_completion_cache import (
+    CompletionCache, complete_cached, acomplete_cached, stream_cached, astream_cached
+)
+from github_client_registry import DEFAULT_ENDPOINT, get_client, get_async_client, load_environment
+from github_tracing import annotate, span
+
+# The Azure AI SDK is imported where it is used to keep startup fast
+if TYPE_CHECKING:
+    from azure.ai.inference import ChatCompletionsClient
+    from azure.ai.inference.aio import ChatCompletionsClient as AsyncChatCompletionsClient
+
+DRAFTER_SYSTEM_PROMPT = """You are an expert answer drafter responsible for creating comprehensive, 
+                accurate, and well-structured responses based on research findings.
+                
+                For each set of research findings you receive:
+                1. Synthesize the key information into a coherent narrative
+                2. Organize the content logically with appropriate headings and structure
+                3. Cite sources appropriately when presenting specific facts or claims; when a source has
+                   an ID such as [S2], cite it with that ID in square brackets
+                4. Ensure the answer is comprehensive but concise
+                5. Use language that is clear, professional, and accessible
+                
+                Your goal is to transform raw research into a polished, informative response that 
+                directly addresses the original query."""
+
+SECTION_SYSTEM_PROMPT = """You are an expert answer drafter writing one section of a larger report.
+                Write only the section you are given, starting with its Markdown heading, and base it
+                on the findings and notes provided for it. Cite sources with their labels in square
+                brackets, e.g. [2] or [S2], using only the labels listed. Do not add an introduction or a
+                conclusion for the whole report."""
+
+# Words in URLs and titles that say nothing about a source's topic
+SOURCE_NOISE = {"http", "https", "www", "com", "org", "net", "html", "htm", "index", "php"}
+
+_WORD = re.compile(r"[a-z0-9]+")
+_CITATION = re.compile(r"\[(S?\d+)\]")
+
+
+def _terms(text: str) -> Set[str]:
+    return {word for word in _WORD.findall(text.lower())
+            if word not in STOPWORDS and word not in SOURCE_NOISE and len(word) > 2}
+
+
+def _source_text(source: Any) -> str:
+    if isinstance(source, dict):
+        return " ".join(str(value) for value in source.values() if isinstance(value, str))
+    return str(source)
+
+
+def build_outline(findings: ResearchFindings, max_sections: int = 6) -> List[Dict[str, Any]]:
+    """
+    Split findings into report sections, one per subtopic of the detailed notes
+
+    The first section is an overview built from all main findings. Every other section gets the
+    notes of one subtopic, the main findings that share the most terms with it, and the sources
+    that share terms with it (all sources if none do). Sources are labelled with their registry
+    ID when they have one and with their position in findings.sources otherwise, so citations
+    are consistent across sections.
+    Subtopics beyond max_sections are merged into the last section.
+
+    Args:
+        findings (ResearchFindings): The research findings
+        max_sections (int): Maximum number of subtopic sections
+
+    Returns:
+        List[Dict[str, Any]]: Sections with 'title', 'findings', 'notes' and 'sources' (label, source)
+        pairs; empty when the notes have fewer than two subtopics
+    """
+    notes = findings.detailed_notes
+    if not isinstance(notes, dict) or len(notes) < 2:
+        return []
+
+    topics = [(str(title), value if isinstance(value, str) else json.dumps(value, ensure_ascii=False))
+              for title, value in notes.items()]
+    if len(topics) > max_sections:
+        merged = "\n\n".join(f"{title}: {text}" for title, text in topics[max_sections - 1:])
+        topics = topics[:max_sections - 1] + [("Further details", merged)]
+
+    numbered = [(source["id"] if isinstance(source, dict) and source.get("id") else str(number), source)
+                for number, source in enumerate(findings.sources, 1)]
+    source_terms = [_terms(_source_text(source)) for _, source in numbered]
+    sections = [{"title": "Overview", "findings": list(findings.main_findings), "notes": None, "sources": numbered}]
+    topic_terms = []
+    for title, text in topics:
+        terms = _terms(f"{title} {text}")
+        topic_terms.append(terms)
+        relevant = [item for item, other in zip(numbered, source_terms) if terms & other]
+        sections.append({"title": title, "findings": [], "notes": text, "sources": relevant or numbered})
+
+    for finding in findings.main_findings:
+        overlaps = [len(_terms(str(finding)) & terms) for terms in topic_terms]
+        best = max(range(len(overlaps)), key=lambda i: overlaps[i])
+        if overlaps[best]:
+            sections[best + 1]["findings"].append(finding)
+    return sections
+
+
+class AnswerStream:
+    """
+    Iterator over the chunks of a streamed answer.
+    
+    Iterate with ``for`` (or ``async for`` when created by ``astream_answer``) to receive
+    text chunks as they arrive. Once the stream closes, ``answer`` holds the packaged
+    answer, with time-to-first-token and total stream time in its metadata.
+    """
+    
+    def __init__(self, chunks: Any, package: Callable[[str], Dict[str, Any]]):
+        """
+        Args:
+            chunks (Any): Iterator or async iterator of text chunks
+            package (Callable[[str], Dict[str, Any]]): Builds the answer dict from the full text
+        """
+        self._chunks = chunks
+        self._package = package
+        self._parts = []
+        self._started = time.perf_counter()
+        self.time_to_first_token = None
+        self.stream_duration = None
+        self.answer = None
+    
+    def _record(self, chunk: str) -> None:
+        if self.time_to_first_token is None:
+            self.time_to_first_token = time.perf_counter() - self._started
+        self._parts.append(chunk)
+    
+    def _finish(self) -> None:
+        self.stream_duration = time.perf_counter() - self._started
+        self.answer = self._package("".join(self._parts))
+        self.answer["metadata"]["time_to_first_token"] = self.time_to_first_token
+        self.answer["metadata"]["stream_duration"] = self.stream_duration
+    
+    def __iter__(self) -> Iterator[str]:
+        for chunk in self._chunks:
+            self._record(chunk)
+            yield chunk
+        self._finish()
+    
+    async def __aiter__(self) -> AsyncIterator[str]:
+        async for chunk in self._chunks:
+            self._record(chunk)
+            yield chunk
+        self._finish()
 
-# Load environment variables
-load_dotenv()
 
 class AnswerDrafterAgent:
     """
@@ -24,79 +168,444 @@ class AnswerDrafterAgent:
     (GitHub-only version)
     """
     
-    def __init__(self, model_name: str = "gpt-4o-mini", api_type: str = "github"):
+    def __init__(self, model_name: Optional[str] = None, api_type: str = "github",
+                 completion_cache: Optional[CompletionCache] = None, token_budget: Optional[int] = None,
+                 scheduler: Optional[CallScheduler] = None, fast_model: Optional[str] = None,
+                 cascade: bool = False, sectioned: bool = False, max_sections: int = 6):
         """
         Initialize the answer drafter agent with the specified model.
         
         Args:
-            model_name (str): The model to use for the agent (ignored in GitHub-only version)
+            model_name (Optional[str]): The model that drafts the answer (defaults to GITHUB_DRAFT_MODEL,
+                then GITHUB_MODEL)
             api_type (str): The API provider type (only 'github' supported in this version)
+            completion_cache (Optional[CompletionCache]): Cache consulted before calling the model
+            token_budget (Optional[int]): Compact the research findings to this many tokens before
+                drafting, or None to send them verbatim
+            scheduler (Optional[CallScheduler]): Scheduler for model calls (defaults to the
+                process-wide scheduler)
+            fast_model (Optional[str]): Smaller model (defaults to GITHUB_FAST_MODEL) used when the query's
+                latency budget has run out, and tried first when cascade is set
+            cascade (bool): Draft with the fast model first and escalate to the main model when the
+                answer is too short
+            sectioned (bool): Draft the sections of the outline concurrently and assemble them, when the
+                findings have at least two subtopics
+            max_sections (int): Maximum number of subtopic sections in sectioned mode
         """
-        # Use the model specified in the .env file
-        self.github_model = os.getenv("GITHUB_MODEL", "openai/gpt-4.1")
-        self.github_token = os.getenv("GITHUB_TOKEN", "")
-        self.endpoint = "https://models.github.ai/inference"
+        load_environment()
         
-        # Initialize Azure SDK client for GitHub AI model
-        self.github_client = ChatCompletionsClient(
-            endpoint=self.endpoint,
-            credential=AzureKeyCredential(self.github_token),
-        )
+        self.github_model = resolve_model("draft", model_name)
+        self.fast_model = resolve_fast_model(fast_model)
+        self.cascade = cascade
+        self.sectioned = sectioned
+        self.max_sections = max_sections
+        self.github_token = os.getenv("GITHUB_TOKEN", "")
+        self.endpoint = os.getenv("GITHUB_ENDPOINT", DEFAULT_ENDPOINT)
         
+        self.completion_cache = completion_cache
+        self.token_budget = token_budget
+        self.scheduler = scheduler or default_scheduler()
         self.model_name = self.github_model
         self.api_type = "github"  # Force GitHub API type
     
-    def draft_answer(self, query: str, research_findings: Dict[str, Any]) -> Dict[str, Any]:
+    @property
+    def github_client(self) -> "ChatCompletionsClient":
         """
-        Draft a comprehensive answer based on research findings
+        The shared, pooled GitHub model client for this endpoint and token
+        """
+        return get_client(self.endpoint, self.github_token)
+    
+    def _get_async_client(self) -> "AsyncChatCompletionsClient":
+        """
+        Return the shared async GitHub model client for the running event loop
+        
+        Returns:
+            AsyncChatCompletionsClient: The async inference client
+        """
+        return get_async_client(self.endpoint, self.github_token)
+    
+    def _build_messages(self, query: str, research_findings: Dict[str, Any],
+                        info: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """
+        Build the chat messages used to draft the answer
         
         Args:
             query (str): The original research query
             research_findings (Dict[str, Any]): The structured research findings
+            info (Optional[Dict[str, Any]]): Receives compaction statistics when a token budget is set
             
         Returns:
-            Dict[str, Any]: The drafted answer with additional metadata
+            List[Any]: The system and user messages for the completion call
         """
-        # Convert research findings to a string if it's not already
-        if isinstance(research_findings, dict):
+        from azure.ai.inference.models import SystemMessage, UserMessage
+        
+        if self.token_budget:
+            research_findings, stats = compact_findings(query, research_findings, self.token_budget)
+            if info is not None:
+                info["compaction"] = stats
+        
+        # Read the schema fields directly when the findings are structured
+        findings = ResearchFindings.from_any(research_findings)
+        if findings is not None:
+            research_str = format_findings(findings)
+        elif isinstance(research_findings, dict):
             research_str = json.dumps(research_findings)
         else:
             research_str = str(research_findings)
         
-        # Generate the answer draft using the GitHub model
-        response = self.github_client.complete(
-            messages=[
-                SystemMessage(content="""You are an expert answer drafter responsible for creating comprehensive, 
-                accurate, and well-structured responses based on research findings.
-                
-                For each set of research findings you receive:
-                1. Synthesize the key information into a coherent narrative
-                2. Organize the content logically with appropriate headings and structure
-                3. Cite sources appropriately when presenting specific facts or claims
-                4. Ensure the answer is comprehensive but concise
-                5. Use language that is clear, professional, and accessible
-                
-                Your goal is to transform raw research into a polished, informative response that 
-                directly addresses the original query."""),
-                UserMessage(content=f"""Original Query: {query}
+        return [
+            SystemMessage(content=DRAFTER_SYSTEM_PROMPT),
+            UserMessage(content=f"""Original Query: {query}
                 
                 Research Findings: {research_str}
                 
                 Please draft a comprehensive answer based on this information.""")
-            ],
-            temperature=0.7,
-            top_p=1.0,
-            model=self.github_model
-        )
-        answer_content = response.choices[0].message.content
+        ]
+    
+    def _completion_params(self, model: str) -> Dict[str, Any]:
+        """
+        Return the parameters of the drafting completion call
+        
+        Args:
+            model (str): The model to call
+            
+        Returns:
+            Dict[str, Any]: Keyword arguments for the completion call
+        """
+        return {"temperature": 0.7, "top_p": 1.0, "model": model}
+    
+    def _select_model(self, deadline: Optional[float], streaming: bool = False) -> Tuple[str, bool, bool]:
+        """
+        Choose the model that drafts first
+        
+        Args:
+            deadline (Optional[float]): time.monotonic() value at which the query's latency budget runs out
+            streaming (bool): Whether the answer is streamed, which rules out escalation
+            
+        Returns:
+            Tuple[str, bool, bool]: The model, whether its answer is checked for escalation, and
+            whether the latency budget had run out
+        """
+        fast_model = self.fast_model if self.fast_model and self.fast_model != self.github_model else None
+        exhausted = budget_exhausted(deadline)
+        if fast_model and exhausted:
+            return fast_model, False, True
+        if fast_model and self.cascade and not streaming:
+            return fast_model, True, False
+        return self.github_model, False, exhausted
+    
+    @staticmethod
+    def _record_model(info: Optional[Dict[str, Any]], model: str, escalated: Optional[str], exhausted: bool) -> None:
+        if info is not None:
+            info["model"] = {"model": model, "escalated": escalated, "budget_exhausted": exhausted}
+    
+    def _package_answer(self, query: str, research_findings: Dict[str, Any], answer_content: str,
+                        model: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Package the drafted answer with its metadata
         
-        # Package the answer with metadata
+        Args:
+            query (str): The original research query
+            research_findings (Dict[str, Any]): The structured research findings
+            answer_content (str): The drafted answer text
+            model (Optional[str]): The model that drafted it (defaults to the agent's model)
+            
+        Returns:
+            Dict[str, Any]: The drafted answer with additional metadata
+        """
+        findings = ResearchFindings.from_any(research_findings)
         return {
             "original_query": query,
             "answer": answer_content,
-            "sources": research_findings.get("sources", []) if isinstance(research_findings, dict) else [],
+            "sources": findings.sources if findings is not None else [],
             "metadata": {
-                "model_used": self.model_name,
+                "model_used": model or self.model_name,
                 "timestamp": None  # Can be filled in by the calling application
             }
-        }
\ No newline at end of file
+        }
+    
+    def _outline(self, query: str, research_findings: Dict[str, Any],
+                 info: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Build the section outline for sectioned drafting
+        
+        Args:
+            query (str): The original research query
+            research_findings (Dict[str, Any]): The structured research findings
+            info (Optional[Dict[str, Any]]): Receives compaction statistics when a token budget is set
+            
+        Returns:
+            List[Dict[str, Any]]: The sections, or an empty list if the findings cannot be sectioned
+        """
+        if not self.sectioned:
+            return []
+        findings = ResearchFindings.from_any(research_findings)
+        if findings is None:
+            return []
+        outline = build_outline(findings, self.max_sections)
+        if outline and self.token_budget:
+            # The budget applies to the findings as a whole, before they are split into sections
+            compacted, stats = compact_findings(query, findings.model_dump(), self.token_budget)
+            if info is not None:
+                info["compaction"] = stats
+            outline = build_outline(ResearchFindings.from_any(compacted) or findings, self.max_sections)
+        return outline
+    
+    def _section_messages(self, query: str, section: Dict[str, Any]) -> List[Any]:
+        """
+        Build the chat messages used to draft one section
+        
+        Args:
+            query (str): The original research query
+            section (Dict[str, Any]): The section from the outline
+            
+        Returns:
+            List[Any]: The system and user messages for the completion call
+        """
+        from azure.ai.inference.models import SystemMessage, UserMessage
+        
+        parts = [f"Original Query: {query}"]
+        if section["notes"] is None:
+            parts.append(f"Section: {section['title']} (a concise overview that answers the query)")
+        else:
+            parts.append(f"Section: {section['title']}")
+        if section["findings"]:
+            parts.append("Findings:\n" + "\n".join(f"- {finding}" for finding in section["findings"]))
+        if section["notes"]:
+            parts.append(f"Notes:\n{section['notes']}")
+        if section["sources"]:
+            # Registered sources already carry their [S#] label
+            parts.append("Sources:\n" + "\n".join(
+                format_source(source) if label.startswith("S") else f"{label}. {format_source(source)}"
+                for label, source in section["sources"]
+            ))
+        return [
+            SystemMessage(content=SECTION_SYSTEM_PROMPT),
+            UserMessage(content="\n\n".join(parts))
+        ]
+    
+    @staticmethod
+    def _assemble(outline: List[Dict[str, Any]], texts: List[Any]) -> str:
+        """
+        Join drafted sections in outline order
+        
+        Every section starts with a heading, and citations of labels outside the source list
+        are dropped so that citations stay consistent with the answer's sources.
+        
+        Args:
+            outline (List[Dict[str, Any]]): The sections
+            texts (List[Any]): The drafted text of each section
+            
+        Returns:
+            str: The assembled answer
+        """
+        labels = {label for label, _ in outline[0]["sources"]}
+        parts = []
+        for section, text in zip(outline, texts):
+            text = _CITATION.sub(lambda m: m.group(0) if m.group(1) in labels else "", str(text or "").strip())
+            if not text.startswith("#"):
+                text = f"## {section['title']}\n\n{text}"
+            parts.append(text)
+        return "\n\n".join(parts)
+    
+    def _package_sections(self, query: str, research_findings: Dict[str, Any], outline: List[Dict[str, Any]],
+                          texts: List[Any], model: str, exhausted: bool,
+                          info: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        self._record_model(info, model, None, exhausted)
+        answer = self._package_answer(query, research_findings, self._assemble(outline, texts), model)
+        answer["metadata"]["sections"] = [section["title"] for section in outline]
+        return answer
+    
+    def draft_sections(self, query: str, research_findings: Dict[str, Any], outline: List[Dict[str, Any]],
+                       info: Optional[Dict[str, Any]] = None, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Draft every section of an outline concurrently and assemble the answer
+        
+        Sections are not escalated by the model cascade; the fast model is only used once the
+        latency budget has run out.
+        
+        Args:
+            query (str): The original research query
+            research_findings (Dict[str, Any]): The structured research findings
+            outline (List[Dict[str, Any]]): The sections, as built by build_outline
+            info (Optional[Dict[str, Any]]): Receives the model that served the call
+            deadline (Optional[float]): time.monotonic() value at which the query's latency budget runs out
+            
+        Returns:
+            Dict[str, Any]: The drafted answer with additional metadata, including the section titles
+        """
+        model, _, exhausted = self._select_model(deadline, streaming=True)
+        params = self._completion_params(model)
+        
+        def draft(section: Dict[str, Any]) -> Any:
+            with span("draft_section", section=section["title"][:60], model=model):
+                return complete_cached(self.github_client, self.completion_cache,
+                                       self._section_messages(query, section), scheduler=self.scheduler, **params)
+        
+        annotate(sections=len(outline))
+        with ThreadPoolExecutor(max_workers=len(outline)) as pool:
+            # Each worker runs in a copy of the caller's context so its spans join the active trace
+            futures = [pool.submit(contextvars.copy_context().run, draft, section) for section in outline]
+            texts = [future.result() for future in futures]
+        return self._package_sections(query, research_findings, outline, texts, model, exhausted, info)
+    
+    async def adraft_sections(self, query: str, research_findings: Dict[str, Any], outline: List[Dict[str, Any]],
+                              info: Optional[Dict[str, Any]] = None,
+                              deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Draft every section of an outline concurrently on the event loop and assemble the answer
+        
+        Args:
+            query (str): The original research query
+            research_findings (Dict[str, Any]): The structured research findings
+            outline (List[Dict[str, Any]]): The sections, as built by build_outline
+            info (Optional[Dict[str, Any]]): Receives the model that served the call
+            deadline (Optional[float]): time.monotonic() value at which the query's latency budget runs out
+            
+        Returns:
+            Dict[str, Any]: The drafted answer with additional metadata, including the section titles
+        """
+        model, _, exhausted = self._select_model(deadline, streaming=True)
+        params = self._completion_params(model)
+        
+        async def draft(section: Dict[str, Any]) -> Any:
+            with span("draft_section", section=section["title"][:60], model=model):
+                return await acomplete_cached(self._get_async_client(), self.completion_cache,
+                                              self._section_messages(query, section),
+                                              scheduler=self.scheduler, **params)
+        
+        annotate(sections=len(outline))
+        texts = await asyncio.gather(*(draft(section) for section in outline))
+        return self._package_sections(query, research_findings, outline, list(texts), model, exhausted, info)
+    
+    def draft_answer(self, query: str, research_findings: Dict[str, Any],
+                     info: Optional[Dict[str, Any]] = None, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Draft a comprehensive answer based on research findings
+        
+        In sectioned mode, findings with at least two subtopics are drafted with draft_sections.
+        
+        Args:
+            query (str): The original research query
+            research_findings (Dict[str, Any]): The structured research findings
+            info (Optional[Dict[str, Any]]): Receives details about the call, such as compaction statistics
+                and the model that served it
+            deadline (Optional[float]): time.monotonic() value at which the query's latency budget runs out
+            
+        Returns:
+            Dict[str, Any]: The drafted answer with additional metadata
+        """
+        outline = self._outline(query, research_findings, info)
+        if outline:
+            return self.draft_sections(query, research_findings, outline, info, deadline)
+        
+        messages = self._build_messages(query, research_findings, info)
+        model, check, exhausted = self._select_model(deadline)
+        
+        # Generate the answer draft using the GitHub model
+        with span("draft_completion", model=model):
+            answer_content = complete_cached(self.github_client, self.completion_cache, messages,
+                                             scheduler=self.scheduler, **self._completion_params(model))
+        escalated = answer_check(answer_content) if check else None
+        if escalated and budget_exhausted(deadline):
+            escalated, exhausted = None, True
+        if escalated:
+            model = self.github_model
+            with span("draft_completion", model=model, escalated=escalated):
+                answer_content = complete_cached(self.github_client, self.completion_cache, messages,
+                                                 scheduler=self.scheduler, **self._completion_params(model))
+        self._record_model(info, model, escalated, exhausted)
+        return self._package_answer(query, research_findings, answer_content, model)
+    
+    async def adraft_answer(self, query: str, research_findings: Dict[str, Any],
+                            info: Optional[Dict[str, Any]] = None, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Draft a comprehensive answer using the async inference client
+        
+        In sectioned mode, findings with at least two subtopics are drafted with adraft_sections.
+        
+        Args:
+            query (str): The original research query
+            research_findings (Dict[str, Any]): The structured research findings
+            info (Optional[Dict[str, Any]]): Receives details about the call, such as compaction statistics
+                and the model that served it
+            deadline (Optional[float]): time.monotonic() value at which the query's latency budget runs out
+            
+        Returns:
+            Dict[str, Any]: The drafted answer with additional metadata
+        """
+        outline = self._outline(query, research_findings, info)
+        if outline:
+            return await self.adraft_sections(query, research_findings, outline, info, deadline)
+        
+        messages = self._build_messages(query, research_findings, info)
+        model, check, exhausted = self._select_model(deadline)
+        
+        with span("draft_completion", model=model):
+            answer_content = await acomplete_cached(self._get_async_client(), self.completion_cache, messages,
+                                                    scheduler=self.scheduler, **self._completion_params(model))
+        escalated = answer_check(answer_content) if check else None
+        if escalated and budget_exhausted(deadline):
+            escalated, exhausted = None, True
+        if escalated:
+            model = self.github_model
+            with span("draft_completion", model=model, escalated=escalated):
+                answer_content = await acomplete_cached(self._get_async_client(), self.completion_cache, messages,
+                                                        scheduler=self.scheduler, **self._completion_params(model))
+        self._record_model(info, model, escalated, exhausted)
+        return self._package_answer(query, research_findings, answer_content, model)
+    
+    def stream_answer(self, query: str, research_findings: Dict[str, Any],
+                      info: Optional[Dict[str, Any]] = None, deadline: Optional[float] = None) -> AnswerStream:
+        """
+        Draft an answer as a stream of text chunks
+        
+        Streamed answers are not escalated, since their chunks have already been delivered; the
+        fast model is only used once the latency budget has run out.
+        
+        Args:
+            query (str): The original research query
+            research_findings (Dict[str, Any]): The structured research findings
+            info (Optional[Dict[str, Any]]): Receives details about the call, such as compaction statistics
+                and the model that served it
+            deadline (Optional[float]): time.monotonic() value at which the query's latency budget runs out
+            
+        Returns:
+            AnswerStream: Iterable of chunks; its ``answer`` is set once the stream closes
+        """
+        model, _, exhausted = self._select_model(deadline, streaming=True)
+        self._record_model(info, model, None, exhausted)
+        chunks = stream_cached(
+            self.github_client,
+            self.completion_cache,
+            self._build_messages(query, research_findings, info),
+            scheduler=self.scheduler,
+            **self._completion_params(model)
+        )
+        return AnswerStream(chunks, lambda text: self._package_answer(query, research_findings, text, model))
+    
+    def astream_answer(self, query: str, research_findings: Dict[str, Any],
+                       info: Optional[Dict[str, Any]] = None, deadline: Optional[float] = None) -> AnswerStream:
+        """
+        Draft an answer as an async stream of text chunks
+        
+        Args:
+            query (str): The original research query
+            research_findings (Dict[str, Any]): The structured research findings
+            info (Optional[Dict[str, Any]]): Receives details about the call, such as compaction statistics
+                and the model that served it
+            deadline (Optional[float]): time.monotonic() value at which the query's latency budget runs out
+            
+        Returns:
+            AnswerStream: Async iterable of chunks; its ``answer`` is set once the stream closes
+        """
+        model, _, exhausted = self._select_model(deadline, streaming=True)
+        self._record_model(info, model, None, exhausted)
+        chunks = astream_cached(
+            self._get_async_client(),
+            self.completion_cache,
+            self._build_messages(query, research_findings, info),
+            scheduler=self.scheduler,
+            **self._completion_params(model)
+        )
+        return AnswerStream(chunks, lambda text: self._package_answer(query, research_findings, text, model))
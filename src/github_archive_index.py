@@ -0,0 +1,162 @@
+"""
+Archive Index Module
+
+This module maintains a local full-text index (SQLite FTS5) over saved research results. Each
+result is indexed once when it is saved, so searching the archive never rescans the output
+directory, and queries return ranked results with highlighted snippets.
+"""
+
+from typing import Dict, Any, List, Optional
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+def _source_urls(sources: Any) -> List[str]:
+    """
+    Collect the URLs mentioned by a list of sources
+    """
+    urls = []
+    for source in sources or []:
+        if isinstance(source, dict):
+            url = source.get("url") or source.get("link")
+            if url:
+                urls.append(str(url))
+        elif isinstance(source, str):
+            urls.append(source)
+    return urls
+
+
+class ArchiveIndex:
+    """
+    Incrementally maintained FTS5 index over queries, answers, findings and source URLs.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the archive index.
+
+        Args:
+            path (str): Path of the SQLite database file
+
+        Raises:
+            RuntimeError: If the SQLite build has no FTS5 support
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        try:
+            # Text lives in the FTS table; the keyed table maps each row back to its file
+            self._conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS archive USING fts5(
+                    query, answer, findings, sources,
+                    tokenize = 'porter unicode61'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            self._conn.close()
+            raise RuntimeError(f"SQLite FTS5 is required for the archive index: {e}") from e
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS archive_documents (
+                id INTEGER PRIMARY KEY,
+                location TEXT NOT NULL UNIQUE,
+                saved_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def add(self, results: Dict[str, Any], location: str, saved_at: Optional[float] = None) -> None:
+        """
+        Index one saved result
+
+        Args:
+            results (Dict[str, Any]): The workflow state that was saved
+            location (str): Where the result is stored (e.g. the JSON file path)
+            saved_at (Optional[float]): Save time as a Unix timestamp (defaults to now)
+        """
+        answer = results.get("answer") or {}
+        findings = results.get("research_results")
+        findings_text = findings if isinstance(findings, str) else json.dumps(findings, ensure_ascii=False)
+        sources = answer.get("sources")
+        if not sources and isinstance(findings, dict):
+            sources = findings.get("sources")
+
+        with self._lock:
+            # Re-saving the same location replaces its previous entry
+            row = self._conn.execute(
+                "SELECT id FROM archive_documents WHERE location = ?", (location,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute("DELETE FROM archive WHERE rowid = ?", (row[0],))
+                self._conn.execute("DELETE FROM archive_documents WHERE id = ?", (row[0],))
+
+            cursor = self._conn.execute(
+                "INSERT INTO archive_documents (location, saved_at) VALUES (?, ?)",
+                (location, saved_at if saved_at is not None else time.time())
+            )
+            self._conn.execute(
+                "INSERT INTO archive (rowid, query, answer, findings, sources) VALUES (?, ?, ?, ?, ?)",
+                (
+                    cursor.lastrowid,
+                    results.get("query", ""),
+                    answer.get("answer") or "",
+                    findings_text or "",
+                    " ".join(_source_urls(sources)),
+                )
+            )
+            self._conn.commit()
+
+    def search(self, text: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search the archive
+
+        Args:
+            text (str): Free-text search terms
+            limit (int): Maximum number of results
+
+        Returns:
+            List[Dict[str, Any]]: Matches ordered by relevance, with query, location,
+            save time, BM25 score and a highlighted snippet
+        """
+        # Quote each term so user input is never parsed as FTS5 query syntax
+        terms = [term.replace('"', '""') for term in text.split()]
+        if not terms:
+            return []
+        match = " ".join(f'"{term}"' for term in terms)
+
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT archive.query, documents.location, documents.saved_at,
+                       bm25(archive, 10.0, 2.0, 1.0, 1.0) AS score,
+                       snippet(archive, -1, '[', ']', '...', 16) AS snippet
+                FROM archive
+                JOIN archive_documents AS documents ON documents.id = archive.rowid
+                WHERE archive MATCH ?
+                ORDER BY score
+                LIMIT ?
+                """,
+                (match, limit)
+            ).fetchall()
+
+        return [
+            {"query": query, "location": location, "saved_at": saved_at, "score": -score, "snippet": snippet}
+            for query, location, saved_at, score, snippet in rows
+        ]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM archive_documents").fetchone()[0]
+
+    def close(self) -> None:
+        """
+        Close the underlying database connection
+        """
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,334 @@
+"""
+Batch Runner Module
+
+This module runs a file of queries through GithubResearchWorkflow on a worker pool and checkpoints
+every query after each completed stage (researched, completed) in SQLite. A restarted run skips the
+queries that already finished and resumes the others from their last completed stage, so a failed
+drafting call is retried without searching again.
+
+    python src/github_batch.py queries.txt --checkpoints data/batch.sqlite3 --jsonl data/batch.jsonl
+"""
+
+from typing import Dict, Any, Iterable, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from github_client_registry import load_environment
+from github_orchestrator import GithubResearchWorkflow
+from github_result_store import JsonlResultStore, ResultSink
+
+# Checkpoint stages, in the order a query passes through them
+STAGES = ["pending", "researched", "completed"]
+
+
+def query_key(query: str) -> str:
+    """
+    Identify a query independently of its position in the queries file
+
+    Args:
+        query (str): The research query
+
+    Returns:
+        str: A stable key for the whitespace-normalized query
+    """
+    return hashlib.sha256(" ".join(query.split()).encode("utf-8")).hexdigest()[:32]
+
+
+def read_queries(path: str) -> List[str]:
+    """
+    Read a queries file: one query per line, blank lines and lines starting with '#' ignored
+
+    Args:
+        path (str): Path of the queries file
+
+    Returns:
+        List[str]: The queries
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+class CheckpointStore:
+    """
+    SQLite record of the last completed stage of every query in a batch, with its workflow state.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the checkpoint store.
+
+        Args:
+            path (str): Path of the SQLite database file
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                key TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                state TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the checkpoint of a query
+
+        Args:
+            query (str): The research query
+
+        Returns:
+            Optional[Dict[str, Any]]: The checkpoint (stage, state, attempts, error), or None if the
+            query has not been started
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stage, state, attempts, error FROM checkpoints WHERE key = ?", (query_key(query),)
+            ).fetchone()
+        if row is None:
+            return None
+        stage, state, attempts, error = row
+        return {"stage": stage, "state": json.loads(state) if state else None, "attempts": attempts, "error": error}
+
+    def save(self, query: str, stage: str, state: Dict[str, Any]) -> None:
+        """
+        Record that a query completed a stage
+
+        Args:
+            query (str): The research query
+            stage (str): The completed stage ('researched' or 'completed')
+            state (Dict[str, Any]): The workflow state after the stage
+        """
+        payload = json.dumps(state, ensure_ascii=False, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO checkpoints (key, query, stage, state, attempts, error, updated_at) "
+                "VALUES (?, ?, ?, ?, 0, NULL, ?) "
+                "ON CONFLICT(key) DO UPDATE SET stage = excluded.stage, state = excluded.state, "
+                "error = NULL, updated_at = excluded.updated_at",
+                (query_key(query), query, stage, payload, time.time())
+            )
+            self._conn.commit()
+
+    def record_failure(self, query: str, error: str) -> int:
+        """
+        Record a failed attempt; the query keeps its last completed stage
+
+        Args:
+            query (str): The research query
+            error (str): Why the attempt failed
+
+        Returns:
+            int: The number of failed attempts so far
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO checkpoints (key, query, stage, state, attempts, error, updated_at) "
+                "VALUES (?, ?, 'pending', NULL, 1, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET attempts = attempts + 1, error = excluded.error, "
+                "updated_at = excluded.updated_at",
+                (query_key(query), query, error, time.time())
+            )
+            self._conn.commit()
+            return self._conn.execute(
+                "SELECT attempts FROM checkpoints WHERE key = ?", (query_key(query),)
+            ).fetchone()[0]
+
+    def summary(self) -> Dict[str, int]:
+        """
+        Count the queries per last completed stage, and those with a failed last attempt
+
+        Returns:
+            Dict[str, int]: Counts per stage, plus 'failed'
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT stage, COUNT(*) FROM checkpoints GROUP BY stage").fetchall()
+            failed = self._conn.execute(
+                "SELECT COUNT(*) FROM checkpoints WHERE error IS NOT NULL AND stage != 'completed'"
+            ).fetchone()[0]
+        counts = {stage: 0 for stage in STAGES}
+        counts.update(dict(rows))
+        counts["failed"] = failed
+        return counts
+
+    def close(self) -> None:
+        """
+        Close the underlying database connection
+        """
+        with self._lock:
+            self._conn.close()
+
+
+class BatchRunner:
+    """
+    Worker pool that runs queries through the workflow stage by stage, checkpointing each stage.
+    """
+
+    def __init__(self, workflow: GithubResearchWorkflow, checkpoints: CheckpointStore, workers: int = 4,
+                 max_attempts: int = 3, sink: Optional[ResultSink] = None):
+        """
+        Args:
+            workflow (GithubResearchWorkflow): The workflow whose stages are run
+            checkpoints (CheckpointStore): Where stage checkpoints are kept
+            workers (int): Number of queries processed at the same time
+            max_attempts (int): Failed attempts after which a query is skipped on later runs
+            sink (Optional[ResultSink]): Destination for every completed result
+        """
+        self.workflow = workflow
+        self.checkpoints = checkpoints
+        self.workers = max(1, workers)
+        self.max_attempts = max_attempts
+        self.sink = sink
+
+    def run_query(self, query: str) -> Dict[str, Any]:
+        """
+        Run the stages a query has not completed yet, checkpointing after each one
+
+        Args:
+            query (str): The research query
+
+        Returns:
+            Dict[str, Any]: The final state; on failure its status is 'error' and the checkpoint
+            keeps the last completed stage
+        """
+        checkpoint = self.checkpoints.get(query)
+        stage = checkpoint["stage"] if checkpoint else "pending"
+        state = checkpoint["state"] if checkpoint and checkpoint["state"] else self.workflow.new_state(query)
+        try:
+            if stage == "pending":
+                if not self.workflow.reuse_stage(state):
+                    self.workflow.research_stage(state)
+                    self.checkpoints.save(query, "researched", state)
+                stage = "researched"
+            if state["status"] != "completed":
+                self.workflow.draft_stage(state)
+                self.workflow.remember_stage(state)
+        except Exception as e:
+            state["status"] = "error"
+            state["error"] = str(e)
+            state["resume_stage"] = stage
+            state["attempts"] = self.checkpoints.record_failure(query, str(e))
+            return state
+
+        self.checkpoints.save(query, "completed", state)
+        if self.sink is not None:
+            self.sink.write(state)
+        return state
+
+    def run(self, queries: Iterable[str], on_result=None) -> Dict[str, int]:
+        """
+        Run every query that has not completed yet
+
+        Queries that already completed, or failed max_attempts times, are skipped; duplicates are
+        run once.
+
+        Args:
+            queries (Iterable[str]): The research queries
+            on_result (Optional[Callable[[Dict[str, Any]], None]]): Called with each final state
+
+        Returns:
+            Dict[str, int]: Counts of completed, failed and skipped queries
+        """
+        counts = {"completed": 0, "failed": 0, "skipped": 0}
+        pending = []
+        seen = set()
+        for query in queries:
+            key = query_key(query)
+            if key in seen:
+                continue
+            seen.add(key)
+            checkpoint = self.checkpoints.get(query)
+            if checkpoint and (checkpoint["stage"] == "completed" or checkpoint["attempts"] >= self.max_attempts):
+                counts["skipped"] += 1
+                continue
+            pending.append(query)
+
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="batch-query")
+        try:
+            futures = [executor.submit(self.run_query, query) for query in pending]
+            for future in as_completed(futures):
+                state = future.result()
+                counts["completed" if state["status"] == "completed" else "failed"] += 1
+                if on_result is not None:
+                    on_result(state)
+        finally:
+            # On interrupt, queued queries are dropped; running ones finish their current stage
+            executor.shutdown(wait=True, cancel_futures=True)
+        return counts
+
+
+def main():
+    """Run a batch of queries from a file, resuming from the checkpoints of earlier runs"""
+    parser = argparse.ArgumentParser(description='Resumable batch runner for the Deep Research System')
+    parser.add_argument('queries', type=str, help='File with one research query per line')
+    parser.add_argument('--checkpoints', type=str, default=os.path.join('.', 'data', 'batch_checkpoints.sqlite3'),
+                        help='SQLite file holding the stage checkpoints (default: ./data/batch_checkpoints.sqlite3)')
+    parser.add_argument('--jsonl', type=str, metavar='PATH', default=None,
+                        help='Append each completed result to this JSONL store')
+    parser.add_argument('--workers', type=int, default=4, help='Queries processed at the same time (default: 4)')
+    parser.add_argument('--max-attempts', type=int, default=3,
+                        help='Failed attempts after which a query is no longer retried (default: 3)')
+    parser.add_argument('--status', action='store_true', help='Print the checkpoint summary and exit')
+    parser.add_argument('--fan-out', type=int, default=1,
+                        help='Number of sub-queries to search concurrently during research')
+    parser.add_argument('--token-budget', type=int, default=None,
+                        help='Compact search results and findings to this many tokens before each model call')
+    parser.add_argument('--structured', action='store_true',
+                        help='Request JSON research findings and fail if they do not match the schema')
+    parser.add_argument('--search-backend', choices=['langchain', 'direct'], default=None,
+                        help="Tavily client to use: LangChain's TavilySearchResults or the direct REST client")
+    parser.add_argument('--dedupe-sources', action='store_true',
+                        help='Drop duplicate search results across the batch and cite sources by stable IDs')
+    args = parser.parse_args()
+
+    load_environment()
+    checkpoints = CheckpointStore(args.checkpoints)
+    if args.status:
+        print(json.dumps(checkpoints.summary(), indent=2))
+        checkpoints.close()
+        return
+
+    queries = read_queries(args.queries)
+    sink = JsonlResultStore(args.jsonl) if args.jsonl else None
+    workflow = GithubResearchWorkflow(fan_out=args.fan_out, search_backend=args.search_backend,
+                                      token_budget=args.token_budget, structured=args.structured,
+                                      dedupe_sources=args.dedupe_sources)
+    runner = BatchRunner(workflow, checkpoints, workers=args.workers, max_attempts=args.max_attempts, sink=sink)
+
+    def report(state):
+        if state["status"] == "completed":
+            print(f"[done] {state['query']}")
+        else:
+            print(f"[failed at {state['resume_stage']}, attempt {state['attempts']}] {state['query']}: {state['error']}")
+
+    start_time = time.time()
+    try:
+        counts = runner.run(queries, on_result=report)
+    finally:
+        if sink is not None:
+            sink.close()
+        workflow.close()
+        checkpoints.close()
+    print(f"\n{counts['completed']} completed, {counts['failed']} failed, {counts['skipped']} skipped "
+          f"in {time.time() - start_time:.2f} seconds")
+
+
+if __name__ == "__main__":
+    main()
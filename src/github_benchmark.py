@@ -0,0 +1,441 @@
+"""
+Offline Benchmark Module
+
+This module benchmarks GithubResearchWorkflow without network access or API quota. It starts local
+stand-in HTTP servers for the Tavily search API and the GitHub Models inference endpoint, with
+configurable latency, payload size and error rate, points the workflow at them and drives single,
+concurrent and batch scenarios, reporting latency percentiles, throughput and time per stage:
+
+    python src/github_benchmark.py --queries 20 --latency 0.05 --max-p95 1.0
+"""
+
+from typing import Dict, Any, Callable, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import zlib
+
+SCENARIOS = ["single", "concurrent", "batch"]
+
+SAMPLE_QUERIES = [
+    "What are the latest advancements in quantum computing?",
+    "How is artificial intelligence being used in healthcare diagnostics?",
+    "Explain the environmental impact of electric vehicles",
+    "What were the economic impacts of the Industrial Revolution?",
+    "How does CRISPR gene editing work?",
+    "What is genetic sequencing used for?",
+]
+
+LOREM = ("Researchers reported measurable progress across several independent studies. "
+         "The approach improves accuracy while reducing cost, according to recent surveys. "
+         "Critics note open questions about reproducibility and long-term effects. ")
+
+
+def _filler(chars: int, seed: int) -> str:
+    """
+    Deterministic text of roughly the requested length
+    """
+    text = f"Document {seed}. " + LOREM * (chars // len(LOREM) + 1)
+    return text[:max(chars, 1)]
+
+
+class StubServer:
+    """
+    Local HTTP server that stands in for the Tavily search API or the GitHub Models endpoint.
+    """
+
+    def __init__(self, kind: str, latency: float = 0.0, payload_size: int = 2000, error_rate: float = 0.0,
+                 seed: int = 0):
+        """
+        Args:
+            kind (str): 'tavily' or 'inference'
+            latency (float): Seconds each request takes before the response is sent
+            payload_size (int): Characters of content per search result or per completion
+            error_rate (float): Fraction of requests answered with a retryable error (429 or 503)
+            seed (int): Seed for the error draws, so runs are reproducible
+        """
+        if kind not in ("tavily", "inference"):
+            raise ValueError(f"Unknown stub kind: {kind}")
+        self.kind = kind
+        self.latency = latency
+        self.payload_size = payload_size
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _draw_error(self) -> Optional[int]:
+        """
+        Count a request and decide whether it fails
+
+        Returns:
+            Optional[int]: The error status to send (429 or 503), or None to succeed
+        """
+        with self._lock:
+            self.requests += 1
+            if self._random.random() >= self.error_rate:
+                return None
+            self.errors += 1
+            return 429 if self._random.random() < 0.5 else 503
+
+    def _search_body(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        count = int(request.get("max_results", 5))
+        return {
+            "query": request.get("query"),
+            "results": [
+                {"url": f"https://stub.example/{zlib.crc32(str(request.get('query')).encode()) % 10000}/{i}",
+                 "title": f"Result {i}", "content": _filler(self.payload_size, i)}
+                for i in range(count)
+            ],
+        }
+
+    def _completion_content(self, request: Dict[str, Any]) -> str:
+        system = request.get("messages", [{}])[0].get("content", "")
+        if "researcher" in system:
+            return json.dumps({
+                "main_findings": [_filler(self.payload_size // 8, i) for i in range(4)],
+                "detailed_notes": {"Overview": _filler(self.payload_size // 2, 0)},
+                "sources": [{"url": f"https://stub.example/{i}", "title": f"Result {i}"} for i in range(3)],
+            })
+        return "# Answer\n\n" + _filler(self.payload_size, 1) + " [1]"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str = "application/json",
+                      headers: Optional[Dict[str, str]] = None) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _chunk(self, data: bytes) -> None:
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if stub.latency:
+                    time.sleep(stub.latency)
+                status = stub._draw_error()
+                if status is not None:
+                    self._send(status, b'{"error": "stub error"}', headers={"Retry-After": "0"})
+                    return
+
+                if stub.kind == "tavily":
+                    self._send(200, json.dumps(stub._search_body(request)).encode())
+                    return
+
+                content = stub._completion_content(request)
+                model = request.get("model", "stub-model")
+                if not request.get("stream"):
+                    body = {
+                        "id": "stub", "created": int(time.time()), "model": model,
+                        "choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant", "content": content}}],
+                        "usage": {"prompt_tokens": 100, "completion_tokens": len(content) // 4,
+                                  "total_tokens": 100 + len(content) // 4},
+                    }
+                    self._send(200, json.dumps(body).encode())
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for start in range(0, len(content), 64):
+                    event = {"id": "stub", "created": int(time.time()), "model": model,
+                             "choices": [{"index": 0, "finish_reason": None,
+                                          "delta": {"role": "assistant", "content": content[start:start + 64]}}]}
+                    self._chunk(f"data: {json.dumps(event)}\n\n".encode())
+                self._chunk(b"data: [DONE]\n\n")
+                self._chunk(b"")
+
+        return Handler
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile
+
+    Args:
+        values (List[float]): The samples
+        pct (float): The percentile, between 0 and 100
+
+    Returns:
+        float: The percentile value (0.0 for no samples)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def _timed_stages(workflow, state: Dict[str, Any], on_chunk: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    """
+    Run both stages of one query, recording their durations under state['timings']
+    """
+    timings = state.setdefault("timings", {})
+    start = time.perf_counter()
+    try:
+        workflow.research_stage(state)
+        timings["research"] = time.perf_counter() - start
+        draft_start = time.perf_counter()
+        workflow.draft_stage(state, on_chunk=on_chunk)
+        timings["drafting"] = time.perf_counter() - draft_start
+    except Exception as e:
+        state["status"] = "error"
+        state["error"] = str(e)
+    timings["total"] = time.perf_counter() - start
+    return state
+
+
+class _TimedStages:
+    """
+    Workflow proxy whose stages record their durations, for use with PipelineRunner.
+    """
+
+    def __init__(self, workflow, on_chunk: Optional[Callable[[str], None]] = None):
+        self._workflow = workflow
+        self._on_chunk = on_chunk
+
+    def new_state(self, query: str) -> Dict[str, Any]:
+        state = self._workflow.new_state(query)
+        state["timings"] = {}
+        return state
+
+    def research_stage(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        state["timings"]["started"] = time.perf_counter()
+        self._workflow.research_stage(state)
+        state["timings"]["research"] = time.perf_counter() - state["timings"]["started"]
+        return state
+
+    def draft_stage(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        self._workflow.draft_stage(state, on_chunk=self._on_chunk)
+        state["timings"]["drafting"] = time.perf_counter() - start
+        state["timings"]["total"] = time.perf_counter() - state["timings"].pop("started")
+        return state
+
+    def reuse_stage(self, state: Dict[str, Any]) -> bool:
+        return self._workflow.reuse_stage(state)
+
+    def remember_stage(self, state: Dict[str, Any]) -> None:
+        self._workflow.remember_stage(state)
+
+
+def _summarize(name: str, states: List[Dict[str, Any]], wall_time: float) -> Dict[str, Any]:
+    latencies = [state["timings"]["total"] for state in states if "total" in state.get("timings", {})]
+    stage_means = {}
+    for stage in ("research", "drafting"):
+        samples = [state["timings"][stage] for state in states if stage in state.get("timings", {})]
+        stage_means[stage] = sum(samples) / len(samples) if samples else 0.0
+    return {
+        "scenario": name,
+        "queries": len(states),
+        "errors": sum(1 for state in states if state["status"] != "completed"),
+        "wall_time": wall_time,
+        "throughput": len(states) / wall_time if wall_time else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "stage_mean": stage_means,
+    }
+
+
+def run_scenario(name: str, workflow_factory: Callable[[], Any], queries: List[str],
+                 concurrency: int = 4, stream: bool = False) -> Dict[str, Any]:
+    """
+    Run one benchmark scenario
+
+    Args:
+        name (str): 'single' (one query at a time), 'concurrent' (a thread pool calling
+            the stages) or 'batch' (PipelineRunner with overlapping stages)
+        workflow_factory (Callable[[], Any]): Creates the workflow to benchmark
+        queries (List[str]): The queries to run
+        concurrency (int): Threads for the concurrent scenario and workers per stage for batch
+        stream (bool): Stream the drafting call
+
+    Returns:
+        Dict[str, Any]: Latency percentiles, throughput and mean stage times
+    """
+    from github_pipeline import PipelineRunner
+
+    on_chunk = (lambda chunk: None) if stream else None
+
+    workflow = workflow_factory()
+    start = time.perf_counter()
+    if name == "single":
+        states = [_timed_stages(workflow, workflow.new_state(query), on_chunk) for query in queries]
+    elif name == "concurrent":
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            states = list(pool.map(lambda query: _timed_stages(workflow, workflow.new_state(query), on_chunk),
+                                   queries))
+    elif name == "batch":
+        runner = PipelineRunner(_TimedStages(workflow, on_chunk), research_workers=concurrency,
+                                drafting_workers=concurrency)
+        states = runner.run_all(queries)
+    else:
+        raise ValueError(f"Unknown scenario: {name}")
+    wall_time = time.perf_counter() - start
+    workflow.close()
+    return _summarize(name, states, wall_time)
+
+
+def run_benchmark(scenarios: List[str], queries: List[str], concurrency: int = 4, latency: float = 0.05,
+                  search_latency: Optional[float] = None, payload_size: int = 2000, error_rate: float = 0.0,
+                  stream: bool = False, token_budget: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Start the stub servers, run the scenarios against them and stop the servers
+
+    Args:
+        scenarios (List[str]): Scenario names to run, in order
+        queries (List[str]): Queries used by every scenario
+        concurrency (int): Concurrency for the concurrent and batch scenarios
+        latency (float): Seconds each inference request takes
+        search_latency (Optional[float]): Seconds each search request takes (defaults to latency)
+        payload_size (int): Characters per search result and per completion
+        error_rate (float): Fraction of stub requests that fail with a retryable error
+        stream (bool): Stream the drafting call
+        token_budget (Optional[int]): Token budget passed to the workflow
+
+    Returns:
+        Dict[str, Any]: The settings, per-scenario results and stub request counts
+    """
+    inference = StubServer("inference", latency, payload_size, error_rate, seed=1).start()
+    tavily = StubServer("tavily", latency if search_latency is None else search_latency,
+                        payload_size, error_rate, seed=2).start()
+
+    # The workflow reads its endpoints from the environment when it is created
+    overrides = {
+        "GITHUB_ENDPOINT": inference.url,
+        "GITHUB_TOKEN": "benchmark",
+        "TAVILY_API_URL": tavily.url,
+        "TAVILY_API_KEY": "benchmark",
+        "TAVILY_SEARCH_BACKEND": "direct",
+    }
+    previous = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+
+    from github_orchestrator import GithubResearchWorkflow
+    from github_scheduler import CallScheduler
+
+    def workflow_factory():
+        # Fresh scheduler per scenario; short backoff so injected errors cost retries, not sleeps
+        return GithubResearchWorkflow(token_budget=token_budget,
+                                      scheduler=CallScheduler(base_delay=0.01, max_delay=0.1))
+
+    try:
+        results = [run_scenario(name, workflow_factory, queries, concurrency, stream) for name in scenarios]
+    finally:
+        inference.stop()
+        tavily.stop()
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+    return {
+        "settings": {"queries": len(queries), "concurrency": concurrency, "latency": latency,
+                     "search_latency": search_latency, "payload_size": payload_size,
+                     "error_rate": error_rate, "stream": stream, "token_budget": token_budget},
+        "scenarios": results,
+        "stub_requests": {
+            "inference": {"requests": inference.requests, "errors": inference.errors},
+            "tavily": {"requests": tavily.requests, "errors": tavily.errors},
+        },
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """
+    Print benchmark results as a table
+    """
+    print(f"{'scenario':<12}{'queries':>8}{'errors':>8}{'q/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}"
+          f"{'research':>10}{'drafting':>10}")
+    for result in report["scenarios"]:
+        print(f"{result['scenario']:<12}{result['queries']:>8}{result['errors']:>8}{result['throughput']:>9.2f}"
+              f"{result['p50']:>9.3f}{result['p95']:>9.3f}{result['p99']:>9.3f}"
+              f"{result['stage_mean']['research']:>10.3f}{result['stage_mean']['drafting']:>10.3f}")
+    for name, counts in report["stub_requests"].items():
+        print(f"{name}: {counts['requests']} requests, {counts['errors']} injected errors")
+
+
+def main():
+    """Run the offline benchmark"""
+    parser = argparse.ArgumentParser(description='Offline benchmark of the research workflow against local stubs')
+    parser.add_argument('--scenario', choices=SCENARIOS, action='append', default=None,
+                        help='Scenario to run; repeat for several (default: all)')
+    parser.add_argument('--queries', type=int, default=12, help='Number of queries per scenario')
+    parser.add_argument('--concurrency', type=int, default=4,
+                        help='Threads for the concurrent scenario and workers per stage for batch')
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds per inference request')
+    parser.add_argument('--search-latency', type=float, default=None,
+                        help='Seconds per search request (default: same as --latency)')
+    parser.add_argument('--payload-size', type=int, default=2000,
+                        help='Characters per search result and per completion')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Fraction of stub requests that fail with 429 or 503')
+    parser.add_argument('--stream', action='store_true', help='Stream the drafting call')
+    parser.add_argument('--token-budget', type=int, default=None, help='Token budget passed to the workflow')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    parser.add_argument('--max-p95', type=float, default=None,
+                        help='Exit with status 1 if any scenario p95 latency exceeds this many seconds')
+    args = parser.parse_args()
+
+    queries = [SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)] + ("" if i < len(SAMPLE_QUERIES) else f" ({i})")
+               for i in range(args.queries)]
+    report = run_benchmark(args.scenario or SCENARIOS, queries, concurrency=args.concurrency,
+                           latency=args.latency, search_latency=args.search_latency,
+                           payload_size=args.payload_size, error_rate=args.error_rate,
+                           stream=args.stream, token_budget=args.token_budget)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    failed = [result for result in report["scenarios"] if result["errors"]]
+    if args.max_p95 is not None:
+        failed += [result for result in report["scenarios"] if result["p95"] > args.max_p95]
+    if failed:
+        print("FAILED: " + ", ".join(sorted({result['scenario'] for result in failed})), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Client Registry Module
+
+This module hands out one pooled, keep-alive inference client per (endpoint, token) for the whole
+process, so the research and drafting stages reuse the same warm HTTP connections instead of each
+agent opening its own connection pool.
+"""
+
+from typing import TYPE_CHECKING, Dict, Any, Tuple
+import asyncio
+import os
+import threading
+
+from dotenv import load_dotenv
+
+# The Azure AI SDK is only imported when the first client is created
+if TYPE_CHECKING:
+    from azure.ai.inference import ChatCompletionsClient
+    from azure.ai.inference.aio import ChatCompletionsClient as AsyncChatCompletionsClient
+
+DEFAULT_ENDPOINT = "https://models.github.ai/inference"
+
+_lock = threading.Lock()
+_env_loaded = False
+_clients: Dict[Tuple[str, str], "ChatCompletionsClient"] = {}
+# Async clients own an aiohttp session bound to one event loop, so they are kept per loop
+_async_clients: Dict[Tuple[str, str, int], "AsyncChatCompletionsClient"] = {}
+
+
+def load_environment() -> None:
+    """
+    Load the .env file once per process
+    """
+    global _env_loaded
+    with _lock:
+        if not _env_loaded:
+            load_dotenv()
+            _env_loaded = True
+
+
+def _pooled_transport() -> Any:
+    """
+    Build a requests transport whose connection pool is large enough for concurrent stages
+
+    Returns:
+        Any: The azure-core RequestsTransport
+    """
+    import requests
+    from azure.core.pipeline.transport import RequestsTransport
+
+    pool_size = int(os.getenv("GITHUB_POOL_SIZE", "20"))
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return RequestsTransport(session=session, session_owner=True)
+
+
+def get_client(endpoint: str, token: str) -> "ChatCompletionsClient":
+    """
+    Return the shared client for an endpoint and token, creating it on first use
+
+    Args:
+        endpoint (str): The inference endpoint
+        token (str): The API token
+
+    Returns:
+        ChatCompletionsClient: The pooled client
+    """
+    key = (endpoint, token)
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            from azure.ai.inference import ChatCompletionsClient
+            from azure.core.credentials import AzureKeyCredential
+            
+            client = ChatCompletionsClient(
+                endpoint=endpoint,
+                credential=AzureKeyCredential(token),
+                transport=_pooled_transport(),
+                # Retries are owned by the call scheduler so it can see throttling and adapt
+                retry_total=0,
+            )
+            _clients[key] = client
+        return client
+
+
+def get_async_client(endpoint: str, token: str) -> "AsyncChatCompletionsClient":
+    """
+    Return the shared async client for an endpoint and token on the running event loop
+
+    Args:
+        endpoint (str): The inference endpoint
+        token (str): The API token
+
+    Returns:
+        AsyncChatCompletionsClient: The pooled async client
+    """
+    key = (endpoint, token, id(asyncio.get_running_loop()))
+    with _lock:
+        client = _async_clients.get(key)
+        if client is None:
+            from azure.ai.inference.aio import ChatCompletionsClient as AsyncChatCompletionsClient
+            from azure.core.credentials import AzureKeyCredential
+            
+            client = AsyncChatCompletionsClient(
+                endpoint=endpoint,
+                credential=AzureKeyCredential(token),
+                retry_total=0,
+            )
+            _async_clients[key] = client
+        return client
+
+
+def close_clients() -> None:
+    """
+    Close every shared synchronous client
+    """
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
+
+
+async def aclose_clients() -> None:
+    """
+    Close the shared async clients bound to the running event loop
+    """
+    loop_id = id(asyncio.get_running_loop())
+    with _lock:
+        keys = [key for key in _async_clients if key[2] == loop_id]
+        clients = [_async_clients.pop(key) for key in keys]
+    for client in clients:
+        await client.close()
@@ -0,0 +1,336 @@
+"""
+Compaction Module
+
+This module shrinks search results and research findings to a token budget before they are
+sent to the model. It strips boilerplate, drops near-duplicate passages, ranks the remaining
+passages by relevance to the query and keeps the best ones that fit the budget.
+"""
+
+from typing import Dict, Any, List, Set, Tuple
+import json
+import re
+
+# Rough characters-per-token ratio for English text with GPT-style tokenizers
+CHARS_PER_TOKEN = 4
+
+# Passages at least this similar (Jaccard over word shingles) are treated as duplicates
+DUPLICATE_THRESHOLD = 0.8
+
+# Target passage size when splitting long text
+PASSAGE_CHARS = 240
+
+BOILERPLATE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in [
+        r"\b(accept|use|manage)( all)? cookies?\b",
+        r"\bcookie (policy|settings|preferences)\b",
+        r"\bsubscribe (to|for) (our|the) newsletter\b",
+        r"\bsign (in|up) (to|for)\b",
+        r"\ball rights reserved\b",
+        r"\bskip to (main )?content\b",
+        r"\bshare (this|on) (article|facebook|twitter|linkedin)\b",
+        r"\b(advertisement|sponsored content)\b",
+        r"\bprivacy policy\b.*\bterms\b",
+        r"\bclick here\b",
+    ]
+]
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for", "from", "how",
+    "in", "is", "it", "of", "on", "or", "that", "the", "this", "to", "was", "what", "when",
+    "where", "which", "who", "why", "will", "with",
+}
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a piece of text
+
+    Args:
+        text (str): The text
+
+    Returns:
+        int: The approximate token count
+    """
+    if not text:
+        return 0
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def estimate_json_tokens(value: Any) -> int:
+    """
+    Estimate the number of tokens a value takes once serialized into a prompt
+
+    Args:
+        value (Any): A JSON-serializable value
+
+    Returns:
+        int: The approximate token count
+    """
+    return estimate_tokens(json.dumps(value, ensure_ascii=False))
+
+
+def strip_boilerplate(text: str) -> str:
+    """
+    Remove navigation, cookie and newsletter boilerplate and collapse whitespace
+
+    Args:
+        text (str): The raw page or snippet text
+
+    Returns:
+        str: The cleaned text
+    """
+    sentences = _SENTENCE_SPLIT.split(" ".join(text.split()))
+    kept = [
+        sentence for sentence in sentences
+        if sentence and not any(pattern.search(sentence) for pattern in BOILERPLATE_PATTERNS)
+    ]
+    return " ".join(kept)
+
+
+def split_passages(text: str, passage_chars: int = PASSAGE_CHARS) -> List[str]:
+    """
+    Split text into passages of whole sentences of roughly passage_chars characters,
+    dropping sentences repeated verbatim within the text
+
+    Args:
+        text (str): The text to split
+        passage_chars (int): Target passage length in characters
+
+    Returns:
+        List[str]: The passages
+    """
+    passages = []
+    current = ""
+    seen = set()
+    for sentence in _SENTENCE_SPLIT.split(text):
+        key = sentence.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        if current and len(current) + len(sentence) + 1 > passage_chars:
+            passages.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        passages.append(current)
+    return passages
+
+
+def _terms(text: str) -> List[str]:
+    return [word for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
+
+
+def shingles(text: str, size: int = 3) -> Set[Tuple[str, ...]]:
+    """
+    Return the set of word n-grams (shingles) of a text
+
+    Args:
+        text (str): The text
+        size (int): Words per shingle
+
+    Returns:
+        Set[Tuple[str, ...]]: The shingles
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return {tuple(words)} if words else set()
+    return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def jaccard(left: Set[Tuple[str, ...]], right: Set[Tuple[str, ...]]) -> float:
+    """
+    Jaccard similarity of two shingle sets (0.0 when either is empty)
+    """
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def _relevance(query_terms: Set[str], passage: str, position: int) -> float:
+    """
+    Score a passage by how many query terms it covers, favouring earlier passages
+    """
+    terms = _terms(passage)
+    if not terms:
+        return 0.0
+    overlap = sum(1 for term in terms if term in query_terms)
+    coverage = len(query_terms & set(terms)) / len(query_terms) if query_terms else 0.0
+    return coverage + overlap / len(terms) + 0.1 / (1 + position)
+
+
+def _select_passages(query: str, passages: List[Dict[str, Any]], token_budget: int) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Drop near-duplicate passages and keep the most relevant ones that fit the budget
+
+    Args:
+        query (str): The research query
+        passages (List[Dict[str, Any]]): Passages with 'text', 'position' and 'overhead' keys
+        token_budget (int): Token budget for the kept passages
+
+    Returns:
+        Tuple[List[Dict[str, Any]], int]: The kept passages and the number of duplicates dropped
+    """
+    unique = []
+    kept_shingles = []
+    duplicates = 0
+    for passage in passages:
+        passage_shingles = shingles(passage["text"])
+        if any(jaccard(passage_shingles, other) >= DUPLICATE_THRESHOLD for other in kept_shingles):
+            duplicates += 1
+            continue
+        kept_shingles.append(passage_shingles)
+        unique.append(passage)
+
+    query_terms = set(_terms(query))
+    for passage in unique:
+        passage["score"] = _relevance(query_terms, passage["text"], passage["position"])
+
+    selected = []
+    used = 0
+    for passage in sorted(unique, key=lambda item: item["score"], reverse=True):
+        cost = estimate_tokens(passage["text"]) + passage.get("overhead", 0)
+        if used + cost > token_budget:
+            continue
+        selected.append(passage)
+        used += cost
+    return selected, duplicates
+
+
+def compact_search_results(query: str, search_results: Any, token_budget: int) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Compact Tavily search results to fit a token budget
+
+    Args:
+        query (str): The research query
+        search_results (Any): The search results (a list of url/content dicts)
+        token_budget (int): Maximum number of tokens for the compacted results
+
+    Returns:
+        Tuple[Any, Dict[str, Any]]: The compacted results and compaction statistics
+    """
+    tokens_before = estimate_json_tokens(search_results)
+    if not isinstance(search_results, list):
+        return search_results, {"tokens_before": tokens_before, "tokens_after": tokens_before}
+
+    passages = []
+    passthrough = []
+    for index, result in enumerate(search_results):
+        if not isinstance(result, dict) or not isinstance(result.get("content"), str):
+            passthrough.append(result)
+            continue
+        # The URL and JSON framing are paid once per result; charge them to its passages
+        overhead = estimate_tokens(str(result.get("url", ""))) + 4
+        for position, text in enumerate(split_passages(strip_boilerplate(result["content"]))):
+            passages.append({"result": index, "position": position, "text": text, "overhead": overhead})
+
+    selected, duplicates = _select_passages(query, passages, token_budget - estimate_json_tokens(passthrough))
+
+    by_result = {}
+    for passage in selected:
+        by_result.setdefault(passage["result"], []).append(passage)
+
+    # Most relevant results first, passages back in their original order
+    ranked = sorted(by_result.items(), key=lambda item: max(p["score"] for p in item[1]), reverse=True)
+    compacted = []
+    for index, kept in ranked:
+        result = dict(search_results[index])
+        result["content"] = " ".join(p["text"] for p in sorted(kept, key=lambda p: p["position"]))
+        compacted.append(result)
+    compacted.extend(passthrough)
+
+    return compacted, {
+        "token_budget": token_budget,
+        "tokens_before": tokens_before,
+        "tokens_after": estimate_json_tokens(compacted),
+        "passages_total": len(passages),
+        "passages_duplicate": duplicates,
+        "passages_kept": len(selected),
+    }
+
+
+def _collect_leaves(value: Any, path: Tuple[Any, ...], leaves: List[Tuple[Tuple[Any, ...], str]]) -> None:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _collect_leaves(item, path + (key,), leaves)
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            _collect_leaves(item, path + (index,), leaves)
+    elif isinstance(value, str):
+        leaves.append((path, value))
+
+
+def _rebuild(value: Any, path: Tuple[Any, ...], kept: Dict[Tuple[Any, ...], str]) -> Any:
+    """
+    Rebuild a JSON value keeping only the string leaves in kept; returns None if nothing is left
+    """
+    if isinstance(value, dict):
+        rebuilt = {}
+        for key, item in value.items():
+            child = _rebuild(item, path + (key,), kept)
+            if child is not None:
+                rebuilt[key] = child
+        return rebuilt or None
+    if isinstance(value, list):
+        rebuilt = [_rebuild(item, path + (index,), kept) for index, item in enumerate(value)]
+        rebuilt = [item for item in rebuilt if item is not None]
+        return rebuilt or None
+    if isinstance(value, str):
+        return kept.get(path)
+    return value
+
+
+def compact_findings(query: str, findings: Any, token_budget: int) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Compact structured research findings to fit a token budget
+
+    Sources are always kept; the text in the remaining fields is deduplicated, ranked
+    by relevance and trimmed to the budget, preserving the original structure.
+
+    Args:
+        query (str): The research query
+        findings (Any): The research findings
+        token_budget (int): Maximum number of tokens for the compacted findings
+
+    Returns:
+        Tuple[Any, Dict[str, Any]]: The compacted findings and compaction statistics
+    """
+    tokens_before = estimate_json_tokens(findings)
+    if not isinstance(findings, dict) or tokens_before <= token_budget:
+        return findings, {"token_budget": token_budget, "tokens_before": tokens_before, "tokens_after": tokens_before}
+
+    body = {key: value for key, value in findings.items() if key != "sources"}
+    sources = findings.get("sources")
+
+    leaves = []
+    _collect_leaves(body, (), leaves)
+    passages = []
+    for leaf_index, (path, text) in enumerate(leaves):
+        # JSON keys and framing are paid once per leaf; charge them to its passages
+        overhead = estimate_tokens(" ".join(str(part) for part in path)) + 2
+        for position, passage in enumerate(split_passages(strip_boilerplate(text))):
+            passages.append({"leaf": leaf_index, "position": position, "text": passage, "overhead": overhead})
+
+    budget = token_budget - (estimate_json_tokens(sources) if sources is not None else 0)
+    selected, duplicates = _select_passages(query, passages, budget)
+
+    kept_text = {}
+    for passage in sorted(selected, key=lambda p: (p["leaf"], p["position"])):
+        path = leaves[passage["leaf"]][0]
+        kept_text[path] = f"{kept_text[path]} {passage['text']}" if path in kept_text else passage["text"]
+
+    compacted = _rebuild(body, (), kept_text) or {}
+    if sources is not None:
+        compacted["sources"] = sources
+
+    return compacted, {
+        "token_budget": token_budget,
+        "tokens_before": tokens_before,
+        "tokens_after": estimate_json_tokens(compacted),
+        "passages_total": len(passages),
+        "passages_duplicate": duplicates,
+        "passages_kept": len(selected),
+    }
@@ -0,0 +1,489 @@
+"""
+Completion Cache Module
+
+This module provides a content-addressed cache for chat completions. Completions are keyed on
+a hash of everything that determines them (model, messages, temperature, top_p), so a warm re-run
+of the same query with the same inputs costs no model calls.
+"""
+
+from typing import TYPE_CHECKING, Dict, Any, AsyncIterator, Iterator, List, Optional
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from github_compaction import estimate_tokens
+from github_tracing import annotate, payload_bytes
+
+if TYPE_CHECKING:
+    from github_scheduler import CallScheduler
+
+
+class CacheBackend:
+    """
+    Base class for completion cache storage backends.
+    """
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return the cached completion for a key, or None on a miss
+
+        Args:
+            key (str): The cache key
+
+        Returns:
+            Optional[str]: The cached completion content
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a completion
+
+        Args:
+            key (str): The cache key
+            value (str): The completion content
+        """
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """
+        Remove every entry from the backend
+        """
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """
+        Release any resources held by the backend
+        """
+
+
+class MemoryLRUBackend(CacheBackend):
+    """
+    In-memory backend that evicts the least recently used entry once full.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Args:
+            max_entries (int): Maximum number of completions kept in memory
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskBackend(CacheBackend):
+    """
+    SQLite backend that persists completions across runs, evicting least recently used entries.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000):
+        """
+        Args:
+            path (str): Path of the SQLite database file
+            max_entries (int): Maximum number of completions kept on disk
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS completion_cache (
+                key TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_completion_cache_last_access ON completion_cache (last_access)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT content FROM completion_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE completion_cache SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completion_cache (key, content, last_access) VALUES (?, ?, ?)",
+                (key, value, time.time())
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM completion_cache").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM completion_cache WHERE key IN "
+                    "(SELECT key FROM completion_cache ORDER BY last_access ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM completion_cache")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM completion_cache").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CompletionCache:
+    """
+    Tiered completion cache. Backends are consulted in order and a hit in a slower
+    tier is copied into the faster tiers in front of it.
+    """
+
+    def __init__(self, backends: List[CacheBackend]):
+        """
+        Args:
+            backends (List[CacheBackend]): Storage tiers, fastest first
+        """
+        if not backends:
+            raise ValueError("CompletionCache needs at least one backend")
+        self.backends = backends
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    @classmethod
+    def create(cls, path: Optional[str] = None, memory_entries: int = 256, disk_entries: int = 10000) -> "CompletionCache":
+        """
+        Build the default cache: an in-memory LRU in front of an optional on-disk store
+
+        Args:
+            path (Optional[str]): Path of the SQLite file, or None for a memory-only cache
+            memory_entries (int): Capacity of the in-memory tier
+            disk_entries (int): Capacity of the on-disk tier
+
+        Returns:
+            CompletionCache: The configured cache
+        """
+        backends = [MemoryLRUBackend(memory_entries)]
+        if path:
+            backends.append(DiskBackend(path, disk_entries))
+        return cls(backends)
+
+    @staticmethod
+    def make_key(messages: List[Any], **params: Any) -> str:
+        """
+        Hash everything that determines a completion into a cache key
+
+        Args:
+            messages (List[Any]): The chat messages sent to the model
+            **params (Any): Completion parameters such as model, temperature and top_p
+
+        Returns:
+            str: The hex digest used as cache key
+        """
+        payload = {
+            "messages": [[getattr(message, "role", type(message).__name__), message.content] for message in messages],
+            "params": params
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a completion in each tier in turn
+
+        Args:
+            key (str): The cache key
+
+        Returns:
+            Optional[str]: The cached completion content, or None on a miss
+        """
+        for index, backend in enumerate(self.backends):
+            value = backend.get(key)
+            if value is not None:
+                for faster in self.backends[:index]:
+                    faster.set(key, value)
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a completion in every tier
+
+        Args:
+            key (str): The cache key
+            value (str): The completion content
+        """
+        for backend in self.backends:
+            backend.set(key, value)
+        self.stores += 1
+
+    def clear(self) -> None:
+        """
+        Remove every entry from every tier
+        """
+        for backend in self.backends:
+            backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters and the size of each tier
+
+        Returns:
+            Dict[str, Any]: The cache statistics
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": [len(backend) for backend in self.backends]
+        }
+
+    def close(self) -> None:
+        """
+        Close every tier
+        """
+        for backend in self.backends:
+            backend.close()
+
+
+def prompt_tokens(messages: List[Any]) -> int:
+    """
+    Estimate the prompt tokens of a list of chat messages
+
+    Args:
+        messages (List[Any]): The chat messages
+
+    Returns:
+        int: The approximate token count
+    """
+    return sum(estimate_tokens(message.content or "") for message in messages)
+
+
+def _trace_call(messages: List[Any], content: Optional[str], response: Any = None, cached: bool = False) -> None:
+    """
+    Record the payload sizes and token usage of a completion on the current span
+    """
+    usage = getattr(response, "usage", None)
+    if usage is not None and getattr(usage, "prompt_tokens", None) is not None:
+        tokens = {"prompt_tokens": usage.prompt_tokens, "completion_tokens": usage.completion_tokens}
+    else:
+        # Cached and streamed completions carry no usage; fall back to estimates
+        tokens = {"prompt_tokens": prompt_tokens(messages), "completion_tokens": estimate_tokens(content or ""),
+                  "tokens_estimated": True}
+    annotate(cached=cached, bytes_in=sum(payload_bytes(message.content) for message in messages),
+             bytes_out=payload_bytes(content), **tokens)
+
+
+def _record_usage(scheduler: "CallScheduler", response: Any, estimate: int) -> None:
+    """
+    Charge the scheduler for the tokens actually used beyond the prompt estimate
+    """
+    usage = getattr(response, "usage", None)
+    if usage is not None and getattr(usage, "total_tokens", None):
+        scheduler.record_tokens("github", usage.total_tokens - estimate)
+
+
+def complete_cached(client: Any, cache: Optional[CompletionCache], messages: List[Any],
+                    scheduler: Optional["CallScheduler"] = None, **params: Any) -> str:
+    """
+    Run a chat completion, serving it from the cache when possible
+
+    Args:
+        client (Any): The ChatCompletionsClient
+        cache (Optional[CompletionCache]): The completion cache, or None to always call the model
+        messages (List[Any]): The chat messages
+        scheduler (Optional[CallScheduler]): Scheduler the model call is routed through, if any
+        **params (Any): Completion parameters (model, temperature, top_p, ...)
+
+    Returns:
+        str: The completion content
+    """
+    key = None
+    if cache is not None:
+        key = cache.make_key(messages, **params)
+        cached = cache.get(key)
+        if cached is not None:
+            _trace_call(messages, cached, cached=True)
+            return cached
+
+    if scheduler is not None:
+        estimate = prompt_tokens(messages)
+        response = scheduler.call("github", lambda: client.complete(messages=messages, **params), tokens=estimate)
+        _record_usage(scheduler, response, estimate)
+    else:
+        response = client.complete(messages=messages, **params)
+    content = response.choices[0].message.content
+    _trace_call(messages, content, response)
+
+    if cache is not None and content is not None:
+        cache.set(key, content)
+    return content
+
+
+async def acomplete_cached(client: Any, cache: Optional[CompletionCache], messages: List[Any],
+                           scheduler: Optional["CallScheduler"] = None, **params: Any) -> str:
+    """
+    Async variant of complete_cached for the azure.ai.inference.aio client
+
+    Args:
+        client (Any): The async ChatCompletionsClient
+        cache (Optional[CompletionCache]): The completion cache, or None to always call the model
+        messages (List[Any]): The chat messages
+        scheduler (Optional[CallScheduler]): Scheduler the model call is routed through, if any
+        **params (Any): Completion parameters (model, temperature, top_p, ...)
+
+    Returns:
+        str: The completion content
+    """
+    key = None
+    if cache is not None:
+        key = cache.make_key(messages, **params)
+        cached = cache.get(key)
+        if cached is not None:
+            _trace_call(messages, cached, cached=True)
+            return cached
+
+    if scheduler is not None:
+        estimate = prompt_tokens(messages)
+        response = await scheduler.acall("github", lambda: client.complete(messages=messages, **params),
+                                         tokens=estimate)
+        _record_usage(scheduler, response, estimate)
+    else:
+        response = await client.complete(messages=messages, **params)
+    content = response.choices[0].message.content
+    _trace_call(messages, content, response)
+
+    if cache is not None and content is not None:
+        cache.set(key, content)
+    return content
+
+
+def stream_cached(client: Any, cache: Optional[CompletionCache], messages: List[Any],
+                  scheduler: Optional["CallScheduler"] = None, **params: Any) -> Iterator[str]:
+    """
+    Stream a chat completion chunk by chunk, serving it from the cache when possible
+
+    A cached completion is yielded as a single chunk. A streamed completion is stored
+    in the cache once the stream closes, under the same key as a non-streamed call.
+
+    Args:
+        client (Any): The ChatCompletionsClient
+        cache (Optional[CompletionCache]): The completion cache, or None to always call the model
+        messages (List[Any]): The chat messages
+        scheduler (Optional[CallScheduler]): Scheduler the model call is routed through, if any
+        **params (Any): Completion parameters (model, temperature, top_p, ...)
+
+    Yields:
+        str: Content chunks as they arrive
+    """
+    key = None
+    if cache is not None:
+        key = cache.make_key(messages, **params)
+        cached = cache.get(key)
+        if cached is not None:
+            _trace_call(messages, cached, cached=True)
+            yield cached
+            return
+
+    parts = []
+    if scheduler is not None:
+        # Only opening the stream is scheduled; a failure mid-stream is not retried
+        response = scheduler.call("github", lambda: client.complete(messages=messages, stream=True, **params),
+                                  tokens=prompt_tokens(messages))
+    else:
+        response = client.complete(messages=messages, stream=True, **params)
+    try:
+        for update in response:
+            if update.choices and update.choices[0].delta and update.choices[0].delta.content:
+                parts.append(update.choices[0].delta.content)
+                yield update.choices[0].delta.content
+    finally:
+        response.close()
+        _trace_call(messages, "".join(parts))
+
+    if cache is not None and parts:
+        cache.set(key, "".join(parts))
+
+
+async def astream_cached(client: Any, cache: Optional[CompletionCache], messages: List[Any],
+                         scheduler: Optional["CallScheduler"] = None, **params: Any) -> AsyncIterator[str]:
+    """
+    Async variant of stream_cached for the azure.ai.inference.aio client
+
+    Args:
+        client (Any): The async ChatCompletionsClient
+        cache (Optional[CompletionCache]): The completion cache, or None to always call the model
+        messages (List[Any]): The chat messages
+        scheduler (Optional[CallScheduler]): Scheduler the model call is routed through, if any
+        **params (Any): Completion parameters (model, temperature, top_p, ...)
+
+    Yields:
+        str: Content chunks as they arrive
+    """
+    key = None
+    if cache is not None:
+        key = cache.make_key(messages, **params)
+        cached = cache.get(key)
+        if cached is not None:
+            _trace_call(messages, cached, cached=True)
+            yield cached
+            return
+
+    parts = []
+    if scheduler is not None:
+        response = await scheduler.acall("github", lambda: client.complete(messages=messages, stream=True, **params),
+                                         tokens=prompt_tokens(messages))
+    else:
+        response = await client.complete(messages=messages, stream=True, **params)
+    try:
+        async for update in response:
+            if update.choices and update.choices[0].delta and update.choices[0].delta.content:
+                parts.append(update.choices[0].delta.content)
+                yield update.choices[0].delta.content
+    finally:
+        await response.aclose()
+        _trace_call(messages, "".join(parts))
+
+    if cache is not None and parts:
+        cache.set(key, "".join(parts))
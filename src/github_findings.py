@@ -0,0 +1,249 @@
+"""
+Research Findings Module
+
+This module defines the schema of the research findings produced by the research agent and a
+single-pass JSON extractor that pulls the findings object out of model output, including output
+that arrives as streamed chunks.
+"""
+
+from typing import Any, Iterator, List, Optional
+import json
+
+from pydantic import BaseModel, ConfigDict, ValidationError
+
+
+class FindingsParseError(ValueError):
+    """
+    Raised when model output does not contain valid research findings.
+    """
+
+
+class ResearchFindings(BaseModel):
+    """
+    Structured research findings returned by the research agent.
+    """
+
+    model_config = ConfigDict(extra="allow")
+
+    main_findings: List[str] = []
+    detailed_notes: Any = {}
+    sources: List[Any] = []
+    open_questions: List[str] = []
+
+    @classmethod
+    def from_any(cls, value: Any) -> Optional["ResearchFindings"]:
+        """
+        Interpret stored findings as a ResearchFindings, if possible
+
+        Accepts a ResearchFindings, a findings dict, or the legacy ``{"research_text": ...}``
+        fallback whose text still contains the findings JSON.
+
+        Args:
+            value (Any): The stored findings
+
+        Returns:
+            Optional[ResearchFindings]: The findings, or None if they cannot be interpreted
+        """
+        if isinstance(value, cls):
+            return value
+        if not isinstance(value, dict):
+            return None
+        if set(value) == {"research_text"}:
+            try:
+                return parse_findings(value["research_text"])
+            except FindingsParseError:
+                return None
+        try:
+            return cls.model_validate(value)
+        except ValidationError:
+            return None
+
+
+class JSONObjectExtractor:
+    """
+    Incremental, single-pass extractor for top-level JSON objects embedded in text.
+
+    Feed it text in as many chunks as needed; it tracks brace depth outside of string
+    literals and returns each top-level ``{...}`` object as soon as it closes. Text
+    outside objects, such as prose or Markdown code fences, is ignored.
+    """
+
+    def __init__(self):
+        self._buffer = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> List[str]:
+        """
+        Consume a chunk of text
+
+        Args:
+            chunk (str): The next piece of model output
+
+        Returns:
+            List[str]: The top-level JSON objects completed by this chunk
+        """
+        completed = []
+        start = 0 if self._depth else None
+        for index, char in enumerate(chunk):
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    start = index
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._buffer.append(chunk[start:index + 1])
+                    completed.append("".join(self._buffer))
+                    self._buffer = []
+                    start = None
+
+        if self._depth and start is not None:
+            self._buffer.append(chunk[start:])
+        return completed
+
+
+def extract_json_object(text: str) -> Optional[str]:
+    """
+    Return the first complete top-level JSON object in a text
+
+    Args:
+        text (str): The model output
+
+    Returns:
+        Optional[str]: The object text, or None if the text contains no complete object
+    """
+    objects = JSONObjectExtractor().feed(text)
+    return objects[0] if objects else None
+
+
+def _candidate_objects(text: str) -> Iterator[str]:
+    """
+    Yield the top-level JSON objects a text may contain, in order
+
+    The objects of a single pass come first. A stray brace or quote in prose can swallow the
+    real payload into an unclosed object, so the scan is then restarted from every later
+    opening brace that is not inside an object already yielded; objects nested in another
+    object are never yielded on their own.
+    """
+    covered = []
+    position = 0
+    for candidate in JSONObjectExtractor().feed(text):
+        start = text.find(candidate, position)
+        position = start + len(candidate)
+        covered.append((start, position))
+        yield candidate
+
+    start = text.find("{")
+    while start != -1:
+        start = text.find("{", start + 1)
+        if start == -1 or any(first <= start < last for first, last in covered):
+            continue
+        objects = JSONObjectExtractor().feed(text[start:])
+        if objects:
+            covered.append((start, start + len(objects[0])))
+            yield objects[0]
+
+
+def parse_findings(text: str, strict: bool = False) -> ResearchFindings:
+    """
+    Extract and validate research findings from model output
+
+    Every top-level JSON object in the output is tried in order and the first one that matches
+    the schema and has at least one of its fields is returned, so prose containing braces before
+    the payload does not hide it.
+
+    Args:
+        text (str): The model output
+        strict (bool): Also require non-empty main_findings
+
+    Returns:
+        ResearchFindings: The validated findings
+
+    Raises:
+        FindingsParseError: If the output contains no valid findings object
+    """
+    if not isinstance(text, str):
+        raise FindingsParseError(f"Expected text output, got {type(text).__name__}")
+
+    error = None
+    for candidate in _candidate_objects(text):
+        try:
+            data = json.loads(candidate)
+        except json.JSONDecodeError as e:
+            error = error or FindingsParseError(f"Invalid JSON: {e}")
+            continue
+        # Every field has a default and extra fields are allowed, so any object would validate
+        if not set(data) & set(ResearchFindings.model_fields):
+            error = error or FindingsParseError("JSON object has none of the findings fields")
+            continue
+        try:
+            findings = ResearchFindings.model_validate(data)
+        except ValidationError as e:
+            error = error or FindingsParseError(f"Findings do not match the schema: {e}")
+            continue
+        if strict and not findings.main_findings:
+            error = error or FindingsParseError("Findings have no main_findings")
+            continue
+        return findings
+
+    if error is None:
+        raise FindingsParseError("No JSON object found in the model output")
+    raise error
+
+
+def format_source(source: Any) -> str:
+    """
+    Render one source for a prompt, the console or a report
+
+    Args:
+        source (Any): A source string, or a dict with 'title', 'url' and an optional citation 'id'
+
+    Returns:
+        str: "[S1] Title - url" for registered sources, "Title - url" for other dicts, the
+        source itself otherwise
+    """
+    if isinstance(source, dict) and (source.get("title") or source.get("url")):
+        text = " - ".join(str(source[key]) for key in ("title", "url") if source.get(key))
+        return f"[{source['id']}] {text}" if source.get("id") else text
+    if isinstance(source, (dict, list)):
+        return json.dumps(source, ensure_ascii=False)
+    return str(source)
+
+
+def format_findings(findings: ResearchFindings) -> str:
+    """
+    Render findings as prompt text, reading the schema fields directly
+
+    Args:
+        findings (ResearchFindings): The research findings
+
+    Returns:
+        str: The findings formatted for a drafting prompt
+    """
+    sections = []
+    if findings.main_findings:
+        sections.append("Main findings:\n" + "\n".join(f"- {finding}" for finding in findings.main_findings))
+    if findings.detailed_notes:
+        notes = findings.detailed_notes
+        if not isinstance(notes, str):
+            notes = json.dumps(notes, ensure_ascii=False)
+        sections.append(f"Detailed notes:\n{notes}")
+    if findings.sources:
+        sources = [format_source(source) for source in findings.sources]
+        sections.append("Sources:\n" + "\n".join(f"{i}. {source}" for i, source in enumerate(sources, 1)))
+    return "\n\n".join(sections)
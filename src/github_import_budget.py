@@ -0,0 +1,89 @@
+"""
+Import Budget Check
+
+This module measures how long it takes to import the CLI entry point in a fresh interpreter and
+verifies that the heavy dependencies (LangChain, the Azure SDK, markdown, NumPy) are not loaded at
+import time. It exits with a non-zero status when the budget is exceeded, so it can run as a CI step
+(tests/test_import_budget.py runs the same check):
+
+    python src/github_import_budget.py --budget 0.5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Default maximum import time of the CLI, in seconds
+DEFAULT_BUDGET = 0.5
+
+# Modules that must only be imported by the code path that needs them
+DEFERRED_MODULES = ["langchain", "azure.ai.inference", "azure.core", "markdown", "numpy"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [name for name in {deferred!r} if name in sys.modules]}}))
+"""
+
+
+def measure_import(module: str = "github_main", runs: int = 3) -> dict:
+    """
+    Import a module in fresh interpreters and report the fastest run
+
+    Args:
+        module (str): The module to import
+        runs (int): Number of fresh interpreters to measure
+
+    Returns:
+        dict: The best import time in seconds and the deferred modules that were loaded
+    """
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    probe = PROBE.format(module=module, deferred=DEFERRED_MODULES)
+    best = None
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", probe],
+            cwd=src_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    return best
+
+
+def main():
+    """Check the import-time budget of the CLI"""
+    parser = argparse.ArgumentParser(description='Check the import-time budget of the research CLI')
+    parser.add_argument('--module', type=str, default='github_main',
+                        help='Module to import (default: github_main)')
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET,
+                        help=f'Maximum allowed import time in seconds (default: {DEFAULT_BUDGET})')
+    parser.add_argument('--runs', type=int, default=3,
+                        help='Number of fresh interpreters to measure (default: 3)')
+    args = parser.parse_args()
+
+    result = measure_import(args.module, args.runs)
+    print(f"Import of {args.module}: {result['seconds']:.3f}s (budget {args.budget:.3f}s)")
+
+    failed = False
+    if result["seconds"] > args.budget:
+        print("FAIL: import time exceeds the budget")
+        failed = True
+    if result["loaded"]:
+        print(f"FAIL: deferred modules loaded at import time: {', '.join(result['loaded'])}")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Iteration Control Module
+
+This module holds the bookkeeping of iterative research: a novelty tracker that measures how much
+of each round of search results is new, by URL and by text overlap with everything seen so far,
+and a budget that caps the number of rounds, calls and seconds spent on a single query.
+"""
+
+from typing import Any, List, Optional, Set, Tuple
+import time
+
+from github_compaction import DUPLICATE_THRESHOLD, jaccard, shingles
+
+
+def _result_text(result: Any) -> str:
+    if isinstance(result, dict):
+        return " ".join(str(result.get(key) or "") for key in ("title", "content"))
+    return str(result)
+
+
+def _result_url(result: Any) -> Optional[str]:
+    url = result.get("url") if isinstance(result, dict) else None
+    return url.strip().rstrip("/").lower() if url else None
+
+
+class NoveltyTracker:
+    """
+    Tracks the search results seen across rounds and scores each new round by the share of
+    results that are neither a known URL nor a near-duplicate of text already seen.
+    """
+
+    def __init__(self, threshold: float = DUPLICATE_THRESHOLD):
+        """
+        Args:
+            threshold (float): Jaccard similarity at which a result counts as already seen
+        """
+        self.threshold = threshold
+        self.urls: Set[str] = set()
+        self.texts: List[Set[Tuple[str, ...]]] = []
+
+    def absorb(self, results: Any) -> Tuple[List[Any], float]:
+        """
+        Record a round of search results and keep only the novel ones
+
+        Args:
+            results (Any): The round's search results; anything other than a list counts as empty
+
+        Returns:
+            Tuple[List[Any], float]: The novel results and the fraction of the round they make up
+        """
+        if not isinstance(results, list) or not results:
+            return [], 0.0
+
+        novel = []
+        for result in results:
+            url = _result_url(result)
+            if url and url in self.urls:
+                continue
+            text = shingles(_result_text(result))
+            if any(jaccard(text, other) >= self.threshold for other in self.texts):
+                continue
+            if url:
+                self.urls.add(url)
+            self.texts.append(text)
+            novel.append(result)
+        return novel, len(novel) / len(results)
+
+
+class IterationBudget:
+    """
+    Limits on the rounds, calls (searches and completions) and wall-clock time of one query.
+    """
+
+    def __init__(self, max_rounds: int = 3, max_calls: Optional[int] = None, time_budget: Optional[float] = None):
+        """
+        Args:
+            max_rounds (int): Maximum number of search rounds
+            max_calls (Optional[int]): Maximum number of searches and completions, or None for no limit
+            time_budget (Optional[float]): Maximum seconds spent, or None for no limit
+        """
+        self.max_rounds = max_rounds
+        self.max_calls = max_calls
+        self.time_budget = time_budget
+        self.rounds = 0
+        self.calls = 0
+        self.started = time.monotonic()
+
+    def charge(self, calls: int = 1) -> None:
+        self.calls += calls
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def stop_reason(self, next_calls: int) -> Optional[str]:
+        """
+        Check whether another round fits in the budget
+
+        Args:
+            next_calls (int): Calls the next round would make
+
+        Returns:
+            Optional[str]: 'max_rounds', 'max_calls' or 'time_budget' if it does not fit, else None
+        """
+        if self.rounds >= self.max_rounds:
+            return "max_rounds"
+        if self.max_calls is not None and self.calls + next_calls > self.max_calls:
+            return "max_calls"
+        if self.time_budget is not None and self.elapsed() >= self.time_budget:
+            return "time_budget"
+        return None
@@ -8,21 +8,32 @@ using only the GitHub AI model.
 import argparse
 import json
 import os
-from dotenv import load_dotenv
+from github_archive_index import ArchiveIndex
+from github_client_registry import load_environment
+from github_completion_cache import CompletionCache
+from github_findings import format_source
+from github_models import resolve_model
 from github_orchestrator import GithubResearchWorkflow
+from github_page_fetcher import PageCache, PageFetcher
+from github_query_reuse import QueryIndex
+from github_report import export_html, has_answer, write_html
+from github_result_store import JsonlResultStore
+from github_tracing import OTLPJsonExporter, PrometheusTextExporter, Trace, annotate, format_profile, span, use_trace
+from github_search_cache import SearchCache
 import time
-import markdown  # Import markdown library for rendering
 
 # Load environment variables
-load_dotenv()
+load_environment()
 
-def save_results(results, output_dir="./data"):
+def save_results(results, output_dir="./data", archive_index=None):
     """
     Save research results to a JSON file and optionally create an HTML version
     
     Args:
         results (dict): The research results
         output_dir (str): Directory to save output files
+        archive_index (ArchiveIndex): Index to add the saved result to (defaults to
+            the archive index in output_dir)
         
     Returns:
         tuple: Paths to the saved JSON and HTML files
@@ -40,74 +51,62 @@ def save_results(results, output_dir="./data"):
     json_path = os.path.join(output_dir, json_filename)
     html_path = os.path.join(output_dir, html_filename)
     
-    # Save the results as JSON
+    with use_trace(Trace.for_state(results)), span("save"):
+        # Save the results as HTML for better readability
+        if has_answer(results):
+            write_html(results, html_path, generated_at=timestamp)
+            annotate(bytes_out=os.path.getsize(html_path))
+        
+        # Keep the archive index in step with the files on disk
+        if archive_index is None:
+            index = ArchiveIndex(os.path.join(output_dir, "archive_index.sqlite3"))
+            try:
+                index.add(results, json_path, saved_at=timestamp)
+            finally:
+                index.close()
+        else:
+            archive_index.add(results, json_path, saved_at=timestamp)
+    
+    # Save the results as JSON last, once the save span is closed, so the saved trace includes it
     with open(json_path, 'w', encoding='utf-8') as f:
         json.dump(results, f, indent=2, ensure_ascii=False)
     
-    # Save the results as HTML for better readability
-    if results['status'] == 'completed' and results['answer'] and 'answer' in results['answer']:
-        with open(html_path, 'w', encoding='utf-8') as f:
-            answer_text = results['answer']['answer']
-            sources = results['answer'].get('sources', [])
-            
-            # Define the HTML template parts
-            html_header = '<!DOCTYPE html>\n<html>\n<head>\n'
-            html_header += f'    <title>Research: {results["query"]}</title>\n'
-            html_header += '    <meta charset="UTF-8">\n    <style>\n'
-            html_header += '        body { font-family: Arial, sans-serif; line-height: 1.6; max-width: 800px; margin: 0 auto; padding: 20px; }\n'
-            html_header += '        h1 { color: #2c3e50; border-bottom: 1px solid #eee; padding-bottom: 10px; }\n'
-            html_header += '        h2 { color: #3498db; margin-top: 30px; }\n'
-            html_header += '        .metadata { color: #7f8c8d; font-size: 0.9em; margin-bottom: 30px; }\n'
-            html_header += '        .answer { background-color: #f9f9f9; padding: 20px; border-radius: 5px; }\n'
-            html_header += '        .sources { margin-top: 30px; }\n'
-            html_header += '        .source-item { margin-bottom: 10px; }\n'
-            # Add styles for markdown content
-            html_header += '        .answer code { background-color: #f0f0f0; padding: 2px 4px; border-radius: 3px; font-family: monospace; }\n'
-            html_header += '        .answer pre { background-color: #f0f0f0; padding: 10px; border-radius: 5px; overflow-x: auto; }\n'
-            html_header += '        .answer blockquote { border-left: 4px solid #ccc; margin-left: 0; padding-left: 15px; color: #555; }\n'
-            html_header += '        .answer img { max-width: 100%; }\n'
-            html_header += '        .answer table { border-collapse: collapse; width: 100%; }\n'
-            html_header += '        .answer th, .answer td { border: 1px solid #ddd; padding: 8px; }\n'
-            html_header += '    </style>\n</head>\n<body>\n'
-            
-            # Research header and metadata
-            html_body = f'    <h1>Research Results: {results["query"]}</h1>\n'
-            html_body += '    <div class="metadata">\n'
-            html_body += f'        <p>Generated on: {time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))}</p>\n'
-            html_body += f'        <p>Model used: {results["answer"]["metadata"].get("model_used", "Unknown")}</p>\n'
-            html_body += '    </div>\n\n'
-            
-            # Answer section - render markdown instead of replacing newlines with <br>
-            html_body += '    <h2>Answer</h2>\n'
-            html_body += '    <div class="answer">\n'
-            # Convert markdown to HTML using the markdown library
-            formatted_answer = markdown.markdown(answer_text, extensions=['tables', 'fenced_code'])
-            html_body += f'        {formatted_answer}\n'
-            html_body += '    </div>\n'
-            
-            # Sources section
-            if sources:
-                html_body += '\n    <h2>Sources</h2>\n'
-                html_body += '    <div class="sources">\n'
-                for i, source in enumerate(sources, 1):
-                    source_str = str(source)
-                    html_body += f'        <div class="source-item">\n'
-                    html_body += f'            <strong>Source {i}:</strong> {source_str}\n'
-                    html_body += '        </div>\n'
-                html_body += '    </div>\n'
-            
-            # Footer
-            html_footer = '</body>\n</html>'
-            
-            # Write the complete HTML to the file
-            f.write(html_header + html_body + html_footer)
-        
     print(f"Results saved to: {json_path}")
     if os.path.exists(html_path):
         print(f"HTML report saved to: {html_path}")
     
     return json_path, html_path if os.path.exists(html_path) else None
 
+def search_archive(text, output_dir="./data", limit=10):
+    """
+    Print saved results matching a full-text search, best matches first
+    
+    Args:
+        text (str): The search terms
+        output_dir (str): Directory holding the saved results and their index
+        limit (int): Maximum number of results to print
+    """
+    index_path = os.path.join(output_dir, "archive_index.sqlite3")
+    if not os.path.exists(index_path):
+        print(f"No archive index found in {output_dir}")
+        return
+    
+    index = ArchiveIndex(index_path)
+    try:
+        matches = index.search(text, limit=limit)
+    finally:
+        index.close()
+    
+    if not matches:
+        print(f"No saved results match: {text}")
+        return
+    
+    for i, match in enumerate(matches, 1):
+        saved_at = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(match['saved_at']))
+        print(f"{i}. {match['query']} ({saved_at}, score {match['score']:.2f})")
+        print(f"   {match['snippet']}")
+        print(f"   {match['location']}")
+
 def main():
     """Main function to run the research system"""
     # Set up argument parser
@@ -117,33 +116,216 @@ def main():
                         help='Output directory for saving results')
     parser.add_argument('--full', '-f', action='store_true',
                         help='Display the full answer in the terminal')
+    parser.add_argument('--fan-out', type=int, default=1,
+                        help='Number of sub-queries to search concurrently during research')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not read or write the search result cache')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Ignore cached search results but store the fresh ones')
+    parser.add_argument('--cache-ttl', type=float, default=24 * 60 * 60,
+                        help='Seconds a cached search result stays valid (default: 86400)')
+    parser.add_argument('--completion-cache', action='store_true',
+                        help='Reuse model completions for identical prompts across runs')
+    parser.add_argument('--stream', '-s', action='store_true',
+                        help='Print the answer as it is generated')
+    parser.add_argument('--search-backend', choices=['langchain', 'direct'], default=None,
+                        help="Tavily client to use: LangChain's TavilySearchResults or the direct REST client")
+    parser.add_argument('--token-budget', type=int, default=None,
+                        help='Compact search results and findings to this many tokens before each model call')
+    parser.add_argument('--structured', action='store_true',
+                        help='Request JSON research findings and fail if they do not match the schema')
+    parser.add_argument('--rounds', type=int, default=1,
+                        help='Maximum research rounds; follow-up searches stop early when they add little (default: 1)')
+    parser.add_argument('--max-calls', type=int, default=None,
+                        help='Maximum searches and completions spent on iterative research')
+    parser.add_argument('--time-budget', type=float, default=None,
+                        help='Seconds after which iterative research starts no new round')
+    parser.add_argument('--fetch-pages', action='store_true',
+                        help='Fetch the pages behind the search results and research their full text')
+    parser.add_argument('--page-timeout', type=float, default=10.0,
+                        help='Connect and read timeout in seconds for each fetched page (default: 10)')
+    parser.add_argument('--per-host', type=int, default=2,
+                        help='Maximum simultaneous page fetches from one host (default: 2)')
+    parser.add_argument('--research-model', type=str, default=None,
+                        help='Model that structures the findings (default: GITHUB_RESEARCH_MODEL, then GITHUB_MODEL)')
+    parser.add_argument('--draft-model', type=str, default=None,
+                        help='Model that drafts the answer (default: GITHUB_DRAFT_MODEL, then GITHUB_MODEL)')
+    parser.add_argument('--fast-model', type=str, default=None,
+                        help='Smaller model tried first for structuring, escalating on invalid findings '
+                             '(default: GITHUB_FAST_MODEL)')
+    parser.add_argument('--cascade-drafting', action='store_true',
+                        help='Also draft with the fast model first, escalating on short answers')
+    parser.add_argument('--sectioned', action='store_true',
+                        help='Draft each subtopic of the findings as a separate section, concurrently')
+    parser.add_argument('--dedupe-sources', action='store_true',
+                        help='Drop duplicate and near-duplicate search results and cite sources by stable IDs')
+    parser.add_argument('--latency-budget', type=float, default=None,
+                        help='Seconds per query after which stages stop escalating and use the fast model')
+    parser.add_argument('--reuse', action='store_true',
+                        help='Return the stored answer to a similar past query instead of researching again')
+    parser.add_argument('--reuse-threshold', type=float, default=0.85,
+                        help='Minimum similarity (0-1) for a past query to be reused (default: 0.85)')
+    parser.add_argument('--reuse-max-age', type=float, default=7 * 24 * 60 * 60,
+                        help='Seconds a stored answer stays eligible for reuse (default: 604800)')
+    parser.add_argument('--search-archive', type=str, metavar='TEXT', default=None,
+                        help='Search previously saved results instead of running a query')
+    parser.add_argument('--limit', type=int, default=10,
+                        help='Maximum number of archive search results (default: 10)')
+    parser.add_argument('--jsonl', type=str, metavar='PATH', default=None,
+                        help='Append the result to this JSONL store instead of writing JSON and HTML files')
+    parser.add_argument('--export-html', type=str, metavar='PATH', default=None,
+                        help='Render HTML reports for every result in a JSONL store into the output directory')
+    parser.add_argument('--profile', action='store_true',
+                        help='Print the duration, payload sizes and token usage of each stage')
+    parser.add_argument('--metrics-file', type=str, metavar='PATH', default=None,
+                        help='Write per-stage counters to this file in Prometheus text format')
+    parser.add_argument('--otlp-file', type=str, metavar='PATH', default=None,
+                        help='Append the trace to this file as OTLP-compatible JSON')
+    parser.add_argument('--serve', action='store_true',
+                        help='Serve the research API over HTTP instead of running a single query')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Interface the server binds (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8000, help='Port the server listens on (default: 8000)')
+    parser.add_argument('--workers', type=int, default=8,
+                        help='Queries the server processes at the same time (default: 8)')
     args = parser.parse_args()
     
+    if args.export_html is not None:
+        written = export_html(args.export_html, args.output)
+        print(f"Wrote {written} HTML reports to {args.output}")
+        return
+    
+    if args.search_archive is not None:
+        search_archive(args.search_archive, args.output, args.limit)
+        return
+    
+    # Initialize the GitHub-only workflow
+    search_cache = None
+    if not args.no_cache:
+        search_cache = SearchCache(os.path.join(args.output, "search_cache.sqlite3"),
+                                   ttl=args.cache_ttl, refresh=args.refresh)
+    completion_cache = None
+    if args.completion_cache:
+        completion_cache = CompletionCache.create(os.path.join(args.output, "completion_cache.sqlite3"))
+    page_fetcher = None
+    if args.fetch_pages:
+        page_cache = None
+        if not args.no_cache:
+            page_cache = PageCache(os.path.join(args.output, "page_cache.sqlite3"), ttl=args.cache_ttl)
+        page_fetcher = PageFetcher(cache=page_cache, per_host=args.per_host, timeout=args.page_timeout)
+    query_index = None
+    if args.reuse:
+        query_index = QueryIndex(os.path.join(args.output, "query_index.sqlite3"),
+                                 threshold=args.reuse_threshold, max_age=args.reuse_max_age)
+    workflow = GithubResearchWorkflow(fan_out=args.fan_out, search_cache=search_cache,
+                                      completion_cache=completion_cache, search_backend=args.search_backend,
+                                      token_budget=args.token_budget, structured=args.structured,
+                                      query_index=query_index, research_rounds=args.rounds,
+                                      research_max_calls=args.max_calls, research_time_budget=args.time_budget,
+                                      page_fetcher=page_fetcher, research_model=args.research_model,
+                                      draft_model=args.draft_model, fast_model=args.fast_model,
+                                      cascade_drafting=args.cascade_drafting, latency_budget=args.latency_budget,
+                                      sectioned_drafting=args.sectioned, dedupe_sources=args.dedupe_sources)
+    exporters = []
+    if args.metrics_file:
+        exporters.append(PrometheusTextExporter(args.metrics_file))
+    if args.otlp_file:
+        exporters.append(OTLPJsonExporter(args.otlp_file))
+    
+    if args.serve:
+        # Imported here so one-shot runs do not load the server machinery
+        from github_server import ResearchService, serve
+        
+        sink = None
+        if args.jsonl:
+            archive_index = ArchiveIndex(os.path.join(args.output, "archive_index.sqlite3"))
+            sink = JsonlResultStore(args.jsonl, archive_index=archive_index)
+        serve(ResearchService(workflow, max_workers=args.workers, sink=sink, exporters=exporters),
+              host=args.host, port=args.port)
+        if page_fetcher is not None:
+            page_fetcher.close()
+        return
+    
     # Get query from args or prompt user
     query = args.query
     if not query:
         query = input("Enter your research query: ")
     
-    # Initialize the GitHub-only workflow
-    workflow = GithubResearchWorkflow()
-    
     print(f"\n{'-'*50}")
     print(f"Processing query: {query}")
-    print(f"Using GitHub AI model: {os.getenv('GITHUB_MODEL', 'openai/gpt-4.1')}")
+    print(f"Using GitHub AI models: {resolve_model('research', args.research_model)} (research), "
+          f"{resolve_model('draft', args.draft_model)} (drafting)")
     print("This may take a moment...")
     print(f"{'-'*50}\n")
     
     # Process the query
     start_time = time.time()
-    results = workflow.process_query(query)
+    if args.stream:
+        def print_chunk(chunk):
+            print(chunk, end='', flush=True)
+        
+        results = workflow.process_query(query, on_chunk=print_chunk)
+        print()
+    else:
+        results = workflow.process_query(query)
     end_time = time.time()
+    workflow.close()
     
     # Print processing time
     print(f"\nQuery processed in {end_time - start_time:.2f} seconds")
+    if results.get('reused'):
+        reused = results['reused']
+        print(f"Reused the answer to \"{reused['query']}\" from {reused['answered_at']} "
+              f"(similarity {reused['similarity']:.2f})")
+    for stage, served in results.get('models', {}).items():
+        note = ""
+        if served.get('escalated'):
+            note = f" (escalated: {served['escalated']})"
+        elif served.get('budget_exhausted'):
+            note = " (latency budget exhausted)"
+        print(f"{stage.capitalize()} model: {served['model']}{note}")
+    if results.get('iterations'):
+        iterations = results['iterations']
+        print(f"Research rounds: {iterations['rounds']} ({iterations['calls']} calls, "
+              f"stopped: {iterations['stop_reason']})")
+    for provider, stats in workflow.scheduler.stats().items():
+        if stats['retries'] or stats['throttled']:
+            print(f"{provider}: {stats['retries']} retries, {stats['throttled']} throttled calls")
+    for stage, stats in results.get('compaction', {}).items():
+        print(f"Compacted {stage} prompt: {stats['tokens_before']} -> {stats['tokens_after']} tokens")
+    if args.stream and results['answer']:
+        answer_metadata = results['answer']['metadata']
+        if answer_metadata.get('time_to_first_token') is not None:
+            print(f"Time to first token: {answer_metadata['time_to_first_token']:.2f} seconds "
+                  f"(stream closed after {answer_metadata['stream_duration']:.2f} seconds)")
+    if search_cache is not None:
+        cache_stats = search_cache.stats()
+        print(f"Search cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+    if completion_cache is not None:
+        cache_stats = completion_cache.stats()
+        print(f"Completion cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+    if page_fetcher is not None:
+        page_stats = page_fetcher.stats()
+        page_fetcher.close()
+        print(f"Pages: {page_stats['fetched']} fetched, {page_stats['cached'] + page_stats['not_modified']} "
+              f"from cache, {page_stats['failed']} failed")
+    if workflow.source_registry is not None:
+        source_stats = workflow.source_registry.stats()
+        print(f"Sources: {source_stats['sources']} distinct, {source_stats['url_duplicates']} duplicate URLs, "
+              f"{source_stats['near_duplicates']} near-duplicate passages "
+              f"({source_stats['dedup_seconds'] * 1000:.1f} ms)")
     
     # Save the results
     if results['status'] == 'completed':
-        json_path, html_path = save_results(results, args.output)
+        if args.jsonl:
+            archive_index = ArchiveIndex(os.path.join(args.output, "archive_index.sqlite3"))
+            with use_trace(Trace.for_state(results)), span("save"):
+                with JsonlResultStore(args.jsonl, archive_index=archive_index) as store:
+                    store.write(results)
+            archive_index.close()
+            json_path, html_path = args.jsonl, None
+            print(f"Results appended to: {json_path}")
+        else:
+            json_path, html_path = save_results(results, args.output)
         
         # Print the answer with better formatting
         if results['answer'] and 'answer' in results['answer']:
@@ -163,7 +345,10 @@ def main():
             print("ANSWER:")
             print(f"{'-'*80}")
             
-            if args.full:
+            if args.stream:
+                # The answer has already been printed while it streamed
+                print("\n[...Answer streamed above...]\n")
+            elif args.full:
                 # Print the full answer with paragraph breaks
                 print(f"\n{answer_text}\n")
             else:
@@ -198,7 +383,7 @@ def main():
                 print("SOURCES:")
                 print(f"{'-'*80}")
                 for i, source in enumerate(sources, 1):
-                    print(f"{i}. {source}")
+                    print(f"{i}. {format_source(source)}")
                 print(f"{'-'*80}\n")
             
             # Print file paths
@@ -213,5 +398,13 @@ def main():
         print(f"\nError processing query: {results['error']}")
         print("Please check your query and try again.")
     
+    # Profile and export the trace, including the save span
+    if args.profile:
+        print(f"\nPROFILE (total {end_time - start_time:.2f} seconds):")
+        print(format_profile(results['trace']))
+    for exporter in exporters:
+        exporter.export(results)
+        exporter.close()
+    
 if __name__ == "__main__":
     main()
\ No newline at end of file
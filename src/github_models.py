@@ -0,0 +1,101 @@
+"""
+Model Selection Module
+
+This module decides which GitHub model serves each stage. Every stage has its own model setting
+(GITHUB_RESEARCH_MODEL, GITHUB_DRAFT_MODEL, falling back to GITHUB_MODEL), and an optional fast
+model (GITHUB_FAST_MODEL) is tried first in a cascade: its output is checked and the stage escalates
+to the larger model only when the check fails and the query's latency budget still allows it.
+"""
+
+from typing import Any, Optional
+import os
+import time
+
+from github_findings import ResearchFindings
+
+DEFAULT_MODEL = "openai/gpt-4.1"
+
+# Environment variables holding the model of each stage
+STAGE_MODEL_VARIABLES = {
+    "research": "GITHUB_RESEARCH_MODEL",
+    "draft": "GITHUB_DRAFT_MODEL",
+}
+
+# Drafted answers shorter than this are treated as failed by the cascade
+MIN_ANSWER_CHARS = 400
+
+
+def resolve_model(stage: str, model_name: Optional[str] = None) -> str:
+    """
+    Return the model serving a stage
+
+    Args:
+        stage (str): 'research' or 'draft'
+        model_name (Optional[str]): Explicit model, which takes precedence over the environment
+
+    Returns:
+        str: The model name
+    """
+    return model_name or os.getenv(STAGE_MODEL_VARIABLES[stage]) or os.getenv("GITHUB_MODEL", DEFAULT_MODEL)
+
+
+def resolve_fast_model(model_name: Optional[str] = None) -> Optional[str]:
+    """
+    Return the fast model tried first in a cascade, if one is configured
+
+    Args:
+        model_name (Optional[str]): Explicit model, which takes precedence over GITHUB_FAST_MODEL
+
+    Returns:
+        Optional[str]: The model name, or None to disable the cascade
+    """
+    return model_name or os.getenv("GITHUB_FAST_MODEL") or None
+
+
+def budget_exhausted(deadline: Optional[float]) -> bool:
+    """
+    Check whether a query's latency budget has run out
+
+    Args:
+        deadline (Optional[float]): time.monotonic() value at which the budget runs out, or None
+
+    Returns:
+        bool: True if there is a deadline and it has passed
+    """
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def findings_check(findings: ResearchFindings, search_results: Any) -> Optional[str]:
+    """
+    Check findings from the fast model before accepting them
+
+    Args:
+        findings (ResearchFindings): The parsed findings
+        search_results (Any): The search results they were structured from
+
+    Returns:
+        Optional[str]: Why the findings should be escalated ('no_findings', 'no_sources'), or None
+    """
+    if not findings.main_findings:
+        return "no_findings"
+    has_urls = isinstance(search_results, list) and any(
+        isinstance(result, dict) and result.get("url") for result in search_results
+    )
+    if has_urls and not findings.sources:
+        return "no_sources"
+    return None
+
+
+def answer_check(answer: Any) -> Optional[str]:
+    """
+    Check an answer from the fast model before accepting it
+
+    Args:
+        answer (Any): The drafted answer text
+
+    Returns:
+        Optional[str]: Why the answer should be escalated ('short_answer'), or None
+    """
+    if not isinstance(answer, str) or len(answer.strip()) < MIN_ANSWER_CHARS:
+        return "short_answer"
+    return None
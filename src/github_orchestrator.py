@@ -5,18 +5,24 @@ This module defines a simplified orchestrator that manages the workflow between
 the GitHub-specific research agent and the answer drafter agent without using LangGraph.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Callable, List, Optional
+import asyncio
 import json
+import threading
+import time
 from datetime import datetime
-from dotenv import load_dotenv
 import os
 
 # Import our GitHub-specific agent implementations
 from github_research_agent import ResearchAgent
 from github_answer_drafter_agent import AnswerDrafterAgent
-
-# Load environment variables
-load_dotenv()
+from github_client_registry import aclose_clients, close_clients, load_environment
+from github_completion_cache import CompletionCache
+from github_page_fetcher import PageFetcher
+from github_query_reuse import QueryIndex
+from github_scheduler import CallScheduler, default_scheduler
+from github_search_cache import SearchCache
+from github_tracing import Trace, annotate, span, use_trace
 
 class GithubResearchWorkflow:
     """
@@ -24,53 +30,449 @@ class GithubResearchWorkflow:
     using a simple sequential workflow.
     """
     
-    def __init__(self):
+    def __init__(self, fan_out: int = 1, search_cache: Optional[SearchCache] = None,
+                 completion_cache: Optional[CompletionCache] = None, search_backend: Optional[str] = None,
+                 token_budget: Optional[int] = None, structured: bool = False,
+                 scheduler: Optional[CallScheduler] = None, query_index: Optional[QueryIndex] = None,
+                 research_rounds: int = 1, research_max_calls: Optional[int] = None,
+                 research_time_budget: Optional[float] = None, page_fetcher: Optional[PageFetcher] = None,
+                 research_model: Optional[str] = None, draft_model: Optional[str] = None,
+                 fast_model: Optional[str] = None, cascade_drafting: bool = False,
+                 latency_budget: Optional[float] = None, sectioned_drafting: bool = False,
+                 dedupe_sources: bool = False):
         """
         Initialize the research workflow with GitHub-specific agents
+        
+        Args:
+            fan_out (int): Number of sub-queries the research agent searches concurrently
+            search_cache (Optional[SearchCache]): Cache for search results, or None to always search
+            completion_cache (Optional[CompletionCache]): Cache shared by both agents for model completions
+            search_backend (Optional[str]): Tavily client used by the research agent ('langchain' or 'direct')
+            token_budget (Optional[int]): Token budget for the search results and findings sent to the model
+            structured (bool): Request JSON findings and fail the query if they cannot be validated
+            scheduler (Optional[CallScheduler]): Rate-limit-aware scheduler shared by both agents
+                (defaults to the process-wide scheduler)
+            query_index (Optional[QueryIndex]): Index of answered queries; a close enough match
+                is returned instead of running the workflow, and new answers are added to it
+            research_rounds (int): Maximum number of research rounds; above 1, follow-up searches
+                are run for the open questions of each round until new results add little
+            research_max_calls (Optional[int]): Maximum searches and completions of iterative research
+            research_time_budget (Optional[float]): Seconds after which iterative research starts no new round
+            page_fetcher (Optional[PageFetcher]): Fetcher used to replace search snippets with the text of
+                their pages before structuring, or None to use the snippets
+            research_model (Optional[str]): Model structuring the findings (defaults to GITHUB_RESEARCH_MODEL,
+                then GITHUB_MODEL)
+            draft_model (Optional[str]): Model drafting the answer (defaults to GITHUB_DRAFT_MODEL, then GITHUB_MODEL)
+            fast_model (Optional[str]): Smaller model tried first for structuring, escalating to the research
+                model when its findings fail validation (defaults to GITHUB_FAST_MODEL)
+            cascade_drafting (bool): Also try the fast model first for drafting, escalating on short answers
+            latency_budget (Optional[float]): Seconds per query after which no stage escalates to, or
+                starts on, a larger model than the fast one
+            sectioned_drafting (bool): Draft the subtopics of the findings as concurrent sections
+                (streamed answers are always drafted in one pass)
+            dedupe_sources (bool): Drop duplicate and near-duplicate search results through a source
+                registry shared by every query of the workflow, and cite sources by stable IDs (S1, S2, ...)
         """
-        self.research_agent = ResearchAgent()
-        self.answer_drafter = AnswerDrafterAgent()
+        load_environment()
+        
+        self.fan_out = fan_out
+        self.search_cache = search_cache
+        self.completion_cache = completion_cache
+        self.search_backend = search_backend
+        self.token_budget = token_budget
+        self.structured = structured
+        self.scheduler = scheduler or default_scheduler()
+        self.query_index = query_index
+        self.research_rounds = research_rounds
+        self.research_max_calls = research_max_calls
+        self.research_time_budget = research_time_budget
+        self.page_fetcher = page_fetcher
+        self.research_model = research_model
+        self.draft_model = draft_model
+        self.fast_model = fast_model
+        self.cascade_drafting = cascade_drafting
+        self.latency_budget = latency_budget
+        self.sectioned_drafting = sectioned_drafting
+        self.source_registry = None
+        if dedupe_sources:
+            from github_sources import SourceRegistry  # NumPy is only needed when sources are deduplicated
+            self.source_registry = SourceRegistry()
+        
+        # Agents are built on first use; both share the pooled client from the registry
+        self._research_agent = None
+        self._answer_drafter = None
+        self._agents_lock = threading.Lock()
     
-    def process_query(self, query: str) -> Dict[str, Any]:
+    @property
+    def research_agent(self) -> ResearchAgent:
         """
-        Process a user query through the complete workflow
+        The research agent, created on first access
+        """
+        with self._agents_lock:
+            if self._research_agent is None:
+                self._research_agent = ResearchAgent(model_name=self.research_model, fast_model=self.fast_model,
+                                                     fan_out=self.fan_out, search_cache=self.search_cache,
+                                                     completion_cache=self.completion_cache,
+                                                     search_backend=self.search_backend,
+                                                     token_budget=self.token_budget,
+                                                     structured=self.structured,
+                                                     scheduler=self.scheduler,
+                                                     page_fetcher=self.page_fetcher,
+                                                     source_registry=self.source_registry)
+        return self._research_agent
+    
+    @property
+    def answer_drafter(self) -> AnswerDrafterAgent:
+        """
+        The answer drafter agent, created on first access
+        """
+        with self._agents_lock:
+            if self._answer_drafter is None:
+                self._answer_drafter = AnswerDrafterAgent(model_name=self.draft_model, fast_model=self.fast_model,
+                                                          cascade=self.cascade_drafting,
+                                                          sectioned=self.sectioned_drafting,
+                                                          completion_cache=self.completion_cache,
+                                                          token_budget=self.token_budget,
+                                                          scheduler=self.scheduler)
+        return self._answer_drafter
+    
+    def close(self) -> None:
+        """
+        Close the shared inference clients used by the agents
+        """
+        close_clients()
+    
+    async def aclose(self) -> None:
+        """
+        Close the shared async inference clients bound to the running event loop
+        """
+        await aclose_clients()
+    
+    def __enter__(self) -> "GithubResearchWorkflow":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    async def __aenter__(self) -> "GithubResearchWorkflow":
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+    
+    def new_state(self, query: str) -> Dict[str, Any]:
+        """
+        Create the initial workflow state for a query
         
         Args:
             query (str): The user's research query
             
         Returns:
-            Dict[str, Any]: The final result with both research and answer
+            Dict[str, Any]: The initial state
         """
-        # Initialize the state
-        state = {
+        return {
             "query": query,
             "status": "initializing",
             "research_results": None,
             "answer": None,
+            "compaction": {},
+            "models": {},
+            "trace": Trace().data,
             "error": None
         }
+    
+    def _record_stage_info(self, state: Dict[str, Any], stage: str, info: Dict[str, Any]) -> None:
+        """
+        Copy the details reported by an agent for one stage into the state
+        
+        Args:
+            state (Dict[str, Any]): The workflow state
+            stage (str): The stage name ('research' or 'drafting')
+            info (Dict[str, Any]): The details reported by the agent
+        """
+        if "compaction" in info:
+            state["compaction"][stage] = info["compaction"]
+        if "model" in info:
+            state.setdefault("models", {})[stage] = info["model"]
+        if "iterations" in info:
+            state["iterations"] = info["iterations"]
+        if "parse_repaired" in info or "parse_error" in info:
+            state["parse"] = {
+                "repaired": info.get("parse_repaired", False),
+                "error": info.get("parse_error")
+            }
+    
+    def reuse_stage(self, state: Dict[str, Any], on_chunk: Optional[Callable[[str], None]] = None) -> bool:
+        """
+        Complete the state from a stored answer to a similar past query, if there is one
+        
+        Args:
+            state (Dict[str, Any]): The workflow state
+            on_chunk (Optional[Callable[[str], None]]): If given, the reused answer is passed to it
+                as a single chunk
+            
+        Returns:
+            bool: True if a stored answer was reused and the state is completed
+        """
+        if self.query_index is None:
+            return False
+        with use_trace(Trace.for_state(state)), span("reuse_lookup"):
+            match = self.query_index.find(state["query"])
+            annotate(reused=match is not None)
+        if match is None:
+            return False
+        
+        answer = match["answer"]
+        answer.setdefault("metadata", {})["timestamp"] = datetime.now().isoformat()
+        state["research_results"] = match["research_results"]
+        state["answer"] = answer
+        state["reused"] = {
+            "query": match["query"],
+            "similarity": match["similarity"],
+            "answered_at": datetime.fromtimestamp(match["created_at"]).isoformat()
+        }
+        if on_chunk is not None and answer.get("answer"):
+            on_chunk(answer["answer"])
+        state["status"] = "completed"
+        return True
+    
+    def remember_stage(self, state: Dict[str, Any]) -> None:
+        """
+        Add a freshly completed answer to the query index
+        
+        Args:
+            state (Dict[str, Any]): The workflow state; only completed, non-reused answers are added
+        """
+        if self.query_index is not None and state["status"] == "completed" and "reused" not in state:
+            self.query_index.add(state["query"], state["research_results"], state["answer"])
+    
+    def _deadline(self, state: Dict[str, Any]) -> Optional[float]:
+        """
+        Return when the query's latency budget runs out, as a time.monotonic() value
+        
+        Time already spent is taken from the top-level spans of the state's trace, so the budget
+        also holds when the stages of a query run separately (e.g. after a resumed batch).
+        
+        Args:
+            state (Dict[str, Any]): The workflow state
+            
+        Returns:
+            Optional[float]: The deadline, or None without a latency budget
+        """
+        if self.latency_budget is None:
+            return None
+        spent = sum(record.get("duration") or 0.0 for record in state.get("trace", {}).get("spans", [])
+                    if record.get("parent_id") is None)
+        return time.monotonic() + self.latency_budget - spent
+    
+    def _research(self, query: str, info: Dict[str, Any], deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Research a query in a single pass, or iteratively when more than one round is allowed
+        """
+        if self.research_rounds > 1:
+            return self.research_agent.research_iterative(query, max_rounds=self.research_rounds,
+                                                          max_calls=self.research_max_calls,
+                                                          time_budget=self.research_time_budget, info=info,
+                                                          deadline=deadline)
+        return self.research_agent.research(query, info=info, deadline=deadline)
+    
+    async def _aresearch(self, query: str, info: Dict[str, Any], deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Async counterpart of _research
+        """
+        if self.research_rounds > 1:
+            return await self.research_agent.aresearch_iterative(query, max_rounds=self.research_rounds,
+                                                                 max_calls=self.research_max_calls,
+                                                                 time_budget=self.research_time_budget, info=info,
+                                                                 deadline=deadline)
+        return await self.research_agent.aresearch(query, info=info, deadline=deadline)
+    
+    def research_stage(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the research stage for a state created by new_state
+        
+        Args:
+            state (Dict[str, Any]): The workflow state
+            
+        Returns:
+            Dict[str, Any]: The same state, with research results filled in
+        """
+        state["status"] = "researching"
+        research_info = {}
+        deadline = self._deadline(state)
+        with use_trace(Trace.for_state(state)), span("research"):
+            state["research_results"] = self._research(state["query"], research_info, deadline)
+        self._record_stage_info(state, "research", research_info)
+        state["status"] = "research_completed"
+        return state
+    
+    def draft_stage(self, state: Dict[str, Any], on_chunk: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """
+        Run the drafting stage for a state whose research stage has completed
+        
+        Args:
+            state (Dict[str, Any]): The workflow state
+            on_chunk (Optional[Callable[[str], None]]): If given, the answer is streamed and
+                each text chunk is passed to this callback as it arrives
+            
+        Returns:
+            Dict[str, Any]: The same state, with the answer filled in
+        """
+        query = state["query"]
+        research_results = state["research_results"]
+        
+        state["status"] = "drafting"
+        drafting_info = {}
+        deadline = self._deadline(state)
+        with use_trace(Trace.for_state(state)), span("drafting", streamed=on_chunk is not None):
+            if on_chunk is not None:
+                stream = self.answer_drafter.stream_answer(query, research_results, info=drafting_info,
+                                                           deadline=deadline)
+                for chunk in stream:
+                    on_chunk(chunk)
+                answer = stream.answer
+            else:
+                answer = self.answer_drafter.draft_answer(query, research_results, info=drafting_info,
+                                                          deadline=deadline)
+        self._record_stage_info(state, "drafting", drafting_info)
+        # Add timestamp
+        answer["metadata"]["timestamp"] = datetime.now().isoformat()
+        state["answer"] = answer
+        state["status"] = "drafting_completed"
+        
+        # Finalize
+        state["status"] = "completed"
+        return state
+    
+    def process_query(self, query: str, on_chunk: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """
+        Process a user query through the complete workflow
+        
+        Args:
+            query (str): The user's research query
+            on_chunk (Optional[Callable[[str], None]]): If given, the answer is streamed and
+                each text chunk is passed to this callback as it arrives
+            
+        Returns:
+            Dict[str, Any]: The final result with both research and answer
+        """
+        # Initialize the state
+        state = self.new_state(query)
         
         try:
+            # Step 0: Reuse the answer to a close paraphrase, if one is stored
+            if self.reuse_stage(state, on_chunk=on_chunk):
+                return state
+            
             # Step 1: Conduct research
+            self.research_stage(state)
+            
+            # Step 2: Draft answer
+            self.draft_stage(state, on_chunk=on_chunk)
+            self.remember_stage(state)
+            
+        except Exception as e:
+            state["status"] = "error"
+            state["error"] = str(e)
+        
+        # Return the final state
+        return state
+    
+    async def aprocess_query(self, query: str) -> Dict[str, Any]:
+        """
+        Process a user query through the complete workflow using the async clients
+        
+        Args:
+            query (str): The user's research query
+            
+        Returns:
+            Dict[str, Any]: The final result with both research and answer
+        """
+        state = self.new_state(query)
+        
+        try:
+            if self.reuse_stage(state):
+                return state
+            
             state["status"] = "researching"
-            research_results = self.research_agent.research(query)
+            research_info = {}
+            with use_trace(Trace.for_state(state)), span("research"):
+                research_results = await self._aresearch(query, research_info, self._deadline(state))
             state["research_results"] = research_results
+            self._record_stage_info(state, "research", research_info)
             state["status"] = "research_completed"
             
-            # Step 2: Draft answer
             state["status"] = "drafting"
-            answer = self.answer_drafter.draft_answer(query, research_results)
-            # Add timestamp
+            drafting_info = {}
+            with use_trace(Trace.for_state(state)), span("drafting", streamed=False):
+                answer = await self.answer_drafter.adraft_answer(query, research_results, info=drafting_info,
+                                                                 deadline=self._deadline(state))
+            self._record_stage_info(state, "drafting", drafting_info)
             answer["metadata"]["timestamp"] = datetime.now().isoformat()
             state["answer"] = answer
             state["status"] = "drafting_completed"
             
-            # Step 3: Finalize
             state["status"] = "completed"
+            self.remember_stage(state)
             
         except Exception as e:
             state["status"] = "error"
             state["error"] = str(e)
         
-        # Return the final state
-        return state
\ No newline at end of file
+        return state
+    
+    async def aprocess_batch(self, queries: List[str], max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        """
+        Process several queries concurrently, with at most max_concurrency in flight
+        
+        A failure in one query is recorded in that query's state and does not
+        affect the others. The shared async clients stay open for reuse; close them
+        with ``aclose()`` (or ``async with``) when done.
+        
+        Args:
+            queries (List[str]): The research queries
+            max_concurrency (int): Maximum number of queries processed at the same time
+            
+        Returns:
+            List[Dict[str, Any]]: The final states, in the same order as the queries
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run_one(query: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.aprocess_query(query)
+        
+        results = await asyncio.gather(*(run_one(query) for query in queries), return_exceptions=True)
+        
+        states = []
+        for query, result in zip(queries, results):
+            if isinstance(result, BaseException):
+                state = self.new_state(query)
+                state["status"] = "error"
+                state["error"] = str(result)
+                result = state
+            states.append(result)
+        return states
+    
+    def process_batch(self, queries: List[str], max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        """
+        Process several queries concurrently from synchronous code
+        
+        Args:
+            queries (List[str]): The research queries
+            max_concurrency (int): Maximum number of queries processed at the same time
+            
+        Returns:
+            List[Dict[str, Any]]: The final states, in the same order as the queries
+        """
+        async def run() -> List[Dict[str, Any]]:
+            try:
+                return await self.aprocess_batch(queries, max_concurrency=max_concurrency)
+            finally:
+                # The async clients are bound to this event loop, so release them before it closes
+                await self.aclose()
+        
+        return asyncio.run(run())
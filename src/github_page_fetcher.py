@@ -0,0 +1,489 @@
+"""
+Page Fetcher Module
+
+This module fetches the pages behind search results so research can use their full text instead of
+the short search snippets. Pages are downloaded concurrently over a bounded pool of keep-alive
+connections with a per-host limit and timeouts, their main text is extracted in a worker pool, and
+the extracted text is cached in SQLite by URL together with the page's ETag, so a repeated fetch is
+either skipped (while fresh) or answered with 304 Not Modified.
+"""
+
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import contextmanager
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+import http.client
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# Elements whose text is never part of the main content
+SKIPPED_TAGS = {"script", "style", "noscript", "template", "svg", "nav", "header", "footer", "aside", "form",
+                "button", "iframe", "select"}
+
+# Elements that end a line of text
+BLOCK_TAGS = {"p", "div", "section", "article", "main", "li", "ul", "ol", "table", "tr", "br", "blockquote",
+              "pre", "h1", "h2", "h3", "h4", "h5", "h6", "dd", "dt"}
+
+# Content types worth extracting; anything else (PDFs, images) keeps its search snippet
+TEXT_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+
+MAX_REDIRECTS = 3
+
+_CHARSET = re.compile(r"charset=([\w-]+)", re.IGNORECASE)
+_SPACE = re.compile(r"[ \t\r\f\v]+")
+
+
+class _TextExtractor(HTMLParser):
+    """
+    Collects visible text, keeping the text of <article>/<main> separately when the page has one.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.text: List[str] = []
+        self.main: List[str] = []
+        self._skip = 0
+        self._main = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skip += 1
+        elif tag in ("article", "main"):
+            self._main += 1
+        if tag in BLOCK_TAGS:
+            self._newline()
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in ("article", "main"):
+            self._main = max(0, self._main - 1)
+        if tag in BLOCK_TAGS:
+            self._newline()
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        self.text.append(data)
+        if self._main:
+            self.main.append(data)
+
+    def _newline(self):
+        self.text.append("\n")
+        if self._main:
+            self.main.append("\n")
+
+
+def _normalize_text(parts: List[str]) -> str:
+    lines = (_SPACE.sub(" ", line).strip() for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def extract_text(document: str, content_type: str = "text/html", max_chars: int = 8000) -> str:
+    """
+    Extract the main text of a page
+
+    Uses the text of the page's <article> or <main> element when it holds a substantial part of
+    the page, and otherwise all visible text outside navigation, scripts and forms.
+
+    Args:
+        document (str): The page body
+        content_type (str): The page's media type
+        max_chars (int): Maximum number of characters returned
+
+    Returns:
+        str: The extracted text
+    """
+    if content_type == "text/plain":
+        return _normalize_text([document])[:max_chars]
+
+    parser = _TextExtractor()
+    parser.feed(document)
+    parser.close()
+    text = _normalize_text(parser.text)
+    main = _normalize_text(parser.main)
+    if len(main) >= 0.3 * len(text):
+        text = main
+    return text[:max_chars]
+
+
+class PageCache:
+    """
+    Disk-backed cache of extracted page text stored in SQLite, keyed by URL.
+
+    Entries younger than the TTL are used without a request; older entries are revalidated with
+    their ETag or Last-Modified date and reused when the server answers 304 Not Modified.
+    """
+
+    def __init__(self, path: str, ttl: float = 24 * 60 * 60, max_entries: int = 20000):
+        """
+        Open (or create) the page cache.
+
+        Args:
+            path (str): Path of the SQLite database file
+            ttl (float): Seconds an entry is used without revalidation
+            max_entries (int): Maximum number of entries kept before the oldest are evicted
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS page_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                text TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_page_cache_fetched_at ON page_cache (fetched_at)")
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached page
+
+        Args:
+            url (str): The page URL
+
+        Returns:
+            Optional[Dict[str, Any]]: The entry (etag, last_modified, text, fresh), or None on a miss
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, text, fetched_at FROM page_cache WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, text, fetched_at = row
+        return {"etag": etag, "last_modified": last_modified, "text": text,
+                "fresh": time.time() - fetched_at <= self.ttl}
+
+    def set(self, url: str, text: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """
+        Store the extracted text of a page, evicting the oldest entries if needed
+
+        Args:
+            url (str): The page URL
+            text (str): The extracted text
+            etag (Optional[str]): The page's ETag header
+            last_modified (Optional[str]): The page's Last-Modified header
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO page_cache (url, etag, last_modified, text, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, text, time.time())
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM page_cache").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM page_cache WHERE url IN "
+                    "(SELECT url FROM page_cache ORDER BY fetched_at ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            self._conn.commit()
+
+    def touch(self, url: str) -> None:
+        """
+        Mark a cached page as freshly validated
+        """
+        with self._lock:
+            self._conn.execute("UPDATE page_cache SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+    def close(self) -> None:
+        """
+        Close the underlying database connection
+        """
+        with self._lock:
+            self._conn.close()
+
+
+class _HostPool:
+    """
+    Keep-alive connections to one scheme://host, at most `size` of them in use at a time.
+    """
+
+    def __init__(self, scheme: str, netloc: str, size: int, timeout: float):
+        self.scheme = scheme
+        self.netloc = netloc
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self) -> Iterator[Tuple[http.client.HTTPConnection, bool]]:
+        """
+        Borrow a connection, waiting while the host's limit is reached
+
+        Yields:
+            Tuple[http.client.HTTPConnection, bool]: The connection and whether it was reused
+        """
+        self._slots.acquire()
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        reused = conn is not None
+        if conn is None:
+            connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            conn = connection_class(self.netloc, timeout=self.timeout)
+        healthy = False
+        try:
+            yield conn, reused
+            healthy = True
+        finally:
+            if healthy:
+                with self._lock:
+                    self._idle.append(conn)
+            else:
+                conn.close()
+            self._slots.release()
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._idle:
+                conn.close()
+            self._idle.clear()
+
+
+class PageFetcher:
+    """
+    Concurrent page fetcher with per-host connection limits, a worker pool for text extraction
+    and an optional URL/ETag page cache.
+    """
+
+    def __init__(self, cache: Optional[PageCache] = None, max_connections: int = 16, per_host: int = 2,
+                 timeout: float = 10.0, max_bytes: int = 2_000_000, max_chars: int = 8000,
+                 extract_workers: int = 4, extractor: Optional[Executor] = None,
+                 user_agent: str = "github-research/1.0"):
+        """
+        Args:
+            cache (Optional[PageCache]): Cache of extracted pages, or None to always fetch
+            max_connections (int): Maximum number of pages downloaded at the same time
+            per_host (int): Maximum number of simultaneous connections to one host
+            timeout (float): Connect and read timeout in seconds
+            max_bytes (int): Pages larger than this are truncated
+            max_chars (int): Maximum characters of extracted text kept per page
+            extract_workers (int): Threads extracting text when no extractor is given
+            extractor (Optional[Executor]): Executor for text extraction, e.g. a ProcessPoolExecutor
+                for large pages; it is not shut down by close()
+            user_agent (str): User-Agent header sent with every request
+        """
+        self.cache = cache
+        self.per_host = per_host
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.max_chars = max_chars
+        self.user_agent = user_agent
+        self.fetched = 0
+        self.not_modified = 0
+        self.cached = 0
+        self.failed = 0
+
+        self._downloads = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix="page-fetch")
+        self._owns_extractor = extractor is None
+        self._extractor = extractor or ThreadPoolExecutor(max_workers=extract_workers,
+                                                          thread_name_prefix="page-extract")
+        self._hosts: Dict[Tuple[str, str], _HostPool] = {}
+        self._lock = threading.Lock()
+
+    def _host_pool(self, scheme: str, netloc: str) -> _HostPool:
+        with self._lock:
+            pool = self._hosts.get((scheme, netloc))
+            if pool is None:
+                pool = self._hosts[(scheme, netloc)] = _HostPool(scheme, netloc, self.per_host, self.timeout)
+            return pool
+
+    def _request(self, url: str, headers: Dict[str, str]) -> Tuple[int, Any, bytes]:
+        """
+        Send a GET request over a pooled connection, retrying once if a reused connection went stale
+
+        Returns:
+            Tuple[int, Any, bytes]: The status, the response headers and the (possibly truncated) body
+        """
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        pool = self._host_pool(parts.scheme, parts.netloc)
+        for attempt in range(2):
+            with pool.connection() as (conn, reused):
+                try:
+                    conn.request("GET", path, headers=headers)
+                    response = conn.getresponse()
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    if reused and attempt == 0:
+                        conn.close()
+                        continue
+                    raise
+                body = response.read(self.max_bytes + 1)
+                if len(body) > self.max_bytes:
+                    # The rest of an oversized body is still on the wire
+                    conn.close()
+                else:
+                    # Finish the response so the connection can be reused
+                    response.read()
+                return response.status, response.headers, body[:self.max_bytes]
+        raise http.client.HTTPException(f"Could not fetch {url}")
+
+    def _download(self, url: str) -> Dict[str, Any]:
+        """
+        Download a page, or resolve it from the cache
+
+        Returns:
+            Dict[str, Any]: Either {'text'} for a cached page or {'body', 'content_type', 'charset', 'etag',
+            'last_modified'} for a page that still needs extracting; {} when the page is unusable
+        """
+        entry = self.cache.get(url) if self.cache is not None else None
+        if entry is not None and entry["fresh"]:
+            return {"text": entry["text"], "source": "cached"}
+
+        headers = {"User-Agent": self.user_agent, "Accept": "text/html,application/xhtml+xml,text/plain;q=0.9"}
+        if entry is not None and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry is not None and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        target = url
+        redirected = False
+        for _ in range(MAX_REDIRECTS + 1):
+            status, response_headers, body = self._request(target, headers)
+            if status in (301, 302, 303, 307, 308) and response_headers.get("Location"):
+                target = urljoin(target, response_headers["Location"])
+                # The validators belong to the original URL, not to the redirect target
+                headers = {name: value for name, value in headers.items()
+                           if name not in ("If-None-Match", "If-Modified-Since")}
+                redirected = True
+                continue
+            break
+
+        if status == 304 and entry is not None:
+            self.cache.touch(url)
+            return {"text": entry["text"], "source": "not_modified"}
+        if status != 200:
+            return {}
+        content_type = (response_headers.get("Content-Type") or "text/html").split(";")[0].strip().lower()
+        if content_type not in TEXT_CONTENT_TYPES:
+            return {}
+        charset = _CHARSET.search(response_headers.get("Content-Type") or "")
+        # A redirect target's validators would be sent to the original URL next time, so keep none
+        return {
+            "body": body,
+            "content_type": content_type,
+            "charset": charset.group(1) if charset else "utf-8",
+            "etag": None if redirected else response_headers.get("ETag"),
+            "last_modified": None if redirected else response_headers.get("Last-Modified"),
+        }
+
+    def fetch_all(self, urls: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Fetch pages concurrently and extract their main text
+
+        Args:
+            urls (List[str]): The page URLs
+
+        Returns:
+            Dict[str, Optional[str]]: The extracted text per URL, or None if the page could not be used
+        """
+        urls = list(dict.fromkeys(url for url in urls if urlsplit(url).scheme in ("http", "https")))
+        downloads = {url: self._downloads.submit(self._download, url) for url in urls}
+        extractions = {}
+        pages: Dict[str, Optional[str]] = {}
+        for url, future in downloads.items():
+            try:
+                page = future.result()
+            except Exception:
+                page = {}
+            if "text" in page:
+                pages[url] = page["text"]
+                with self._lock:
+                    if page["source"] == "cached":
+                        self.cached += 1
+                    else:
+                        self.not_modified += 1
+            elif "body" in page:
+                try:
+                    document = page["body"].decode(page["charset"], errors="replace")
+                except LookupError:
+                    document = page["body"].decode("utf-8", errors="replace")
+                # Extraction overlaps with the downloads that are still running
+                extractions[url] = (page, self._extractor.submit(extract_text, document, page["content_type"],
+                                                                 self.max_chars))
+            else:
+                pages[url] = None
+
+        for url, (page, future) in extractions.items():
+            try:
+                text = future.result()
+            except Exception:
+                text = ""
+            pages[url] = text or None
+            if text and self.cache is not None:
+                self.cache.set(url, text, page["etag"], page["last_modified"])
+
+        with self._lock:
+            self.fetched += len(extractions)
+            self.failed += sum(1 for text in pages.values() if text is None)
+        return pages
+
+    def enrich(self, search_results: Any) -> Any:
+        """
+        Replace the snippet of each search result with the extracted text of its page
+
+        The original snippet is kept under 'snippet'. Results whose page could not be fetched or
+        yields less text than the snippet are left unchanged.
+
+        Args:
+            search_results (Any): The search results (a list of url/content dicts)
+
+        Returns:
+            Any: The enriched search results (anything other than a list is returned unchanged)
+        """
+        if not isinstance(search_results, list):
+            return search_results
+        urls = [result["url"] for result in search_results if isinstance(result, dict) and result.get("url")]
+        pages = self.fetch_all(urls)
+
+        enriched = []
+        for result in search_results:
+            text = pages.get(result.get("url")) if isinstance(result, dict) else None
+            snippet = result.get("content") if isinstance(result, dict) else None
+            if text and len(text) > len(snippet or ""):
+                result = {**result, "content": text, "snippet": snippet}
+            enriched.append(result)
+        return enriched
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return fetch counters
+
+        Returns:
+            Dict[str, Any]: Pages fetched, revalidated (304), served from the cache and failed
+        """
+        with self._lock:
+            return {"fetched": self.fetched, "not_modified": self.not_modified, "cached": self.cached,
+                    "failed": self.failed}
+
+    def close(self) -> None:
+        """
+        Stop the worker pools and close pooled connections and the cache
+        """
+        self._downloads.shutdown(wait=True)
+        if self._owns_extractor:
+            self._extractor.shutdown(wait=True)
+        with self._lock:
+            for pool in self._hosts.values():
+                pool.close()
+        if self.cache is not None:
+            self.cache.close()
@@ -0,0 +1,208 @@
+"""
+Pipeline Runner Module
+
+This module runs many queries through GithubResearchWorkflow as a two-stage pipeline. A pool of
+research workers and a pool of drafting workers are connected by bounded queues, so query N+1 is
+researched while query N is drafted and the batch makespan approaches the duration of the slowest
+stage instead of the sum of both. With a query index, research workers complete close paraphrases
+from stored answers and drafting workers add new answers to the index.
+"""
+
+from typing import Dict, Any, Iterable, Iterator, List
+import queue
+import threading
+
+from github_orchestrator import GithubResearchWorkflow
+
+# Marks the end of a stage's input
+_DONE = object()
+
+
+class PipelineRunner:
+    """
+    Staged runner that overlaps the research and drafting stages of consecutive queries.
+    """
+
+    def __init__(self, workflow: GithubResearchWorkflow, research_workers: int = 2, drafting_workers: int = 2,
+                 queue_size: int = 4, ordered: bool = True):
+        """
+        Args:
+            workflow (GithubResearchWorkflow): The workflow whose stages are run
+            research_workers (int): Number of threads running the research stage
+            drafting_workers (int): Number of threads running the drafting stage
+            queue_size (int): Capacity of each inter-stage queue; a full queue blocks the
+                stage feeding it (backpressure)
+            ordered (bool): Deliver results in input order rather than completion order
+        """
+        if research_workers < 1 or drafting_workers < 1:
+            raise ValueError("Each stage needs at least one worker")
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+
+        self.workflow = workflow
+        self.research_workers = research_workers
+        self.drafting_workers = drafting_workers
+        self.queue_size = queue_size
+        self.ordered = ordered
+        self._stop = threading.Event()
+
+    def _put(self, target: queue.Queue, item: Any) -> bool:
+        """
+        Put an item on a bounded queue, giving up if the run is being stopped
+
+        Returns:
+            bool: True if the item was queued
+        """
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source: queue.Queue) -> Any:
+        """
+        Take an item from a queue, returning _DONE if the run is being stopped
+        """
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _feed(self, queries: Iterable[str], research_queue: queue.Queue, errors: List[BaseException]) -> None:
+        try:
+            for index, query in enumerate(queries):
+                if not self._put(research_queue, (index, self.workflow.new_state(query))):
+                    return
+        except Exception as e:
+            # Raised to the caller of run() once the queries already queued have been delivered
+            errors.append(e)
+        finally:
+            for _ in range(self.research_workers):
+                self._put(research_queue, _DONE)
+
+    def _research_worker(self, research_queue: queue.Queue, drafting_queue: queue.Queue,
+                         output_queue: queue.Queue, finished: List[int], lock: threading.Lock) -> None:
+        while True:
+            item = self._get(research_queue)
+            if item is _DONE:
+                break
+            index, state = item
+            try:
+                if self.workflow.reuse_stage(state):
+                    self._put(output_queue, (index, state))
+                    continue
+                self.workflow.research_stage(state)
+            except Exception as e:
+                state["status"] = "error"
+                state["error"] = str(e)
+                self._put(output_queue, (index, state))
+                continue
+            self._put(drafting_queue, (index, state))
+
+        # The last research worker to finish closes the drafting stage's input
+        with lock:
+            finished[0] += 1
+            last = finished[0] == self.research_workers
+        if last:
+            for _ in range(self.drafting_workers):
+                self._put(drafting_queue, _DONE)
+
+    def _drafting_worker(self, drafting_queue: queue.Queue, output_queue: queue.Queue,
+                         finished: List[int], lock: threading.Lock) -> None:
+        while True:
+            item = self._get(drafting_queue)
+            if item is _DONE:
+                break
+            index, state = item
+            try:
+                self.workflow.draft_stage(state)
+                self.workflow.remember_stage(state)
+            except Exception as e:
+                state["status"] = "error"
+                state["error"] = str(e)
+            self._put(output_queue, (index, state))
+
+        with lock:
+            finished[0] += 1
+            last = finished[0] == self.drafting_workers
+        if last:
+            self._put(output_queue, _DONE)
+
+    def run(self, queries: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Run queries through the pipeline, yielding each final state as it becomes available
+
+        Args:
+            queries (Iterable[str]): The research queries; consumed lazily
+
+        Yields:
+            Dict[str, Any]: Final workflow states, in input order if ordered=True
+
+        Raises:
+            Exception: Whatever iterating over queries raised, after the states of the queries
+                taken before it have been yielded
+        """
+        self._stop.clear()
+        research_queue = queue.Queue(maxsize=self.queue_size)
+        drafting_queue = queue.Queue(maxsize=self.queue_size)
+        output_queue = queue.Queue(maxsize=self.queue_size)
+        lock = threading.Lock()
+        research_finished = [0]
+        drafting_finished = [0]
+        feed_errors: List[BaseException] = []
+
+        threads = [threading.Thread(target=self._feed, args=(queries, research_queue, feed_errors), daemon=True)]
+        threads += [
+            threading.Thread(target=self._research_worker,
+                             args=(research_queue, drafting_queue, output_queue, research_finished, lock),
+                             daemon=True)
+            for _ in range(self.research_workers)
+        ]
+        threads += [
+            threading.Thread(target=self._drafting_worker,
+                             args=(drafting_queue, output_queue, drafting_finished, lock),
+                             daemon=True)
+            for _ in range(self.drafting_workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        pending: Dict[int, Dict[str, Any]] = {}
+        next_index = 0
+        try:
+            while True:
+                item = self._get(output_queue)
+                if item is _DONE:
+                    break
+                index, state = item
+                if not self.ordered:
+                    yield state
+                    continue
+                # Hold results that finished early until every earlier query has been delivered
+                pending[index] = state
+                while next_index in pending:
+                    yield pending.pop(next_index)
+                    next_index += 1
+            if feed_errors:
+                raise feed_errors[0]
+        finally:
+            # Also reached when the caller stops iterating early
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+
+    def run_all(self, queries: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Run queries through the pipeline and collect every final state
+
+        Args:
+            queries (Iterable[str]): The research queries
+
+        Returns:
+            List[Dict[str, Any]]: Final workflow states, in input order if ordered=True
+        """
+        return list(self.run(queries))
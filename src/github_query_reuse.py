@@ -0,0 +1,243 @@
+"""
+Query Reuse Module
+
+This module keeps a local similarity index over answered queries so that close paraphrases of a
+query that was already answered can reuse the stored answer instead of running the workflow again.
+Queries are compared by TF-IDF cosine similarity over stopword-filtered terms, with an inverted
+index in SQLite so a lookup only touches past queries that share a term with the new one.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+from collections import Counter
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from github_compaction import STOPWORDS
+
+# Candidates (by shared-term weight) scored exactly per lookup
+MAX_CANDIDATES = 50
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def query_terms(query: str) -> List[str]:
+    """
+    Tokenize a query into lowercase, stopword-filtered terms with plural 's' removed
+
+    Args:
+        query (str): The query text
+
+    Returns:
+        List[str]: The terms
+    """
+    terms = []
+    for word in _WORD.findall(query.lower()):
+        if word in STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+
+class QueryIndex:
+    """
+    Persistent TF-IDF index over answered queries and their stored answers.
+    """
+
+    def __init__(self, path: str, threshold: float = 0.85, max_age: float = 7 * 24 * 60 * 60):
+        """
+        Open (or create) the query index.
+
+        Args:
+            path (str): Path of the SQLite database file
+            threshold (float): Minimum cosine similarity for a past query to be reused
+            max_age (float): Seconds a stored answer stays eligible for reuse
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self.threshold = threshold
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS queries (
+                id INTEGER PRIMARY KEY,
+                query TEXT NOT NULL,
+                research_results TEXT,
+                answer TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                query_id INTEGER NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (term, query_id)
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS postings_query ON postings (query_id)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS queries_created ON queries (created_at)")
+        self._conn.commit()
+
+    def _idf(self, terms: List[str]) -> Dict[str, float]:
+        """
+        Smoothed inverse document frequency of each term over the stored queries
+        """
+        total = self._conn.execute("SELECT COUNT(*) FROM queries").fetchone()[0]
+        placeholders = ",".join("?" * len(terms))
+        df = dict(self._conn.execute(
+            f"SELECT term, COUNT(*) FROM postings WHERE term IN ({placeholders}) GROUP BY term", terms
+        ).fetchall())
+        return {term: math.log((total + 1) / (df.get(term, 0) + 1)) + 1 for term in terms}
+
+    @staticmethod
+    def _vector(counts: Dict[str, int], idf: Dict[str, float]) -> Dict[str, float]:
+        vector = {term: tf * idf[term] for term, tf in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+        return {term: weight / norm for term, weight in vector.items()}
+
+    def find(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Find the most similar fresh past query
+
+        Args:
+            query (str): The new query
+
+        Returns:
+            Optional[Dict[str, Any]]: The stored entry (query, research_results, answer,
+            created_at, similarity) if one reaches the threshold, otherwise None
+        """
+        counts = Counter(query_terms(query))
+        if not counts:
+            self.misses += 1
+            return None
+
+        cutoff = time.time() - self.max_age
+        with self._lock:
+            terms = list(counts)
+            placeholders = ",".join("?" * len(terms))
+            rows = self._conn.execute(
+                f"""
+                SELECT postings.query_id, postings.term FROM postings
+                JOIN queries ON queries.id = postings.query_id
+                WHERE postings.term IN ({placeholders}) AND queries.created_at >= ?
+                """,
+                terms + [cutoff]
+            ).fetchall()
+            if not rows:
+                self.misses += 1
+                return None
+
+            # Shortlist by shared-term weight, then score the shortlist exactly
+            idf = self._idf(terms)
+            shared = Counter()
+            for query_id, term in rows:
+                shared[query_id] += idf[term]
+            candidates = [query_id for query_id, _ in shared.most_common(MAX_CANDIDATES)]
+
+            placeholders = ",".join("?" * len(candidates))
+            candidate_counts: Dict[int, Dict[str, int]] = {}
+            for query_id, term, tf in self._conn.execute(
+                f"SELECT query_id, term, tf FROM postings WHERE query_id IN ({placeholders})", candidates
+            ).fetchall():
+                candidate_counts.setdefault(query_id, {})[term] = tf
+
+            all_terms = sorted(set(terms).union(*(set(c) for c in candidate_counts.values())))
+            idf = self._idf(all_terms)
+            target = self._vector(counts, idf)
+
+            best: Tuple[float, Optional[int]] = (0.0, None)
+            for query_id, candidate in candidate_counts.items():
+                vector = self._vector(candidate, idf)
+                similarity = sum(weight * vector.get(term, 0.0) for term, weight in target.items())
+                if similarity > best[0]:
+                    best = (similarity, query_id)
+
+            similarity, query_id = best
+            if query_id is None or similarity < self.threshold:
+                self.misses += 1
+                return None
+
+            row = self._conn.execute(
+                "SELECT query, research_results, answer, created_at FROM queries WHERE id = ?", (query_id,)
+            ).fetchone()
+            self.hits += 1
+
+        stored_query, research_results, answer, created_at = row
+        return {
+            "query": stored_query,
+            "research_results": json.loads(research_results) if research_results else None,
+            "answer": json.loads(answer),
+            "created_at": created_at,
+            "similarity": similarity,
+        }
+
+    def add(self, query: str, research_results: Any, answer: Dict[str, Any]) -> None:
+        """
+        Store an answered query
+
+        Args:
+            query (str): The query
+            research_results (Any): The research findings the answer was drafted from
+            answer (Dict[str, Any]): The drafted answer
+        """
+        counts = Counter(query_terms(query))
+        if not counts:
+            return
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO queries (query, research_results, answer, created_at) VALUES (?, ?, ?, ?)",
+                (query, json.dumps(research_results, ensure_ascii=False), json.dumps(answer, ensure_ascii=False),
+                 time.time())
+            )
+            self._conn.executemany(
+                "INSERT INTO postings (term, query_id, tf) VALUES (?, ?, ?)",
+                [(term, cursor.lastrowid, tf) for term, tf in counts.items()]
+            )
+            self._conn.commit()
+
+    def prune(self) -> int:
+        """
+        Remove entries older than max_age
+
+        Returns:
+            int: Number of entries removed
+        """
+        cutoff = time.time() - self.max_age
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM postings WHERE query_id IN (SELECT id FROM queries WHERE created_at < ?)", (cutoff,)
+            )
+            removed = self._conn.execute("DELETE FROM queries WHERE created_at < ?", (cutoff,)).rowcount
+            self._conn.commit()
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters and the number of stored queries
+
+        Returns:
+            Dict[str, Any]: The statistics
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM queries").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def close(self) -> None:
+        """
+        Close the underlying database connection
+        """
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,167 @@
+"""
+Report Module
+
+This module renders research results as standalone HTML reports. Rendering is kept out of the
+save path: reports are produced on demand, for a single result or exported from a result store.
+"""
+
+from typing import Dict, Any, Optional
+from html import escape
+from string import Template
+import os
+import re
+import time
+
+from github_findings import format_source
+from github_result_store import iter_results
+
+REPORT_TEMPLATE = Template("""<!DOCTYPE html>
+<html>
+<head>
+    <title>Research: $query</title>
+    <meta charset="UTF-8">
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; max-width: 800px; margin: 0 auto; padding: 20px; }
+        h1 { color: #2c3e50; border-bottom: 1px solid #eee; padding-bottom: 10px; }
+        h2 { color: #3498db; margin-top: 30px; }
+        .metadata { color: #7f8c8d; font-size: 0.9em; margin-bottom: 30px; }
+        .answer { background-color: #f9f9f9; padding: 20px; border-radius: 5px; }
+        .sources { margin-top: 30px; }
+        .source-item { margin-bottom: 10px; }
+        .answer code { background-color: #f0f0f0; padding: 2px 4px; border-radius: 3px; font-family: monospace; }
+        .answer pre { background-color: #f0f0f0; padding: 10px; border-radius: 5px; overflow-x: auto; }
+        .answer blockquote { border-left: 4px solid #ccc; margin-left: 0; padding-left: 15px; color: #555; }
+        .answer img { max-width: 100%; }
+        .answer table { border-collapse: collapse; width: 100%; }
+        .answer th, .answer td { border: 1px solid #ddd; padding: 8px; }
+    </style>
+</head>
+<body>
+    <h1>Research Results: $query</h1>
+    <div class="metadata">
+        <p>Generated on: $generated_on</p>
+        <p>Model used: $model_used</p>
+    </div>
+
+    <h2>Answer</h2>
+    <div class="answer">
+        $answer
+    </div>
+$sources</body>
+</html>""")
+
+SOURCES_TEMPLATE = Template("""
+    <h2>Sources</h2>
+    <div class="sources">
+$items    </div>
+""")
+
+SOURCE_ITEM_TEMPLATE = Template("""        <div class="source-item">
+            <strong>Source $number:</strong> $source
+        </div>
+""")
+
+
+def has_answer(results: Dict[str, Any]) -> bool:
+    """
+    Check whether a result contains an answer that can be rendered
+
+    Args:
+        results (Dict[str, Any]): The research results
+
+    Returns:
+        bool: True if the result completed with an answer
+    """
+    return results.get("status") == "completed" and bool(results.get("answer")) and "answer" in results["answer"]
+
+
+def render_html(results: Dict[str, Any], generated_at: Optional[float] = None) -> str:
+    """
+    Render a completed research result as an HTML report
+
+    Args:
+        results (Dict[str, Any]): The research results; must contain an answer
+        generated_at (Optional[float]): Unix timestamp shown as the generation time (defaults to now)
+
+    Returns:
+        str: The HTML document
+    """
+    import markdown  # Only needed when an HTML report is rendered
+
+    answer = results["answer"]
+    sources = answer.get("sources", [])
+    items = "".join(
+        SOURCE_ITEM_TEMPLATE.substitute(number=i, source=escape(format_source(source)))
+        for i, source in enumerate(sources, 1)
+    )
+    generated_at = generated_at if generated_at is not None else time.time()
+
+    return REPORT_TEMPLATE.substitute(
+        query=escape(results["query"]),
+        generated_on=time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(generated_at)),
+        model_used=escape(str(answer.get("metadata", {}).get("model_used", "Unknown"))),
+        answer=markdown.markdown(answer["answer"], extensions=["tables", "fenced_code"]),
+        sources=SOURCES_TEMPLATE.substitute(items=items) if sources else "",
+    )
+
+
+def report_filename(results: Dict[str, Any], suffix: int) -> str:
+    """
+    Build the report filename for a result, '<query slug>_<suffix>.html'
+
+    Args:
+        results (Dict[str, Any]): The research results
+        suffix (int): Number that makes the name unique, such as a timestamp or store offset
+
+    Returns:
+        str: The filename
+    """
+    query_slug = re.sub(r"[^\w-]", "", results["query"].lower()[:30].replace(" ", "_"))
+    return f"{query_slug}_{suffix}.html"
+
+
+def write_html(results: Dict[str, Any], path: str, generated_at: Optional[float] = None) -> str:
+    """
+    Render a result and write the report to a file
+
+    Args:
+        results (Dict[str, Any]): The research results; must contain an answer
+        path (str): Destination file path
+        generated_at (Optional[float]): Unix timestamp shown as the generation time
+
+    Returns:
+        str: The path written
+    """
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(render_html(results, generated_at))
+    return path
+
+
+def export_html(store_path: str, output_dir: str) -> int:
+    """
+    Render an HTML report for every answered result in a JSONL result store
+
+    Results are read one at a time, and reports that already exist are not rendered again.
+
+    Args:
+        store_path (str): Path of the JSONL result store
+        output_dir (str): Directory the reports are written to
+
+    Returns:
+        int: Number of reports written
+    """
+    written = 0
+    for location, results in iter_results(store_path):
+        if not has_answer(results):
+            continue
+        # The byte offset makes names unique within the store and stable across exports
+        offset = int(location.rpartition("#")[2])
+        path = os.path.join(output_dir, report_filename(results, offset))
+        if os.path.exists(path):
+            continue
+        write_html(results, path)
+        written += 1
+    return written
@@ -5,19 +5,54 @@ This module defines the research agent responsible for data collection and infor
 using Tavily's search API, operating only with GitHub AI models.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
 import json
-from langchain.tools.tavily_search import TavilySearchResults
-from dotenv import load_dotenv
 import os
 
-# Import Azure AI SDK for GitHub model
-from azure.ai.inference import ChatCompletionsClient
-from azure.ai.inference.models import SystemMessage, UserMessage
-from azure.core.credentials import AzureKeyCredential
+from github_compaction import compact_search_results
+from github_completion_cache import CompletionCache, complete_cached, acomplete_cached
+from github_findings import FindingsParseError, parse_findings
+from github_iteration import IterationBudget, NoveltyTracker
+from github_models import budget_exhausted, findings_check, resolve_fast_model, resolve_model
+from github_page_fetcher import PageFetcher
+from github_scheduler import CallScheduler, default_scheduler
+from github_search_cache import SearchCache
+from github_tracing import annotate, payload_bytes, span
+from github_client_registry import DEFAULT_ENDPOINT, get_client, get_async_client, load_environment
 
-# Load environment variables
-load_dotenv()
+# The Azure AI SDK, LangChain and NumPy are imported where they are used to keep startup fast
+if TYPE_CHECKING:
+    from github_sources import SourceRegistry
+    from azure.ai.inference import ChatCompletionsClient
+    from azure.ai.inference.aio import ChatCompletionsClient as AsyncChatCompletionsClient
+
+RESEARCH_SYSTEM_PROMPT = """You are an expert researcher tasked with gathering comprehensive information.
+                Extract key facts, data points, and insights from the search results.
+                Format your research findings as structured JSON with the following fields:
+                - main_findings: A list of the most important facts discovered
+                - detailed_notes: More in-depth information organized by subtopic
+                - sources: The sources you consulted, with URLs when available; when a search result has a
+                  source_id (e.g. "S3"), list that ID as the source
+                - open_questions: Gaps the search results leave unanswered, each phrased as a short search query
+                
+                Your goal is to collect thorough, accurate, and well-organized information."""
+
+REPAIR_PROMPT = """Your previous response could not be used as research findings ({error}).
+Return only a single valid JSON object with the fields main_findings (a list of strings),
+detailed_notes, sources and open_questions (a list of strings). Do not include any other text."""
+
+# Facets appended to the original query to build fan-out sub-queries
+FAN_OUT_FACETS = [
+    "overview",
+    "latest developments",
+    "applications and use cases",
+    "challenges and limitations",
+    "history and background",
+    "key statistics and data",
+]
 
 class ResearchAgent:
     """
@@ -25,27 +60,88 @@ class ResearchAgent:
     and collecting relevant information based on user queries (GitHub-only version).
     """
     
-    def __init__(self, model_name: str = "gpt-4o-mini", api_type: str = "github"):
+    def __init__(self, model_name: Optional[str] = None, api_type: str = "github", fan_out: int = 1,
+                 search_cache: Optional[SearchCache] = None, completion_cache: Optional[CompletionCache] = None,
+                 search_backend: Optional[str] = None, token_budget: Optional[int] = None,
+                 structured: bool = False, scheduler: Optional[CallScheduler] = None,
+                 page_fetcher: Optional[PageFetcher] = None, fast_model: Optional[str] = None,
+                 source_registry: Optional["SourceRegistry"] = None):
         """
         Initialize the research agent with the specified model.
         
         Args:
-            model_name (str): The model to use for the agent (ignored in GitHub-only version)
+            model_name (Optional[str]): The model that structures the findings (defaults to
+                GITHUB_RESEARCH_MODEL, then GITHUB_MODEL)
             api_type (str): The API provider type (only 'github' supported in this version)
+            fan_out (int): Number of sub-queries searched concurrently per research call
+            search_cache (Optional[SearchCache]): Cache consulted before searching the web
+            completion_cache (Optional[CompletionCache]): Cache consulted before calling the model
+            search_backend (Optional[str]): 'langchain' for TavilySearchResults or 'direct' for the
+                lightweight REST client (defaults to TAVILY_SEARCH_BACKEND, then 'langchain')
+            token_budget (Optional[int]): Compact search results to this many tokens before the
+                structuring call, or None to send them verbatim
+            structured (bool): Request JSON output from the model and raise FindingsParseError if it
+                still fails schema validation, or has no main findings, after one repair attempt
+            scheduler (Optional[CallScheduler]): Scheduler for model and search calls (defaults to
+                the process-wide scheduler)
+            page_fetcher (Optional[PageFetcher]): If given, the pages behind the search results are
+                fetched and their extracted text replaces the search snippets
+            fast_model (Optional[str]): Model tried first for structuring (defaults to GITHUB_FAST_MODEL);
+                its findings are escalated to the main model when they fail validation
+            source_registry (Optional[SourceRegistry]): If given, duplicate search results are dropped,
+                the rest are tagged with stable citation IDs, and the sources of the findings are
+                resolved to the registry's entries
         """
-        # Use the model specified in the .env file
-        self.github_model = os.getenv("GITHUB_MODEL", "openai/gpt-4.1")
-        self.github_token = os.getenv("GITHUB_TOKEN", "")
-        self.endpoint = "https://models.github.ai/inference"
+        load_environment()
         
-        # Initialize Azure SDK client for GitHub AI model
-        self.github_client = ChatCompletionsClient(
-            endpoint=self.endpoint,
-            credential=AzureKeyCredential(self.github_token),
-        )
+        self.github_model = resolve_model("research", model_name)
+        self.fast_model = resolve_fast_model(fast_model)
+        self.github_token = os.getenv("GITHUB_TOKEN", "")
+        self.endpoint = os.getenv("GITHUB_ENDPOINT", DEFAULT_ENDPOINT)
         
-        self.search_tool = TavilySearchResults(api_key=os.getenv("TAVILY_API_KEY"))
+        self.search_backend = search_backend or os.getenv("TAVILY_SEARCH_BACKEND", "langchain")
+        if self.search_backend not in ("langchain", "direct"):
+            raise ValueError(f"Unknown search backend: {self.search_backend}")
+        self._search_tool = None
         self.api_type = "github"  # Force GitHub API type
+        self.fan_out = max(1, fan_out)
+        self.search_cache = search_cache
+        self.completion_cache = completion_cache
+        self.token_budget = token_budget
+        self.structured = structured
+        self.scheduler = scheduler or default_scheduler()
+        self.page_fetcher = page_fetcher
+        self.source_registry = source_registry
+    
+    @property
+    def search_tool(self) -> Any:
+        """
+        The Tavily search tool, created when the first real search runs
+        """
+        if self._search_tool is None:
+            if self.search_backend == "direct":
+                from github_tavily_client import TavilyClient
+                self._search_tool = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+            else:
+                from langchain.tools.tavily_search import TavilySearchResults
+                self._search_tool = TavilySearchResults(api_key=os.getenv("TAVILY_API_KEY"))
+        return self._search_tool
+    
+    @property
+    def github_client(self) -> "ChatCompletionsClient":
+        """
+        The shared, pooled GitHub model client for this endpoint and token
+        """
+        return get_client(self.endpoint, self.github_token)
+    
+    def _get_async_client(self) -> "AsyncChatCompletionsClient":
+        """
+        Return the shared async GitHub model client for the running event loop
+        
+        Returns:
+            AsyncChatCompletionsClient: The async inference client
+        """
+        return get_async_client(self.endpoint, self.github_token)
         
     def search(self, query: str, max_results: int = 5) -> Dict[str, Any]:
         """
@@ -58,55 +154,729 @@ class ResearchAgent:
         Returns:
             Dict[str, Any]: The search results
         """
-        results = self.search_tool.invoke({"query": query, "max_results": max_results})
-        return results
+        with span("search", bytes_in=payload_bytes(query)):
+            if self.search_cache is not None:
+                cached = self.search_cache.get(query, max_results)
+                if cached is not None:
+                    annotate(cached=True, bytes_out=payload_bytes(cached))
+                    return cached
+            
+            results = self.scheduler.call(
+                "tavily", lambda: self.search_tool.invoke({"query": query, "max_results": max_results})
+            )
+            annotate(cached=False, bytes_out=payload_bytes(results))
+            
+            # Only successful searches are cached; Tavily reports errors as a string
+            if self.search_cache is not None and isinstance(results, list):
+                self.search_cache.set(query, max_results, results)
+            return results
+        
+    async def asearch(self, query: str, max_results: int = 5) -> Dict[str, Any]:
+        """
+        Perform a web search using Tavily's search API without blocking the event loop
+        
+        Args:
+            query (str): The search query
+            max_results (int): Maximum number of results to return
+            
+        Returns:
+            Dict[str, Any]: The search results
+        """
+        with span("search", bytes_in=payload_bytes(query)):
+            if self.search_cache is not None:
+                cached = self.search_cache.get(query, max_results)
+                if cached is not None:
+                    annotate(cached=True, bytes_out=payload_bytes(cached))
+                    return cached
+            
+            results = await self.scheduler.acall(
+                "tavily", lambda: self.search_tool.ainvoke({"query": query, "max_results": max_results})
+            )
+            annotate(cached=False, bytes_out=payload_bytes(results))
+            
+            if self.search_cache is not None and isinstance(results, list):
+                self.search_cache.set(query, max_results, results)
+            return results
+    
+    def decompose_query(self, query: str, fan_out: int) -> List[str]:
+        """
+        Break a query into sub-queries that cover different facets of the topic
+        
+        The original query is always the first sub-query. Decomposition is done
+        locally so that it adds no round-trip before the searches start.
+        
+        Args:
+            query (str): The research query
+            fan_out (int): Total number of sub-queries to produce
+            
+        Returns:
+            List[str]: The sub-queries
+        """
+        facets = FAN_OUT_FACETS[:max(0, fan_out - 1)]
+        return [query] + [f"{query} {facet}" for facet in facets]
+    
+    @staticmethod
+    def _merge_search_results(result_lists: List[Any]) -> List[Any]:
+        """
+        Merge several search result lists, keeping the first result seen for each URL
+        
+        Args:
+            result_lists (List[Any]): The result lists returned by each search
+            
+        Returns:
+            List[Any]: The merged, deduplicated results
+        """
+        merged = []
+        seen_urls = set()
+        for results in result_lists:
+            # Tavily returns an error string instead of a list when a search fails
+            if not isinstance(results, list):
+                continue
+            for result in results:
+                url = result.get("url") if isinstance(result, dict) else None
+                if url:
+                    key = url.strip().rstrip("/").lower()
+                    if key in seen_urls:
+                        continue
+                    seen_urls.add(key)
+                merged.append(result)
+        return merged
+    
+    def search_many(self, queries: List[str], max_results: int = 5) -> List[Any]:
+        """
+        Search several queries concurrently and merge the results
+        
+        Args:
+            queries (List[str]): The queries to search
+            max_results (int): Maximum number of results per query
+            
+        Returns:
+            List[Any]: The merged, deduplicated results
+        """
+        with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+            # Each worker runs in a copy of the caller's context so its spans join the active trace
+            futures = [
+                pool.submit(contextvars.copy_context().run, self.search, sub_query, max_results)
+                for sub_query in queries
+            ]
+            outcomes = []
+            for future in futures:
+                try:
+                    outcomes.append(future.result())
+                except Exception as e:
+                    outcomes.append(e)
+        return self._merge_fan_out_outcomes(outcomes)
+    
+    async def asearch_many(self, queries: List[str], max_results: int = 5) -> List[Any]:
+        """
+        Search several queries concurrently on the event loop and merge the results
         
-    def research(self, query: str) -> Dict[str, Any]:
+        Args:
+            queries (List[str]): The queries to search
+            max_results (int): Maximum number of results per query
+            
+        Returns:
+            List[Any]: The merged, deduplicated results
+        """
+        outcomes = await asyncio.gather(
+            *(self.asearch(sub_query, max_results) for sub_query in queries),
+            return_exceptions=True
+        )
+        return self._merge_fan_out_outcomes(list(outcomes))
+    
+    def fan_out_search(self, query: str, fan_out: int, max_results: int = 5) -> List[Any]:
+        """
+        Search all sub-queries of a query concurrently and merge the results
+        
+        Args:
+            query (str): The research query
+            fan_out (int): Number of sub-queries to search
+            max_results (int): Maximum number of results per sub-query
+            
+        Returns:
+            List[Any]: The merged, deduplicated results
+        """
+        return self.search_many(self.decompose_query(query, fan_out), max_results)
+    
+    async def afan_out_search(self, query: str, fan_out: int, max_results: int = 5) -> List[Any]:
+        """
+        Search all sub-queries of a query concurrently on the event loop and merge the results
+        
+        Args:
+            query (str): The research query
+            fan_out (int): Number of sub-queries to search
+            max_results (int): Maximum number of results per sub-query
+            
+        Returns:
+            List[Any]: The merged, deduplicated results
+        """
+        return await self.asearch_many(self.decompose_query(query, fan_out), max_results)
+    
+    def _merge_fan_out_outcomes(self, outcomes: List[Any]) -> List[Any]:
+        """
+        Merge fan-out search outcomes, tolerating individual sub-query failures
+        
+        Args:
+            outcomes (List[Any]): Result lists or exceptions, one per sub-query
+            
+        Returns:
+            List[Any]: The merged, deduplicated results
+            
+        Raises:
+            Exception: The first failure, if every sub-query failed
+        """
+        failures = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+        if failures and len(failures) == len(outcomes):
+            raise failures[0]
+        return self._merge_search_results([outcome for outcome in outcomes if not isinstance(outcome, BaseException)])
+    
+    def register_sources(self, search_results: Any) -> Any:
+        """
+        Deduplicate search results and tag them with citation IDs when a source registry is configured
+        
+        Args:
+            search_results (Any): The search results
+            
+        Returns:
+            Any: The deduplicated, tagged search results, or the search results unchanged without a registry
+        """
+        if self.source_registry is None or not isinstance(search_results, list):
+            return search_results
+        with span("register_sources", results=len(search_results)) as record:
+            registered = self.source_registry.register(search_results)
+            record["attributes"]["kept"] = len(registered)
+        return registered
+    
+    def resolve_sources(self, findings: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Replace the sources of findings with their registry entries when a source registry is configured
+        
+        Args:
+            findings (Dict[str, Any]): The research findings
+            
+        Returns:
+            Dict[str, Any]: The findings, with sources as {'id', 'title', 'url'} entries where they are known
+        """
+        if self.source_registry is None:
+            return findings
+        return self.source_registry.resolve(findings)
+    
+    def fetch_pages(self, search_results: Any) -> Any:
+        """
+        Replace search snippets with the text of their pages when a page fetcher is configured
+        
+        Args:
+            search_results (Any): The search results
+            
+        Returns:
+            Any: The enriched search results, or the search results unchanged without a page fetcher
+        """
+        if self.page_fetcher is None or not isinstance(search_results, list):
+            return search_results
+        with span("fetch_pages", pages=len(search_results)):
+            enriched = self.page_fetcher.enrich(search_results)
+            annotate(bytes_in=payload_bytes(search_results), bytes_out=payload_bytes(enriched))
+        return enriched
+    
+    async def afetch_pages(self, search_results: Any) -> Any:
+        """
+        Run fetch_pages in a worker thread so the event loop is not blocked
+        """
+        if self.page_fetcher is None:
+            return search_results
+        return await asyncio.to_thread(self.fetch_pages, search_results)
+    
+    def _build_messages(self, query: str, search_results: Any, info: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """
+        Build the chat messages used to structure the search results
+        
+        Args:
+            query (str): The research query
+            search_results (Any): The raw search results
+            info (Optional[Dict[str, Any]]): Receives compaction statistics when a token budget is set
+            
+        Returns:
+            List[Any]: The system and user messages for the completion call
+        """
+        from azure.ai.inference.models import SystemMessage, UserMessage
+        
+        if self.token_budget:
+            search_results, stats = compact_search_results(query, search_results, self.token_budget)
+            if info is not None:
+                info["compaction"] = stats
+        
+        return [
+            SystemMessage(content=RESEARCH_SYSTEM_PROMPT),
+            UserMessage(content=f"Analyze and organize these search results about '{query}': {json.dumps(search_results)}")
+        ]
+    
+    def _completion_params(self, model: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Return the parameters of the structuring completion call
+        
+        Args:
+            model (Optional[str]): The model to call (defaults to the agent's model)
+            
+        Returns:
+            Dict[str, Any]: Keyword arguments for the completion call
+        """
+        params = {"temperature": 0.7, "top_p": 1.0, "model": model or self.github_model}
+        if self.structured:
+            params["response_format"] = "json_object"
+        return params
+    
+    def _repair_messages(self, messages: List[Any], content: Any, error: Exception) -> List[Any]:
+        """
+        Build the follow-up messages asking the model to fix unparseable findings
+        
+        Args:
+            messages (List[Any]): The original messages
+            content (Any): The unparseable response
+            error (Exception): Why the response could not be parsed
+            
+        Returns:
+            List[Any]: The messages for the repair call
+        """
+        from azure.ai.inference.models import AssistantMessage, UserMessage
+        
+        return messages + [
+            AssistantMessage(content=content if isinstance(content, str) else str(content)),
+            UserMessage(content=REPAIR_PROMPT.format(error=error))
+        ]
+    
+    def _parse_repaired(self, content: Any, info: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Parse the response of the repair call
+        
+        Args:
+            content (Any): The repaired response
+            info (Optional[Dict[str, Any]]): Receives the parse outcome
+            
+        Returns:
+            Dict[str, Any]: Structured research findings, or the raw text if parsing still fails
+            
+        Raises:
+            FindingsParseError: In structured mode, if the repaired response is still invalid
+        """
+        try:
+            findings = parse_findings(content, strict=self.structured).model_dump()
+        except FindingsParseError as e:
+            if self.structured:
+                raise
+            if info is not None:
+                info["parse_error"] = str(e)
+            return {"research_text": content}
+        
+        if info is not None:
+            info["parse_repaired"] = True
+        return findings
+    
+    def _check_fast(self, content: Any, search_results: Any) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Parse and check the findings of the fast model
+        
+        Args:
+            content (Any): The fast model's response
+            search_results (Any): The search results it structured
+            
+        Returns:
+            Tuple[Optional[Dict[str, Any]], Optional[str]]: The findings (None if unparseable) and the
+            reason to escalate (None if they pass)
+        """
+        with span("parse", bytes_in=payload_bytes(content)):
+            try:
+                findings = parse_findings(content, strict=self.structured)
+            except FindingsParseError:
+                return None, "parse_error"
+        return findings.model_dump(), findings_check(findings, search_results)
+    
+    def _cascade_outcome(self, findings: Optional[Dict[str, Any]], reason: Optional[str],
+                         deadline: Optional[float], info: Optional[Dict[str, Any]]) -> Tuple[bool, str]:
+        """
+        Decide what to do with the fast model's findings
+        
+        Returns:
+            Tuple[bool, str]: Whether to keep the findings, and the model to continue with otherwise
+        """
+        if reason is None:
+            self._record_model(info, self.fast_model, None, False)
+            return True, self.fast_model
+        if budget_exhausted(deadline):
+            # No time for the large model: keep valid findings, or repair the fast model's output
+            self._record_model(info, self.fast_model, None, True)
+            return findings is not None, self.fast_model
+        annotate(escalated=reason)
+        self._record_model(info, self.github_model, reason, False)
+        return False, self.github_model
+    
+    def _record_model(self, info: Optional[Dict[str, Any]], model: str, escalated: Optional[str],
+                      exhausted: bool) -> None:
+        if info is not None:
+            info["model"] = {"model": model, "escalated": escalated, "budget_exhausted": exhausted}
+    
+    def _structure(self, query: str, search_results: Any, info: Optional[Dict[str, Any]] = None,
+                   deadline: Optional[float] = None) -> Tuple[Dict[str, Any], int]:
+        """
+        Structure search results into research findings, repairing unparseable output once
+        
+        With a fast model configured, it is tried first and its findings are kept if they pass
+        validation; otherwise the main model structures the results, unless the latency budget
+        has run out.
+        
+        Args:
+            query (str): The research query
+            search_results (Any): The search results to structure
+            info (Optional[Dict[str, Any]]): Receives details about the call, such as compaction statistics
+                and the model that served it
+            deadline (Optional[float]): time.monotonic() value at which the query's latency budget runs out
+            
+        Returns:
+            Tuple[Dict[str, Any], int]: The findings and the number of completion calls made
+            
+        Raises:
+            FindingsParseError: In structured mode, if no valid findings could be parsed
+        """
+        # Use GitHub model to analyze and structure the search results
+        messages = self._build_messages(query, search_results, info)
+        model = self.github_model
+        content = None
+        calls = 0
+        if self.fast_model and self.fast_model != self.github_model:
+            with span("research_completion", model=self.fast_model):
+                content = complete_cached(self.github_client, self.completion_cache, messages,
+                                          scheduler=self.scheduler, **self._completion_params(self.fast_model))
+            calls += 1
+            findings, reason = self._check_fast(content, search_results)
+            keep, model = self._cascade_outcome(findings, reason, deadline, info)
+            if keep:
+                return findings, calls
+            if model != self.fast_model:
+                content = None
+        else:
+            self._record_model(info, model, None, False)
+        
+        params = self._completion_params(model)
+        if content is None:
+            with span("research_completion", model=model):
+                content = complete_cached(self.github_client, self.completion_cache, messages,
+                                          scheduler=self.scheduler, **params)
+            calls += 1
+        try:
+            with span("parse", bytes_in=payload_bytes(content)):
+                return parse_findings(content, strict=self.structured).model_dump(), calls
+        except FindingsParseError as e:
+            # One bounded repair attempt instead of silently keeping the raw text
+            with span("repair_completion", model=model):
+                repaired = complete_cached(self.github_client, self.completion_cache,
+                                           self._repair_messages(messages, content, e),
+                                           scheduler=self.scheduler, **params)
+        with span("parse", bytes_in=payload_bytes(repaired), repair=True):
+            return self._parse_repaired(repaired, info), calls + 1
+    
+    async def _astructure(self, query: str, search_results: Any, info: Optional[Dict[str, Any]] = None,
+                          deadline: Optional[float] = None) -> Tuple[Dict[str, Any], int]:
+        """
+        Structure search results into research findings using the async inference client
+        
+        Args:
+            query (str): The research query
+            search_results (Any): The search results to structure
+            info (Optional[Dict[str, Any]]): Receives details about the call, such as compaction statistics
+                and the model that served it
+            deadline (Optional[float]): time.monotonic() value at which the query's latency budget runs out
+            
+        Returns:
+            Tuple[Dict[str, Any], int]: The findings and the number of completion calls made
+            
+        Raises:
+            FindingsParseError: In structured mode, if no valid findings could be parsed
+        """
+        messages = self._build_messages(query, search_results, info)
+        model = self.github_model
+        content = None
+        calls = 0
+        if self.fast_model and self.fast_model != self.github_model:
+            with span("research_completion", model=self.fast_model):
+                content = await acomplete_cached(self._get_async_client(), self.completion_cache, messages,
+                                                 scheduler=self.scheduler, **self._completion_params(self.fast_model))
+            calls += 1
+            findings, reason = self._check_fast(content, search_results)
+            keep, model = self._cascade_outcome(findings, reason, deadline, info)
+            if keep:
+                return findings, calls
+            if model != self.fast_model:
+                content = None
+        else:
+            self._record_model(info, model, None, False)
+        
+        params = self._completion_params(model)
+        if content is None:
+            with span("research_completion", model=model):
+                content = await acomplete_cached(self._get_async_client(), self.completion_cache, messages,
+                                                 scheduler=self.scheduler, **params)
+            calls += 1
+        try:
+            with span("parse", bytes_in=payload_bytes(content)):
+                return parse_findings(content, strict=self.structured).model_dump(), calls
+        except FindingsParseError as e:
+            with span("repair_completion", model=model):
+                repaired = await acomplete_cached(self._get_async_client(), self.completion_cache,
+                                                  self._repair_messages(messages, content, e),
+                                                  scheduler=self.scheduler, **params)
+        with span("parse", bytes_in=payload_bytes(repaired), repair=True):
+            return self._parse_repaired(repaired, info), calls + 1
+    
+    def research(self, query: str, fan_out: Optional[int] = None, info: Optional[Dict[str, Any]] = None,
+                 deadline: Optional[float] = None) -> Dict[str, Any]:
         """
         Conduct research on a given query
         
         Args:
             query (str): The research query
+            fan_out (Optional[int]): Number of concurrent sub-query searches (defaults to the agent setting)
+            info (Optional[Dict[str, Any]]): Receives details about the call, such as compaction statistics
+            deadline (Optional[float]): time.monotonic() value at which the query's latency budget runs out
             
         Returns:
             Dict[str, Any]: Structured research findings
+            
+        Raises:
+            FindingsParseError: In structured mode, if no valid findings could be parsed
         """
+        fan_out = fan_out or self.fan_out
+        
         # First, perform the search to gather raw information
-        search_results = self.search(query)
+        if fan_out > 1:
+            search_results = self.fan_out_search(query, fan_out)
+        else:
+            search_results = self.search(query)
+        search_results = self.fetch_pages(self.register_sources(search_results))
         
-        # Use GitHub model to analyze and structure the search results
-        response = self.github_client.complete(
-            messages=[
-                SystemMessage(content="""You are an expert researcher tasked with gathering comprehensive information.
-                Extract key facts, data points, and insights from the search results.
-                Format your research findings as structured JSON with the following fields:
-                - main_findings: A list of the most important facts discovered
-                - detailed_notes: More in-depth information organized by subtopic
-                - sources: The sources you consulted, with URLs when available
-                
-                Your goal is to collect thorough, accurate, and well-organized information."""),
-                UserMessage(content=f"Analyze and organize these search results about '{query}': {json.dumps(search_results)}")
-            ],
-            temperature=0.7,
-            top_p=1.0,
-            model=self.github_model
-        )
-        structured_research_content = response.choices[0].message.content
+        findings, _ = self._structure(query, search_results, info, deadline)
+        return self.resolve_sources(findings)
+    
+    async def aresearch(self, query: str, fan_out: Optional[int] = None, info: Optional[Dict[str, Any]] = None,
+                        deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Conduct research on a given query using the async search and inference clients
         
-        # Extract and return the content
-        try:
-            # Try to extract JSON from the response
-            if isinstance(structured_research_content, str):
-                if "{" in structured_research_content and "}" in structured_research_content:
-                    # Extract the JSON part if it's embedded in text
-                    import re
-                    json_match = re.search(r'({.*})', structured_research_content.replace('\n', ' '), re.DOTALL)
-                    if json_match:
-                        structured_research_content = json_match.group(1)
-                    return json.loads(structured_research_content)
-                return {"research_text": structured_research_content}
+        Args:
+            query (str): The research query
+            fan_out (Optional[int]): Number of concurrent sub-query searches (defaults to the agent setting)
+            info (Optional[Dict[str, Any]]): Receives details about the call, such as compaction statistics
+            deadline (Optional[float]): time.monotonic() value at which the query's latency budget runs out
+            
+        Returns:
+            Dict[str, Any]: Structured research findings
+            
+        Raises:
+            FindingsParseError: In structured mode, if no valid findings could be parsed
+        """
+        fan_out = fan_out or self.fan_out
+        
+        if fan_out > 1:
+            search_results = await self.afan_out_search(query, fan_out)
+        else:
+            search_results = await self.asearch(query)
+        search_results = await self.afetch_pages(self.register_sources(search_results))
+        
+        findings, _ = await self._astructure(query, search_results, info, deadline)
+        return self.resolve_sources(findings)
+    
+    @staticmethod
+    def _follow_up_queries(findings: Dict[str, Any], asked: Set[str], limit: int) -> List[str]:
+        """
+        Pick the follow-up queries for the next round from the open questions of the findings
+        
+        Args:
+            findings (Dict[str, Any]): The latest findings
+            asked (Set[str]): Normalized queries already searched; updated with the chosen ones
+            limit (int): Maximum number of follow-up queries
+            
+        Returns:
+            List[str]: The follow-up queries
+        """
+        questions = findings.get("open_questions") if isinstance(findings, dict) else None
+        follow_ups = []
+        for question in questions or []:
+            if len(follow_ups) >= limit:
+                break
+            if not isinstance(question, str) or not question.strip():
+                continue
+            key = " ".join(question.lower().split())
+            if key in asked:
+                continue
+            asked.add(key)
+            follow_ups.append(question.strip())
+        return follow_ups
+    
+    def research_iterative(self, query: str, max_rounds: int = 3, max_calls: Optional[int] = None,
+                           time_budget: Optional[float] = None, min_novelty: float = 0.25,
+                           max_follow_ups: int = 3, fan_out: Optional[int] = None,
+                           info: Optional[Dict[str, Any]] = None, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Conduct research in rounds, searching the open questions of each round's findings
+        
+        The first round is a regular research pass. Each later round searches the open questions
+        of the latest findings and restructures everything found so far. Research stops when the
+        findings have no open questions, when a round's results are mostly URLs or text already
+        seen, when every follow-up search of a round fails, or when the round, call, time or
+        latency budget runs out. Only a failed first round raises.
+        
+        Args:
+            query (str): The research query
+            max_rounds (int): Maximum number of search rounds
+            max_calls (Optional[int]): Maximum number of searches and completions
+            time_budget (Optional[float]): Seconds after which no new round is started
+            min_novelty (float): Minimum fraction of new results for a round's findings to be used
+            max_follow_ups (int): Maximum number of follow-up searches per round
+            fan_out (Optional[int]): Number of concurrent sub-query searches in the first round
+            info (Optional[Dict[str, Any]]): Receives call details; the rounds are reported under 'iterations'
+            deadline (Optional[float]): time.monotonic() value at which the query's latency budget runs out;
+                no new round is started after it
+            
+        Returns:
+            Dict[str, Any]: Structured research findings
+            
+        Raises:
+            FindingsParseError: In structured mode, if no valid findings could be parsed
+        """
+        fan_out = fan_out or self.fan_out
+        budget = IterationBudget(max_rounds, max_calls, time_budget)
+        tracker = NoveltyTracker()
+        asked = {" ".join(query.lower().split())}
+        
+        with span("research_round", round=1):
+            if fan_out > 1:
+                search_results = self.fan_out_search(query, fan_out)
+            else:
+                search_results = self.search(query)
+            results, _ = tracker.absorb(search_results)
+            results = self.fetch_pages(self.register_sources(results))
+            findings, completions = self._structure(query, results or search_results, info, deadline)
+        budget.rounds = 1
+        budget.charge(max(fan_out, 1) + completions)
+        history = [{"round": 1, "queries": [query], "results": len(results), "novelty": 1.0}]
+        
+        while True:
+            follow_ups = self._follow_up_queries(findings, asked, max_follow_ups)
+            if not follow_ups:
+                stop_reason = "no_open_questions"
+                break
+            stop_reason = budget.stop_reason(len(follow_ups) + 1)
+            if stop_reason is None and budget_exhausted(deadline):
+                stop_reason = "latency_budget"
+            if stop_reason:
+                break
+            
+            budget.rounds += 1
+            with span("research_round", round=budget.rounds) as record:
+                try:
+                    round_results = self.search_many(follow_ups)
+                except Exception as e:
+                    # Keep the findings of the rounds that succeeded instead of failing the query
+                    budget.charge(len(follow_ups))
+                    record["attributes"]["error"] = str(e)
+                    history.append({"round": budget.rounds, "queries": follow_ups, "error": str(e)})
+                    stop_reason = "search_error"
+                    break
+                new_results, novelty = tracker.absorb(round_results)
+                budget.charge(len(follow_ups))
+                record["attributes"]["novelty"] = round(novelty, 3)
+                history.append({"round": budget.rounds, "queries": follow_ups,
+                                "results": len(new_results), "novelty": round(novelty, 3)})
+                if novelty < min_novelty:
+                    stop_reason = "low_novelty"
+                    break
+                results = results + self.fetch_pages(self.register_sources(new_results))
+                findings, completions = self._structure(query, results, info, deadline)
+                budget.charge(completions)
+        
+        if info is not None:
+            info["iterations"] = {"rounds": budget.rounds, "stop_reason": stop_reason, "calls": budget.calls,
+                                  "seconds": round(budget.elapsed(), 3), "history": history}
+        return self.resolve_sources(findings)
+    
+    async def aresearch_iterative(self, query: str, max_rounds: int = 3, max_calls: Optional[int] = None,
+                                  time_budget: Optional[float] = None, min_novelty: float = 0.25,
+                                  max_follow_ups: int = 3, fan_out: Optional[int] = None,
+                                  info: Optional[Dict[str, Any]] = None,
+                                  deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Conduct research in rounds using the async search and inference clients
+        
+        See research_iterative for the stopping rules.
+        
+        Args:
+            query (str): The research query
+            max_rounds (int): Maximum number of search rounds
+            max_calls (Optional[int]): Maximum number of searches and completions
+            time_budget (Optional[float]): Seconds after which no new round is started
+            min_novelty (float): Minimum fraction of new results for a round's findings to be used
+            max_follow_ups (int): Maximum number of follow-up searches per round
+            fan_out (Optional[int]): Number of concurrent sub-query searches in the first round
+            info (Optional[Dict[str, Any]]): Receives call details; the rounds are reported under 'iterations'
+            deadline (Optional[float]): time.monotonic() value at which the query's latency budget runs out;
+                no new round is started after it
+            
+        Returns:
+            Dict[str, Any]: Structured research findings
+            
+        Raises:
+            FindingsParseError: In structured mode, if no valid findings could be parsed
+        """
+        fan_out = fan_out or self.fan_out
+        budget = IterationBudget(max_rounds, max_calls, time_budget)
+        tracker = NoveltyTracker()
+        asked = {" ".join(query.lower().split())}
+        
+        with span("research_round", round=1):
+            if fan_out > 1:
+                search_results = await self.afan_out_search(query, fan_out)
             else:
-                return structured_research_content
-        except (json.JSONDecodeError, AttributeError):
-            # Return the raw content if JSON extraction fails
-            return {"research_text": structured_research_content}
\ No newline at end of file
+                search_results = await self.asearch(query)
+            results, _ = tracker.absorb(search_results)
+            results = await self.afetch_pages(self.register_sources(results))
+            findings, completions = await self._astructure(query, results or search_results, info, deadline)
+        budget.rounds = 1
+        budget.charge(max(fan_out, 1) + completions)
+        history = [{"round": 1, "queries": [query], "results": len(results), "novelty": 1.0}]
+        
+        while True:
+            follow_ups = self._follow_up_queries(findings, asked, max_follow_ups)
+            if not follow_ups:
+                stop_reason = "no_open_questions"
+                break
+            stop_reason = budget.stop_reason(len(follow_ups) + 1)
+            if stop_reason is None and budget_exhausted(deadline):
+                stop_reason = "latency_budget"
+            if stop_reason:
+                break
+            
+            budget.rounds += 1
+            with span("research_round", round=budget.rounds) as record:
+                try:
+                    round_results = await self.asearch_many(follow_ups)
+                except Exception as e:
+                    # Keep the findings of the rounds that succeeded instead of failing the query
+                    budget.charge(len(follow_ups))
+                    record["attributes"]["error"] = str(e)
+                    history.append({"round": budget.rounds, "queries": follow_ups, "error": str(e)})
+                    stop_reason = "search_error"
+                    break
+                new_results, novelty = tracker.absorb(round_results)
+                budget.charge(len(follow_ups))
+                record["attributes"]["novelty"] = round(novelty, 3)
+                history.append({"round": budget.rounds, "queries": follow_ups,
+                                "results": len(new_results), "novelty": round(novelty, 3)})
+                if novelty < min_novelty:
+                    stop_reason = "low_novelty"
+                    break
+                results = results + await self.afetch_pages(self.register_sources(new_results))
+                findings, completions = await self._astructure(query, results, info, deadline)
+                budget.charge(completions)
+        
+        if info is not None:
+            info["iterations"] = {"rounds": budget.rounds, "stop_reason": stop_reason, "calls": budget.calls,
+                                  "seconds": round(budget.elapsed(), 3), "history": history}
+        return self.resolve_sources(findings)
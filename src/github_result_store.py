@@ -0,0 +1,228 @@
+"""
+Result Store Module
+
+This module provides sinks for finished research results. The JSONL store appends each result as
+one compact JSON line from a background writer thread and fsyncs in batches, so saving never
+blocks the next query and memory stays constant however many results a batch produces.
+"""
+
+from typing import Dict, Any, Iterator, Optional, Tuple
+import json
+import os
+import queue
+import threading
+import time
+
+from github_archive_index import ArchiveIndex
+
+# Queue marker that stops the writer thread
+_CLOSE = object()
+
+
+class ResultSink:
+    """
+    Base class for destinations of finished research results.
+    """
+
+    def write(self, results: Dict[str, Any]) -> None:
+        """
+        Store one finished result
+
+        Args:
+            results (Dict[str, Any]): The final workflow state
+        """
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """
+        Block until every result written so far is durably stored
+        """
+
+    def close(self) -> None:
+        """
+        Flush and release any resources held by the sink
+        """
+
+    def __enter__(self) -> "ResultSink":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class JsonlResultStore(ResultSink):
+    """
+    Append-only JSONL store written by a background thread with batched fsync.
+
+    Each stored result is addressed by its location, '<path>#<byte offset>', which is
+    also what the optional archive index records for it.
+    """
+
+    def __init__(self, path: str, archive_index: Optional[ArchiveIndex] = None, fsync_every: int = 32,
+                 fsync_interval: float = 1.0, queue_size: int = 1024):
+        """
+        Open (or create) the store and start its writer thread.
+
+        Args:
+            path (str): Path of the JSONL file; results are appended to existing content
+            archive_index (Optional[ArchiveIndex]): Index each written result is added to
+            fsync_every (int): Fsync after this many results have been written
+            fsync_interval (float): Fsync pending results after at most this many seconds
+            queue_size (int): Results that may wait for the writer before write() blocks
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self.archive_index = archive_index
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.written = 0
+        self._file = open(path, "ab")
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name="jsonl-result-writer", daemon=True)
+        self._writer.start()
+
+    def _raise_writer_error(self) -> None:
+        if self._error is not None:
+            raise RuntimeError(f"Result store writer failed: {self._error}") from self._error
+
+    def _check(self) -> None:
+        self._raise_writer_error()
+        if self._closed:
+            raise RuntimeError("Result store is closed")
+
+    def _put(self, item: Any) -> None:
+        # Give up rather than block forever if the writer thread has died
+        while self._writer.is_alive():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        self._raise_writer_error()
+        raise RuntimeError("Result store writer is not running")
+
+    def write(self, results: Dict[str, Any]) -> None:
+        """
+        Queue a result to be appended; returns without waiting for disk I/O
+
+        Args:
+            results (Dict[str, Any]): The final workflow state; must not be modified afterwards
+
+        Raises:
+            RuntimeError: If the store is closed or its writer thread has failed; the result is not saved
+        """
+        self._check()
+        self._put(results)
+
+    def flush(self) -> None:
+        """
+        Block until every queued result has been written and fsynced
+        """
+        self._check()
+        done = threading.Event()
+        self._put(done)
+        while not done.wait(timeout=0.1) and self._writer.is_alive():
+            continue
+        self._raise_writer_error()
+
+    def close(self) -> None:
+        """
+        Write the remaining results, fsync and stop the writer thread
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._put(_CLOSE)
+        self._writer.join()
+        self._raise_writer_error()
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _run(self) -> None:
+        pending = 0
+        last_sync = time.monotonic()
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self.fsync_interval)
+                except queue.Empty:
+                    item = None
+
+                if item is _CLOSE:
+                    break
+                if isinstance(item, threading.Event):
+                    if pending:
+                        self._sync()
+                        pending = 0
+                        last_sync = time.monotonic()
+                    item.set()
+                    continue
+                if item is not None:
+                    offset = self._file.tell()
+                    line = json.dumps(item, ensure_ascii=False, separators=(",", ":"))
+                    self._file.write(line.encode("utf-8") + b"\n")
+                    self.written += 1
+                    pending += 1
+                    if self.archive_index is not None:
+                        self.archive_index.add(item, f"{self.path}#{offset}")
+
+                if pending and (pending >= self.fsync_every or time.monotonic() - last_sync >= self.fsync_interval):
+                    self._sync()
+                    pending = 0
+                    last_sync = time.monotonic()
+
+            if pending:
+                self._sync()
+        except Exception as e:
+            self._error = e
+            # Release anyone waiting on a flush so they see the error
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, threading.Event):
+                    item.set()
+        finally:
+            self._file.close()
+
+
+def iter_results(path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Stream the results stored in a JSONL file, one at a time
+
+    Args:
+        path (str): Path of the JSONL file
+
+    Yields:
+        Tuple[str, Dict[str, Any]]: Each result's location and the result
+    """
+    with open(path, "rb") as f:
+        offset = 0
+        for line in f:
+            if line.strip():
+                yield f"{path}#{offset}", json.loads(line)
+            offset += len(line)
+
+
+def read_result(location: str) -> Dict[str, Any]:
+    """
+    Read a single result by its location, '<path>#<byte offset>'
+
+    Args:
+        location (str): The location reported by the store or the archive index
+
+    Returns:
+        Dict[str, Any]: The stored result
+    """
+    path, _, offset = location.rpartition("#")
+    with open(path, "rb") as f:
+        f.seek(int(offset))
+        return json.loads(f.readline())
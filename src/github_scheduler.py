@@ -0,0 +1,412 @@
+"""
+Call Scheduler Module
+
+This module provides the scheduler that both agents route their model and search calls through.
+Each provider gets token-bucket limits (requests per minute and tokens per minute), an adaptive
+concurrency limit that backs off when the provider throttles and grows again while calls succeed,
+and retries with jittered exponential backoff that honor Retry-After.
+"""
+
+from typing import Dict, Any, Awaitable, Callable, Optional, Tuple
+from email.utils import parsedate_to_datetime
+import asyncio
+import os
+import random
+import threading
+import time
+
+# HTTP statuses worth retrying: timeouts, throttling and transient server errors
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+# Exception class names (azure-core, requests, aiohttp) that indicate a transient network failure
+RETRYABLE_ERROR_NAMES = {
+    "ServiceRequestError", "ServiceResponseError", "ServiceRequestTimeoutError",
+    "ServiceResponseTimeoutError", "ConnectionError", "Timeout", "ClientConnectionError",
+    "ServerDisconnectedError",
+}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at a fixed rate.
+
+    Reservations may drive the bucket negative; the caller then waits for the
+    returned delay, so concurrent callers are served in order.
+    """
+
+    def __init__(self, per_minute: float):
+        """
+        Args:
+            per_minute (float): Refill rate and capacity, in units per minute
+        """
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self._level = per_minute
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """
+        Take units from the bucket
+
+        Args:
+            amount (float): Number of units to take
+
+        Returns:
+            float: Seconds the caller must wait before using the units
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+            self._updated = now
+            self._level -= amount
+            if self._level >= 0:
+                return 0.0
+            return -self._level / self.rate
+
+    def adjust(self, amount: float) -> None:
+        """
+        Correct an earlier reservation once the real cost is known
+
+        Args:
+            amount (float): Extra units consumed (negative to give units back)
+        """
+        with self._lock:
+            self._level = min(self.capacity, self._level - amount)
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that halves when the provider throttles and grows by one
+    after a run of successful calls (additive increase, multiplicative decrease).
+    """
+
+    def __init__(self, initial: int = 8, minimum: int = 1, maximum: int = 64, increase_after: int = 5):
+        """
+        Args:
+            initial (int): Starting concurrency limit
+            minimum (int): Lowest allowed limit
+            maximum (int): Highest allowed limit
+            increase_after (int): Consecutive successes needed to raise the limit by one
+        """
+        self.limit = max(minimum, min(initial, maximum))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase_after = increase_after
+        self.in_flight = 0
+        self._successes = 0
+        self._condition = threading.Condition()
+
+    def try_acquire(self) -> bool:
+        """
+        Take a slot if one is free
+
+        Returns:
+            bool: True if a slot was taken
+        """
+        with self._condition:
+            if self.in_flight < self.limit:
+                self.in_flight += 1
+                return True
+            return False
+
+    def acquire(self) -> None:
+        """
+        Block until a slot is free and take it
+        """
+        with self._condition:
+            while self.in_flight >= self.limit:
+                self._condition.wait(timeout=0.1)
+            self.in_flight += 1
+
+    async def aacquire(self) -> None:
+        """
+        Wait on the event loop until a slot is free and take it
+        """
+        while not self.try_acquire():
+            await asyncio.sleep(0.02)
+
+    def release(self) -> None:
+        """
+        Return a slot
+        """
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    def on_success(self) -> None:
+        with self._condition:
+            self._successes += 1
+            if self._successes >= self.increase_after and self.limit < self.maximum:
+                self.limit += 1
+                self._successes = 0
+                self._condition.notify()
+
+    def on_throttle(self) -> None:
+        with self._condition:
+            self.limit = max(self.minimum, self.limit // 2)
+            self._successes = 0
+
+
+class ProviderState:
+    """
+    Limits and counters for one provider.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None,
+                 initial_concurrency: int = 8, max_concurrency: int = 64):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.limiter = AdaptiveLimiter(initial=initial_concurrency, maximum=max_concurrency)
+        self.calls = 0
+        self.retries = 0
+        self.throttled = 0
+        self.failures = 0
+
+    def reserve(self, tokens: float) -> float:
+        """
+        Reserve one request and the given number of tokens
+
+        Returns:
+            float: Seconds to wait before sending the request
+        """
+        delay = 0.0
+        if self.requests is not None:
+            delay = max(delay, self.requests.reserve(1))
+        if self.tokens is not None and tokens:
+            delay = max(delay, self.tokens.reserve(tokens))
+        return delay
+
+
+def _env_float(name: str) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+def retry_info(error: BaseException) -> Tuple[bool, bool, Optional[float]]:
+    """
+    Classify a failed call
+
+    Args:
+        error (BaseException): The exception raised by the call
+
+    Returns:
+        Tuple[bool, bool, Optional[float]]: Whether to retry, whether the provider
+        throttled the call, and the Retry-After delay in seconds if one was sent
+    """
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(error, "code", None) \
+        or getattr(response, "status_code", None) or getattr(response, "status", None)
+    headers = getattr(response, "headers", None) or getattr(error, "headers", None) or {}
+
+    retry_after = None
+    try:
+        if headers.get("retry-after-ms"):
+            retry_after = float(headers.get("retry-after-ms")) / 1000.0
+        elif headers.get("Retry-After"):
+            value = headers.get("Retry-After")
+            try:
+                retry_after = float(value)
+            except ValueError:
+                retry_after = max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, AttributeError):
+        retry_after = None
+
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUSES, status == 429, retry_after
+
+    retryable = type(error).__name__ in RETRYABLE_ERROR_NAMES or isinstance(error, (ConnectionError, TimeoutError))
+    return retryable, False, retry_after
+
+
+class CallScheduler:
+    """
+    Shared scheduler for provider calls with rate limits, adaptive concurrency and retries.
+    """
+
+    def __init__(self, providers: Optional[Dict[str, ProviderState]] = None, max_retries: int = 5,
+                 base_delay: float = 1.0, max_delay: float = 60.0):
+        """
+        Args:
+            providers (Optional[Dict[str, ProviderState]]): Per-provider limits; providers not listed
+                get an unlimited ProviderState on first use
+            max_retries (int): Retries after the first attempt before the error is raised
+            base_delay (float): Backoff ceiling for the first retry, in seconds
+            max_delay (float): Upper bound for any single backoff, in seconds
+        """
+        self.providers = providers or {}
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "CallScheduler":
+        """
+        Build a scheduler from environment settings
+
+        GITHUB_RPM / GITHUB_TPM and TAVILY_RPM set the per-minute limits (unset means
+        unlimited); SCHEDULER_MAX_CONCURRENCY caps the adaptive concurrency and
+        SCHEDULER_MAX_RETRIES the number of retries.
+
+        Returns:
+            CallScheduler: The configured scheduler
+        """
+        max_concurrency = int(os.getenv("SCHEDULER_MAX_CONCURRENCY", "64"))
+        initial = min(8, max_concurrency)
+        return cls(
+            providers={
+                "github": ProviderState(_env_float("GITHUB_RPM"), _env_float("GITHUB_TPM"),
+                                        initial_concurrency=initial, max_concurrency=max_concurrency),
+                "tavily": ProviderState(_env_float("TAVILY_RPM"),
+                                        initial_concurrency=initial, max_concurrency=max_concurrency),
+            },
+            max_retries=int(os.getenv("SCHEDULER_MAX_RETRIES", "5")),
+        )
+
+    def provider(self, name: str) -> ProviderState:
+        """
+        Return the state of a provider, creating an unlimited one on first use
+        """
+        with self._lock:
+            if name not in self.providers:
+                self.providers[name] = ProviderState()
+            return self.providers[name]
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        # Full jitter, but never earlier than the provider asked for
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def _on_failure(self, state: ProviderState, error: BaseException, attempt: int) -> float:
+        """
+        Record a failed attempt and decide how long to wait before retrying
+
+        Raises:
+            BaseException: The original error, if it should not be retried
+        """
+        retryable, throttled, retry_after = retry_info(error)
+        if throttled:
+            state.throttled += 1
+            state.limiter.on_throttle()
+        if not retryable or attempt >= self.max_retries:
+            state.failures += 1
+            raise error
+        state.retries += 1
+        return self._backoff(attempt, retry_after)
+
+    def call(self, provider: str, fn: Callable[[], Any], tokens: float = 0) -> Any:
+        """
+        Run a blocking call under the provider's limits, retrying transient failures
+
+        Args:
+            provider (str): Provider name, e.g. 'github' or 'tavily'
+            fn (Callable[[], Any]): The call to make
+            tokens (float): Estimated tokens the call consumes, for tokens-per-minute limits
+
+        Returns:
+            Any: The result of the call
+        """
+        state = self.provider(provider)
+        attempt = 0
+        while True:
+            delay = state.reserve(tokens)
+            if delay:
+                time.sleep(delay)
+            state.limiter.acquire()
+            try:
+                state.calls += 1
+                result = fn()
+            except Exception as e:
+                error = e
+            else:
+                state.limiter.on_success()
+                return result
+            finally:
+                state.limiter.release()
+            time.sleep(self._on_failure(state, error, attempt))
+            attempt += 1
+
+    async def acall(self, provider: str, fn: Callable[[], Awaitable[Any]], tokens: float = 0) -> Any:
+        """
+        Run an async call under the provider's limits, retrying transient failures
+
+        Args:
+            provider (str): Provider name, e.g. 'github' or 'tavily'
+            fn (Callable[[], Awaitable[Any]]): Creates the awaitable for each attempt
+            tokens (float): Estimated tokens the call consumes, for tokens-per-minute limits
+
+        Returns:
+            Any: The result of the call
+        """
+        state = self.provider(provider)
+        attempt = 0
+        while True:
+            delay = state.reserve(tokens)
+            if delay:
+                await asyncio.sleep(delay)
+            await state.limiter.aacquire()
+            try:
+                state.calls += 1
+                result = await fn()
+            except Exception as e:
+                error = e
+            else:
+                state.limiter.on_success()
+                return result
+            finally:
+                state.limiter.release()
+            await asyncio.sleep(self._on_failure(state, error, attempt))
+            attempt += 1
+
+    def record_tokens(self, provider: str, extra_tokens: float) -> None:
+        """
+        Charge tokens that were not known when the call was scheduled (e.g. completion tokens)
+
+        Args:
+            provider (str): Provider name
+            extra_tokens (float): Tokens beyond the estimate (negative to refund)
+        """
+        state = self.provider(provider)
+        if state.tokens is not None and extra_tokens:
+            state.tokens.adjust(extra_tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return call, retry and throttling counters and the current concurrency limit per provider
+
+        Returns:
+            Dict[str, Any]: The statistics keyed by provider
+        """
+        with self._lock:
+            providers = dict(self.providers)
+        return {
+            name: {
+                "calls": state.calls,
+                "retries": state.retries,
+                "throttled": state.throttled,
+                "failures": state.failures,
+                "concurrency_limit": state.limiter.limit,
+            }
+            for name, state in providers.items()
+        }
+
+
+_default_scheduler: Optional[CallScheduler] = None
+_default_lock = threading.Lock()
+
+
+def default_scheduler() -> CallScheduler:
+    """
+    Return the process-wide scheduler, created from the environment on first use
+
+    Returns:
+        CallScheduler: The shared scheduler
+    """
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = CallScheduler.from_env()
+        return _default_scheduler
@@ -0,0 +1,167 @@
+"""
+Search Cache Module
+
+This module provides a persistent, TTL-based cache for Tavily search results so that
+repeated queries skip the network for the search step.
+"""
+
+from typing import Dict, Any, Optional
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class SearchCache:
+    """
+    Disk-backed cache of search results stored in SQLite.
+
+    Entries are keyed on the normalized query text and max_results, expire after a
+    configurable TTL and are evicted least-recently-used first once the cache grows
+    beyond max_entries.
+    """
+
+    def __init__(self, path: str, ttl: float = 24 * 60 * 60, max_entries: int = 5000, refresh: bool = False):
+        """
+        Open (or create) the search cache.
+
+        Args:
+            path (str): Path of the SQLite database file
+            ttl (float): Seconds an entry stays valid
+            max_entries (int): Maximum number of entries kept before LRU eviction
+            refresh (bool): Ignore cached entries on read but still store fresh results
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+
+        # Fan-out searches and batches hit the cache from several threads
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS search_cache (
+                key TEXT PRIMARY KEY,
+                results TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_search_cache_last_access ON search_cache (last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(query: str, max_results: int) -> str:
+        """
+        Build the cache key for a search
+
+        Args:
+            query (str): The search query
+            max_results (int): Maximum number of results requested
+
+        Returns:
+            str: The cache key
+        """
+        normalized = " ".join(query.lower().split())
+        return f"{max_results}:{normalized}"
+
+    def get(self, query: str, max_results: int) -> Optional[Any]:
+        """
+        Look up cached results for a search
+
+        Args:
+            query (str): The search query
+            max_results (int): Maximum number of results requested
+
+        Returns:
+            Optional[Any]: The cached results, or None on a miss
+        """
+        if self.refresh:
+            self.misses += 1
+            return None
+
+        key = self.make_key(query, max_results)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT results, created_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            results, created_at = row
+            if now - created_at > self.ttl:
+                self._conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE search_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(results)
+
+    def set(self, query: str, max_results: int, results: Any) -> None:
+        """
+        Store the results of a search, evicting the least recently used entries if needed
+
+        Args:
+            query (str): The search query
+            max_results (int): Maximum number of results requested
+            results (Any): The search results
+        """
+        key = self.make_key(query, max_results)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, results, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(results, ensure_ascii=False), now, now)
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM search_cache WHERE key IN "
+                    "(SELECT key FROM search_cache ORDER BY last_access ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """
+        Remove every entry from the cache
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM search_cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters and the current size of the cache
+
+        Returns:
+            Dict[str, Any]: The cache statistics
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries
+        }
+
+    def close(self) -> None:
+        """
+        Close the underlying database connection
+        """
+        with self._lock:
+            self._conn.close()
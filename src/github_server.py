@@ -0,0 +1,303 @@
+"""
+Research Server Module
+
+This module serves a warm GithubResearchWorkflow over a local HTTP API. Queries run as jobs on a
+worker pool, long queries can be polled through a job endpoint, and identical queries that arrive
+while one is in flight are coalesced onto the same job instead of each running the workflow.
+
+    POST /query      {"query": "...", "wait": false}  -> job (202) or final result (200)
+    GET  /jobs/<id>                                   -> job status and, once finished, the result
+    GET  /health                                      -> liveness, job counts and scheduler stats
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import secrets
+import threading
+import time
+
+from github_orchestrator import GithubResearchWorkflow
+from github_result_store import ResultSink
+from github_tracing import TraceExporter
+
+# Upper bound on how long a single request may wait for its job to finish
+MAX_WAIT_SECONDS = 600
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query for coalescing: lowercase with whitespace collapsed
+
+    Args:
+        query (str): The query
+
+    Returns:
+        str: The normalized query
+    """
+    return " ".join(query.lower().split())
+
+
+class Job:
+    """
+    One execution of the workflow, shared by every request coalesced onto it.
+    """
+
+    def __init__(self, query: str):
+        self.id = secrets.token_hex(8)
+        self.query = query
+        self.status = "queued"
+        self.requests = 1
+        self.created = time.time()
+        self.finished: Optional[float] = None
+        self.future: Optional[Future] = None
+        self.output_errors: List[str] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Describe the job, with its result once it has finished
+
+        Returns:
+            Dict[str, Any]: The job description
+        """
+        data = {
+            "job_id": self.id,
+            "query": self.query,
+            "status": self.status,
+            "requests": self.requests,
+            "created": self.created,
+            "finished": self.finished,
+        }
+        if self.output_errors:
+            data["output_errors"] = list(self.output_errors)
+        if self.future is not None and self.future.done():
+            error = self.future.exception()
+            if error is not None:
+                data["status"] = "error"
+                data["error"] = str(error)
+            else:
+                data["result"] = self.future.result()
+        return data
+
+
+class ResearchService:
+    """
+    Job manager that runs queries on a warm workflow and coalesces identical in-flight queries.
+    """
+
+    def __init__(self, workflow: GithubResearchWorkflow, max_workers: int = 8, job_ttl: float = 3600.0,
+                 sink: Optional[ResultSink] = None, exporters: Optional[List[TraceExporter]] = None):
+        """
+        Args:
+            workflow (GithubResearchWorkflow): The workflow every job runs on
+            max_workers (int): Number of queries processed at the same time
+            job_ttl (float): Seconds a finished job stays available on the job endpoint
+            sink (Optional[ResultSink]): Destination for every finished result
+            exporters (Optional[List[TraceExporter]]): Exporters called with every finished result
+        """
+        self.workflow = workflow
+        self.job_ttl = job_ttl
+        self.sink = sink
+        self.exporters = exporters or []
+        self.coalesced = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="research-job")
+        self._jobs: Dict[str, Job] = {}
+        self._in_flight: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, query: str) -> Tuple[Job, bool]:
+        """
+        Start a job for a query, or join the in-flight job for the same query
+
+        Args:
+            query (str): The research query
+
+        Returns:
+            Tuple[Job, bool]: The job and whether the request was coalesced onto an existing one
+        """
+        key = normalize_query(query)
+        with self._lock:
+            self._prune()
+            job = self._in_flight.get(key)
+            if job is not None:
+                job.requests += 1
+                self.coalesced += 1
+                return job, True
+
+            job = Job(query)
+            self._jobs[job.id] = job
+            self._in_flight[key] = job
+            job.future = self._executor.submit(self._run, job, key)
+            return job, False
+
+    def _run(self, job: Job, key: str) -> Dict[str, Any]:
+        job.status = "running"
+        state = None
+        try:
+            try:
+                state = self.workflow.process_query(job.query)
+            finally:
+                # Later identical queries start a fresh job instead of joining a finished one
+                with self._lock:
+                    self._in_flight.pop(key, None)
+            self._output(job, state)
+            return state
+        finally:
+            # Always finish the job, so clients see it complete and _prune can expire it
+            job.status = state["status"] if state is not None else "error"
+            job.finished = time.time()
+
+    def _output(self, job: Job, state: Dict[str, Any]) -> None:
+        """
+        Pass a result to every exporter and the sink, recording failures on the job
+
+        The result itself is kept when an exporter or the sink fails; the failures are reported
+        under 'output_errors'.
+        """
+        outputs = [(type(exporter).__name__, exporter.export) for exporter in self.exporters]
+        if self.sink is not None:
+            outputs.append((type(self.sink).__name__, self.sink.write))
+        for name, output in outputs:
+            try:
+                output(state)
+            except Exception as e:
+                job.output_errors.append(f"{name}: {e}")
+
+    def _prune(self) -> None:
+        """
+        Forget finished jobs older than job_ttl; the caller holds the lock
+        """
+        cutoff = time.time() - self.job_ttl
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished is not None and job.finished < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Look up a job
+
+        Args:
+            job_id (str): The job ID
+
+        Returns:
+            Optional[Job]: The job, or None if it is unknown or expired
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def health(self) -> Dict[str, Any]:
+        """
+        Return liveness information, job counts and scheduler statistics
+
+        Returns:
+            Dict[str, Any]: The health report
+        """
+        with self._lock:
+            jobs = len(self._jobs)
+            in_flight = len(self._in_flight)
+        return {
+            "status": "ok",
+            "jobs": jobs,
+            "in_flight": in_flight,
+            "coalesced": self.coalesced,
+            "scheduler": self.workflow.scheduler.stats(),
+        }
+
+    def close(self) -> None:
+        """
+        Wait for running jobs, then close the sink and the workflow's clients
+        """
+        self._executor.shutdown(wait=True)
+        if self.sink is not None:
+            self.sink.close()
+        for exporter in self.exporters:
+            exporter.close()
+        self.workflow.close()
+
+
+def make_handler(service: ResearchService):
+    """
+    Build the request handler class bound to a service
+
+    Args:
+        service (ResearchService): The service handling the requests
+
+    Returns:
+        type: A BaseHTTPRequestHandler subclass
+    """
+
+    class ResearchRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send_json(200, service.health())
+            elif self.path.startswith("/jobs/"):
+                job = service.get(self.path[len("/jobs/"):])
+                if job is None:
+                    self._send_json(404, {"error": "Unknown or expired job"})
+                else:
+                    self._send_json(200, job.to_dict())
+            else:
+                self._send_json(404, {"error": "Not found"})
+
+        def do_POST(self):
+            if self.path != "/query":
+                self._send_json(404, {"error": "Not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                query = body["query"]
+                if not isinstance(query, str) or not query.strip():
+                    raise ValueError("query must be a non-empty string")
+                wait = float(body.get("timeout", MAX_WAIT_SECONDS)) if body.get("wait") else 0.0
+            except (ValueError, KeyError, TypeError) as e:
+                self._send_json(400, {"error": f"Invalid request: {e}"})
+                return
+
+            job, coalesced = service.submit(query)
+            if wait:
+                try:
+                    job.future.result(timeout=min(wait, MAX_WAIT_SECONDS))
+                except Exception:
+                    # Still running (or failed); the job description reports which
+                    pass
+            data = job.to_dict()
+            data["coalesced"] = coalesced
+            self._send_json(200 if "result" in data else 202, data)
+
+    return ResearchRequestHandler
+
+
+def serve(service: ResearchService, host: str = "127.0.0.1", port: int = 8000) -> None:
+    """
+    Serve the research API until interrupted
+
+    Args:
+        service (ResearchService): The service handling the requests
+        host (str): Interface to bind
+        port (int): Port to listen on
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    server.daemon_threads = True
+    print(f"Serving research API on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
@@ -0,0 +1,303 @@
+"""
+Source Registry Module
+
+This module keeps one registry of the sources seen by a workflow. URLs are canonicalized (scheme,
+"www.", default ports, fragments and tracking parameters are ignored) and passage text is
+fingerprinted with MinHash signatures, computed for a whole batch of search results at once with
+NumPy and indexed with locality-sensitive hashing, so repeated URLs and near-identical passages are
+dropped before they reach a prompt. Every distinct source gets a stable citation ID ("S1", "S2", ...)
+that the research and drafting prompts both use.
+"""
+
+from typing import Dict, Any, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import re
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from github_compaction import DUPLICATE_THRESHOLD, shingles
+
+# Query parameters that identify a campaign or referrer rather than a page
+TRACKING_PARAMETERS = {"fbclid", "gclid", "msclkid", "mc_cid", "mc_eid", "ref", "ref_src", "igshid", "spm"}
+
+# Mersenne prime used by the MinHash permutations; hashes are reduced below it so products fit in 64 bits
+_PRIME = np.uint64((1 << 31) - 1)
+
+_SOURCE_ID = re.compile(r"^\[?(S\d+)\]?(?:\W|$)")
+
+
+def _without_tracking(query: str) -> List[Tuple[str, str]]:
+    return [
+        (key, value) for key, value in parse_qsl(query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMETERS
+    ]
+
+
+def clean_url(url: str) -> str:
+    """
+    Remove tracking parameters and the fragment from a URL, keeping it otherwise intact
+
+    Args:
+        url (str): The URL
+
+    Returns:
+        str: The URL to show and cite
+    """
+    parts = urlsplit(url.strip())
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(_without_tracking(parts.query)), ""))
+
+
+def canonical_url(url: str) -> str:
+    """
+    Canonicalize a URL for deduplication
+
+    Args:
+        url (str): The URL
+
+    Returns:
+        str: The URL without scheme, "www.", default port, fragment, tracking parameters or trailing
+        slash, with the host lowercased and the remaining query parameters sorted
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = sorted(_without_tracking(parts.query))
+    path = parts.path.rstrip("/")
+    return f"{host}{path}" + (f"?{urlencode(query)}" if query else "")
+
+
+class MinHasher:
+    """
+    Batched MinHash signatures over word shingles.
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        """
+        Args:
+            num_perm (int): Number of hash permutations (signature length)
+            shingle_size (int): Words per shingle
+            seed (int): Seed of the permutation coefficients
+        """
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+
+    def signatures(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the signatures of a batch of texts in one vectorized pass
+
+        Args:
+            texts (List[str]): The texts
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: A (len(texts), num_perm) signature matrix and a boolean mask
+            of the texts that had any words (the others have no meaningful signature)
+        """
+        hashes: List[int] = []
+        counts = np.zeros(len(texts), dtype=np.int64)
+        for i, text in enumerate(texts):
+            values = {zlib.crc32(" ".join(shingle).encode("utf-8")) for shingle in shingles(text, self.shingle_size)}
+            hashes.extend(values)
+            counts[i] = len(values)
+
+        result = np.full((len(texts), self.num_perm), np.iinfo(np.uint64).max, dtype=np.uint64)
+        present = counts > 0
+        if not hashes:
+            return result, present
+        x = np.array(hashes, dtype=np.uint64) % _PRIME
+        permuted = (x[:, None] * self.a[None, :] + self.b[None, :]) % _PRIME
+        starts = np.concatenate(([0], np.cumsum(counts[present])[:-1]))
+        result[present] = np.minimum.reduceat(permuted, starts, axis=0)
+        return result, present
+
+
+class SourceRegistry:
+    """
+    Registry of distinct sources with stable citation IDs, shared by every query of a workflow.
+    """
+
+    def __init__(self, threshold: float = DUPLICATE_THRESHOLD, num_perm: int = 64, bands: int = 8):
+        """
+        Args:
+            threshold (float): Estimated Jaccard similarity at which two passages are duplicates
+            num_perm (int): MinHash signature length
+            bands (int): LSH bands; num_perm must be divisible by it. More bands find more candidates
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm)
+        self.entries: List[Dict[str, Any]] = []
+        self.url_duplicates = 0
+        self.near_duplicates = 0
+        self.dedup_seconds = 0.0
+        self._by_id: Dict[str, int] = {}
+        self._by_url: Dict[str, int] = {}
+        self._signatures: List[Optional[np.ndarray]] = []
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        self._lock = threading.Lock()
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def _near_duplicate(self, signature: np.ndarray, within: Set[int]) -> Optional[int]:
+        """
+        Find a source among `within` whose passage is a near-duplicate; the caller holds the lock
+        """
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(index for index in self._buckets[band].get(key, ()) if index in within)
+        best, best_similarity = None, self.threshold
+        for index in candidates:
+            similarity = float(np.mean(self._signatures[index] == signature))
+            if similarity >= best_similarity:
+                best, best_similarity = index, similarity
+        return best
+
+    def _add(self, result: Dict[str, Any], url: Optional[str], signature: Optional[np.ndarray]) -> int:
+        """
+        Register a new source; the caller holds the lock
+        """
+        index = len(self.entries)
+        entry = {"id": f"S{index + 1}"}
+        if result.get("title"):
+            entry["title"] = result["title"]
+        if result.get("url"):
+            entry["url"] = clean_url(result["url"])
+        self.entries.append(entry)
+        self._by_id[entry["id"]] = index
+        self._signatures.append(signature)
+        if url:
+            self._by_url[url] = index
+        if signature is not None:
+            for band, key in enumerate(self._band_keys(signature)):
+                self._buckets[band].setdefault(key, []).append(index)
+        return index
+
+    def register(self, search_results: Any) -> Any:
+        """
+        Deduplicate search results and tag each one with its source's citation ID
+
+        A result is dropped when an earlier result in the same batch has the same canonical URL or
+        a near-identical passage; the result that is kept is the one whose text and URL are cited.
+        A URL seen in an earlier batch is kept and reuses its ID. A near-identical passage from an
+        earlier batch at a new URL gets its own ID, so a citation always points to the page whose
+        text was used.
+
+        Args:
+            search_results (Any): The search results (a list of url/content dicts)
+
+        Returns:
+            Any: The deduplicated results with a 'source_id' field (anything other than a list is
+            returned unchanged)
+        """
+        if not isinstance(search_results, list):
+            return search_results
+        start = time.perf_counter()
+        dicts = [result for result in search_results if isinstance(result, dict)]
+        signatures, present = self.hasher.signatures([str(result.get("content") or "") for result in dicts])
+        signature_of = {id(result): signatures[i] if present[i] else None for i, result in enumerate(dicts)}
+
+        deduplicated = []
+        batch_indices: Set[int] = set()
+        with self._lock:
+            for result in search_results:
+                if not isinstance(result, dict):
+                    deduplicated.append(result)
+                    continue
+                url = canonical_url(result["url"]) if result.get("url") else None
+                signature = signature_of[id(result)]
+                index = self._by_url.get(url) if url else None
+                if index is not None:
+                    self.url_duplicates += 1
+                elif signature is not None:
+                    index = self._near_duplicate(signature, batch_indices)
+                    if index is not None:
+                        self.near_duplicates += 1
+                if index is None:
+                    if url is None and signature is None:
+                        deduplicated.append(result)
+                        continue
+                    index = self._add(result, url, signature)
+
+                if index in batch_indices:
+                    continue
+                batch_indices.add(index)
+                deduplicated.append({**result, "source_id": self.entries[index]["id"]})
+            self.dedup_seconds += time.perf_counter() - start
+        return deduplicated
+
+    def lookup(self, source: Any) -> Optional[Dict[str, Any]]:
+        """
+        Find the registered source a findings entry refers to
+
+        Args:
+            source (Any): A citation ID ("S3"), a URL, or a dict with 'source_id', 'id' or 'url'
+
+        Returns:
+            Optional[Dict[str, Any]]: The registry entry (id, title, url), or None if unknown
+        """
+        index = None
+        with self._lock:
+            if isinstance(source, dict):
+                for key in ("source_id", "id"):
+                    if isinstance(source.get(key), str) and source[key] in self._by_id:
+                        index = self._by_id[source[key]]
+                        break
+                if index is None and isinstance(source.get("url"), str):
+                    index = self._by_url.get(canonical_url(source["url"]))
+            elif isinstance(source, str):
+                match = _SOURCE_ID.match(source.strip())
+                if match:
+                    index = self._by_id.get(match.group(1))
+                elif source.strip().startswith(("http://", "https://")):
+                    index = self._by_url.get(canonical_url(source))
+            return dict(self.entries[index]) if index is not None else None
+
+    def resolve(self, findings: Any) -> Any:
+        """
+        Replace the sources of findings with their registry entries, deduplicated by ID
+
+        Args:
+            findings (Any): Research findings; anything without a 'sources' list is returned unchanged
+
+        Returns:
+            Any: The findings with sources as {'id', 'title', 'url'} entries where they are known
+        """
+        if not isinstance(findings, dict) or not isinstance(findings.get("sources"), list):
+            return findings
+        sources = []
+        seen = set()
+        for source in findings["sources"]:
+            entry = self.lookup(source)
+            if entry is None:
+                sources.append(source)
+            elif entry["id"] not in seen:
+                seen.add(entry["id"])
+                sources.append(entry)
+        return {**findings, "sources": sources}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the registry size, duplicate counters and time spent deduplicating
+
+        Returns:
+            Dict[str, Any]: The registry statistics
+        """
+        with self._lock:
+            return {
+                "sources": len(self.entries),
+                "url_duplicates": self.url_duplicates,
+                "near_duplicates": self.near_duplicates,
+                "dedup_seconds": self.dedup_seconds,
+            }
@@ -0,0 +1,90 @@
+"""
+Tavily Client Module
+
+This module provides a lightweight Tavily search client that talks to the REST API directly,
+without importing LangChain. It mirrors the ``invoke``/``ainvoke`` interface and the result
+format of LangChain's ``TavilySearchResults`` so the two can be used interchangeably.
+"""
+
+from typing import Dict, Any, List, Optional
+import asyncio
+import json
+import os
+import urllib.request
+
+DEFAULT_TAVILY_URL = "https://api.tavily.com"
+
+
+class TavilyClient:
+    """
+    Minimal Tavily search client based on the standard library.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 search_depth: str = "advanced", timeout: float = 30.0):
+        """
+        Args:
+            api_key (Optional[str]): The Tavily API key (defaults to TAVILY_API_KEY)
+            base_url (Optional[str]): The API base URL (defaults to TAVILY_API_URL or the public API)
+            search_depth (str): Tavily search depth, 'basic' or 'advanced'
+            timeout (float): Request timeout in seconds
+        """
+        self.api_key = api_key or os.getenv("TAVILY_API_KEY", "")
+        self.base_url = (base_url or os.getenv("TAVILY_API_URL", DEFAULT_TAVILY_URL)).rstrip("/")
+        self.search_depth = search_depth
+        self.timeout = timeout
+
+    def search(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+        """
+        Run a search and return the results as url/content pairs
+
+        Args:
+            query (str): The search query
+            max_results (int): Maximum number of results to return
+
+        Returns:
+            List[Dict[str, Any]]: The search results
+        """
+        payload = json.dumps({
+            "api_key": self.api_key,
+            "query": query,
+            "max_results": max_results,
+            "search_depth": self.search_depth,
+        }).encode("utf-8")
+        request = urllib.request.Request(
+            f"{self.base_url}/search",
+            data=payload,
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            body = json.loads(response.read().decode("utf-8"))
+
+        return [
+            {"url": result.get("url"), "content": result.get("content")}
+            for result in body.get("results", [])
+        ]
+
+    def invoke(self, tool_input: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Run a search using the same input format as LangChain's TavilySearchResults
+
+        Args:
+            tool_input (Dict[str, Any]): A dict with 'query' and optionally 'max_results'
+
+        Returns:
+            List[Dict[str, Any]]: The search results
+        """
+        return self.search(tool_input["query"], tool_input.get("max_results", 5))
+
+    async def ainvoke(self, tool_input: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Run a search in a worker thread so the event loop is not blocked
+
+        Args:
+            tool_input (Dict[str, Any]): A dict with 'query' and optionally 'max_results'
+
+        Returns:
+            List[Dict[str, Any]]: The search results
+        """
+        return await asyncio.to_thread(self.invoke, tool_input)
@@ -0,0 +1,340 @@
+"""
+Tracing Module
+
+This module records spans for the stages of a research query (search, research completion, JSON
+parse, drafting, save) with their durations, bytes in/out and token usage. The active trace is
+carried in a context variable, so agents and helpers record spans without threading a tracer
+through every call, and the spans are stored in the workflow state as plain JSON. Exporters write
+finished traces as Prometheus text or OTLP-compatible JSON.
+"""
+
+from typing import Dict, Any, Iterator, List, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+import json
+import os
+import secrets
+import threading
+import time
+
+# Numeric span attributes that are summed when spans are aggregated
+METRIC_ATTRIBUTES = ["bytes_in", "bytes_out", "prompt_tokens", "completion_tokens"]
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Dict[str, Any]]] = ContextVar("current_span", default=None)
+
+
+class Trace:
+    """
+    Collection of spans for one query, backed by a JSON-serializable dict.
+    """
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            data (Optional[Dict[str, Any]]): Existing trace data ({'trace_id', 'spans'}) to append to
+        """
+        self.data = data if data is not None else {}
+        self.data.setdefault("trace_id", secrets.token_hex(16))
+        self.data.setdefault("spans", [])
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_state(cls, state: Dict[str, Any]) -> "Trace":
+        """
+        Return the trace stored in a workflow state, creating it on first use
+
+        Args:
+            state (Dict[str, Any]): The workflow state
+
+        Returns:
+            Trace: A trace that records its spans in state['trace']
+        """
+        return cls(state.setdefault("trace", {}))
+
+    @property
+    def trace_id(self) -> str:
+        return self.data["trace_id"]
+
+    @property
+    def spans(self) -> List[Dict[str, Any]]:
+        return self.data["spans"]
+
+    def add(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self.data["spans"].append(record)
+
+
+def summarize(spans: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Aggregate spans by name
+
+    Args:
+        spans (List[Dict[str, Any]]): The recorded spans
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Count, total duration and summed metric attributes per span name
+    """
+    summary: Dict[str, Dict[str, Any]] = {}
+    for record in spans:
+        totals = summary.setdefault(record["name"], {"count": 0, "duration": 0.0,
+                                                     **{name: 0 for name in METRIC_ATTRIBUTES}})
+        totals["count"] += 1
+        totals["duration"] += record.get("duration") or 0.0
+        for name in METRIC_ATTRIBUTES:
+            totals[name] += record["attributes"].get(name) or 0
+    return summary
+
+
+@contextmanager
+def use_trace(trace: Trace) -> Iterator[Trace]:
+    """
+    Make a trace the active one for the current context
+
+    Args:
+        trace (Trace): The trace spans are recorded in
+    """
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(None)
+    try:
+        yield trace
+    finally:
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Record a span in the active trace; does nothing when no trace is active
+
+    Args:
+        name (str): The span name, e.g. 'search' or 'research_completion'
+        **attributes (Any): Initial span attributes (JSON scalars)
+
+    Yields:
+        Dict[str, Any]: The span record; its 'attributes' may be updated while the span is open
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield {"name": name, "attributes": dict(attributes)}
+        return
+
+    parent = _current_span.get()
+    record = {
+        "name": name,
+        "span_id": secrets.token_hex(8),
+        "parent_id": parent["span_id"] if parent else None,
+        "start": time.time(),
+        "duration": None,
+        "attributes": dict(attributes),
+    }
+    token = _current_span.set(record)
+    start = time.perf_counter()
+    try:
+        yield record
+    except BaseException as e:
+        record["attributes"]["error"] = type(e).__name__
+        raise
+    finally:
+        record["duration"] = time.perf_counter() - start
+        _current_span.reset(token)
+        trace.add(record)
+
+
+def annotate(**attributes: Any) -> None:
+    """
+    Set attributes on the innermost open span, if any
+
+    Args:
+        **attributes (Any): Attributes to set (JSON scalars); None values are ignored
+    """
+    record = _current_span.get()
+    if record is not None:
+        record["attributes"].update({key: value for key, value in attributes.items() if value is not None})
+
+
+def payload_bytes(value: Any) -> int:
+    """
+    Size of a value in bytes once encoded as UTF-8 text (JSON for non-strings)
+
+    Args:
+        value (Any): The payload
+
+    Returns:
+        int: The size in bytes
+    """
+    if value is None:
+        return 0
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False, default=str)
+    return len(value.encode("utf-8"))
+
+
+def format_profile(trace_data: Dict[str, Any]) -> str:
+    """
+    Render a trace as an indented table of spans
+
+    Args:
+        trace_data (Dict[str, Any]): The trace stored in a workflow state
+
+    Returns:
+        str: The table
+    """
+    spans = sorted(trace_data.get("spans", []), key=lambda record: record["start"])
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for record in spans:
+        children.setdefault(record.get("parent_id"), []).append(record)
+
+    lines = [f"{'span':<32}{'ms':>10}{'bytes in':>11}{'bytes out':>11}{'prompt tok':>12}{'compl tok':>11}"]
+
+    def walk(parent_id: Optional[str], depth: int) -> None:
+        for record in children.get(parent_id, []):
+            attributes = record["attributes"]
+            label = ("  " * depth + record["name"] + (" (cached)" if attributes.get("cached") else ""))[:31]
+            lines.append(
+                f"{label:<32}{(record['duration'] or 0) * 1000:>10.1f}"
+                f"{attributes.get('bytes_in', ''):>11}{attributes.get('bytes_out', ''):>11}"
+                f"{attributes.get('prompt_tokens', ''):>12}{attributes.get('completion_tokens', ''):>11}"
+            )
+            walk(record["span_id"], depth + 1)
+
+    walk(None, 0)
+    return "\n".join(lines)
+
+
+class TraceExporter:
+    """
+    Base class for trace exporters.
+    """
+
+    def export(self, state: Dict[str, Any]) -> None:
+        """
+        Export the trace of a finished workflow state
+
+        Args:
+            state (Dict[str, Any]): The workflow state; its trace is in state['trace']
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """
+        Release any resources held by the exporter
+        """
+
+
+class PrometheusTextExporter(TraceExporter):
+    """
+    Exporter that maintains per-span counters in a Prometheus text-format file, suitable for
+    the node exporter's textfile collector. The file is rewritten atomically on every export.
+    """
+
+    def __init__(self, path: str, prefix: str = "research"):
+        """
+        Args:
+            path (str): Path of the metrics file
+            prefix (str): Metric name prefix
+        """
+        self.path = path
+        self.prefix = prefix
+        self.queries: Dict[str, int] = {}
+        self.totals: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def export(self, state: Dict[str, Any]) -> None:
+        with self._lock:
+            status = state.get("status", "unknown")
+            self.queries[status] = self.queries.get(status, 0) + 1
+            for name, values in summarize(state.get("trace", {}).get("spans", [])).items():
+                totals = self.totals.setdefault(name, {key: 0 for key in values})
+                for key, value in values.items():
+                    totals[key] += value
+            self._write()
+
+    def _write(self) -> None:
+        prefix = self.prefix
+        lines = [f"# TYPE {prefix}_queries_total counter"]
+        lines += [f'{prefix}_queries_total{{status="{status}"}} {count}' for status, count in sorted(self.queries.items())]
+        metrics = [("span_count_total", "count"), ("span_duration_seconds_total", "duration")]
+        metrics += [(f"span_{name}_total", name) for name in METRIC_ATTRIBUTES]
+        for metric, key in metrics:
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            lines += [f'{prefix}_{metric}{{span="{name}"}} {totals[key]}' for name, totals in sorted(self.totals.items())]
+
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(temporary, self.path)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OTLPJsonExporter(TraceExporter):
+    """
+    Exporter that appends one OTLP/JSON ExportTraceServiceRequest per query to a file,
+    one request per line, for ingestion by an OpenTelemetry collector.
+    """
+
+    def __init__(self, path: str, service_name: str = "github-research"):
+        """
+        Args:
+            path (str): Path of the output file
+            service_name (str): Value of the service.name resource attribute
+        """
+        self.path = path
+        self.service_name = service_name
+        self._lock = threading.Lock()
+
+    def to_otlp(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert the trace of a workflow state to an OTLP/JSON request
+
+        Args:
+            state (Dict[str, Any]): The workflow state
+
+        Returns:
+            Dict[str, Any]: The ExportTraceServiceRequest
+        """
+        trace_data = state.get("trace", {})
+        spans = []
+        for record in trace_data.get("spans", []):
+            start = int(record["start"] * 1e9)
+            attributes = dict(record["attributes"])
+            error = attributes.pop("error", None)
+            spans.append({
+                "traceId": trace_data.get("trace_id"),
+                "spanId": record["span_id"],
+                "parentSpanId": record.get("parent_id") or "",
+                "name": record["name"],
+                "kind": 1,
+                "startTimeUnixNano": str(start),
+                "endTimeUnixNano": str(start + int((record["duration"] or 0) * 1e9)),
+                "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()],
+                "status": {"code": 2, "message": error} if error else {"code": 1},
+            })
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                "scopeSpans": [{"scope": {"name": "github_research"}, "spans": spans}],
+            }]
+        }
+
+    def export(self, state: Dict[str, Any]) -> None:
+        line = json.dumps(self.to_otlp(state), ensure_ascii=False, separators=(",", ":"))
+        directory = os.path.dirname(self.path)
+        with self._lock:
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
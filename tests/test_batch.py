@@ -0,0 +1,75 @@
+from github_batch import BatchRunner, CheckpointStore, query_key
+
+
+class StubWorkflow:
+    """Workflow whose drafting stage fails a set number of times per query."""
+
+    def __init__(self, draft_failures=0):
+        self.draft_failures = draft_failures
+        self.calls = []
+
+    def new_state(self, query):
+        return {"query": query, "status": "pending"}
+
+    def reuse_stage(self, state):
+        return False
+
+    def research_stage(self, state):
+        self.calls.append(("research", state["query"]))
+        state["research_results"] = {"main_findings": [f"about {state['query']}"]}
+        state["status"] = "research_completed"
+
+    def draft_stage(self, state):
+        self.calls.append(("draft", state["query"]))
+        if self.draft_failures:
+            self.draft_failures -= 1
+            raise RuntimeError("model unavailable")
+        state["answer"] = {"answer": "done", "findings": state["research_results"]}
+        state["status"] = "completed"
+
+    def remember_stage(self, state):
+        self.calls.append(("remember", state["query"]))
+
+
+def test_failed_drafting_resumes_without_researching_again(tmp_path):
+    checkpoints = CheckpointStore(str(tmp_path / "checkpoints.sqlite3"))
+    workflow = StubWorkflow(draft_failures=1)
+    runner = BatchRunner(workflow, checkpoints, workers=1)
+    try:
+        first = runner.run(["dna sequencing"])
+        failed = checkpoints.get("dna sequencing")
+        workflow.calls.clear()
+        second = runner.run(["dna sequencing"])
+        completed = checkpoints.get("dna sequencing")
+    finally:
+        checkpoints.close()
+
+    assert first == {"completed": 0, "failed": 1, "skipped": 0}
+    assert (failed["stage"], failed["attempts"], failed["error"]) == ("researched", 1, "model unavailable")
+    assert second == {"completed": 1, "failed": 0, "skipped": 0}
+    assert workflow.calls == [("draft", "dna sequencing"), ("remember", "dna sequencing")]
+    assert completed["stage"] == "completed" and completed["error"] is None
+    assert completed["state"]["research_results"] == {"main_findings": ["about dna sequencing"]}
+
+
+def test_completed_and_exhausted_queries_are_skipped(tmp_path):
+    checkpoints = CheckpointStore(str(tmp_path / "checkpoints.sqlite3"))
+    runner = BatchRunner(StubWorkflow(draft_failures=10), checkpoints, workers=1, max_attempts=2)
+    try:
+        runner.run(["broken"])
+        runner.run(["broken"])
+        runner.workflow = StubWorkflow()
+        runner.run(["works"])
+        workflow = runner.workflow
+        counts = runner.run(["broken", "works", "works"])
+        summary = checkpoints.summary()
+    finally:
+        checkpoints.close()
+
+    assert counts == {"completed": 0, "failed": 0, "skipped": 2}
+    assert workflow.calls == [("research", "works"), ("draft", "works"), ("remember", "works")]
+    assert summary == {"pending": 0, "researched": 1, "completed": 1, "failed": 1}
+
+
+def test_query_key_ignores_whitespace():
+    assert query_key("dna  sequencing ") == query_key("dna sequencing")
@@ -0,0 +1,38 @@
+import pytest
+
+from github_findings import FindingsParseError, parse_findings
+
+PAYLOAD = '{"main_findings": ["DNA is read in fragments"], "sources": ["https://example.com"]}'
+
+
+def test_parse_findings_plain_object():
+    assert parse_findings(PAYLOAD).main_findings == ["DNA is read in fragments"]
+
+
+@pytest.mark.parametrize("prose", [
+    'The model says "{oops" then ',
+    "Use the format {...} as requested: ",
+    'Example: {"note": "ignored"} and the findings: ',
+    "Stray closing } and opening { braces, then ",
+])
+def test_parse_findings_skips_prose_with_braces(prose):
+    findings = parse_findings(prose + PAYLOAD)
+    assert findings.main_findings == ["DNA is read in fragments"]
+    assert findings.sources == ["https://example.com"]
+
+
+@pytest.mark.parametrize("text", [
+    "The format is {...} with no payload",
+    # main_findings holds objects, not strings; the nested object must not be used on its own
+    '{"main_findings": [{"fact": "DNA"}], "detailed_notes": {"a": "b"}, "sources": ["https://example.com"]}',
+    'Here: {"summary": "no schema fields"}',
+])
+def test_parse_findings_without_valid_object(text):
+    with pytest.raises(FindingsParseError):
+        parse_findings(text)
+
+
+def test_parse_findings_strict_requires_main_findings():
+    assert parse_findings('{"main_findings": [], "sources": []}').main_findings == []
+    with pytest.raises(FindingsParseError):
+        parse_findings('{"main_findings": [], "sources": []}', strict=True)
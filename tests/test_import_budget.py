@@ -0,0 +1,20 @@
+import pytest
+
+from github_import_budget import DEFAULT_BUDGET, DEFERRED_MODULES, measure_import
+
+
+@pytest.mark.parametrize("module", ["github_main", "github_batch"])
+def test_entry_point_import_stays_within_budget(module):
+    result = measure_import(module)
+
+    assert result["seconds"] < DEFAULT_BUDGET
+    assert result["loaded"] == []
+
+
+def test_heavy_dependencies_are_deferred():
+    assert {"langchain", "azure.ai.inference", "azure.core", "numpy"} <= set(DEFERRED_MODULES)
+
+
+def test_probe_detects_loaded_deferred_modules():
+    # github_sources imports NumPy at module level; it is only ever imported lazily
+    assert "numpy" in measure_import("github_sources", runs=1)["loaded"]
@@ -0,0 +1,15 @@
+import json
+
+from github_main import save_results
+
+
+def test_saved_json_includes_the_save_span(tmp_path):
+    results = {"query": "dna sequencing", "status": "completed", "research_results": {"main_findings": []},
+               "answer": None, "trace": {"trace_id": "t1", "spans": []}}
+
+    json_path, _ = save_results(results, str(tmp_path))
+
+    with open(json_path, encoding="utf-8") as f:
+        saved = json.load(f)
+    assert [record["name"] for record in saved["trace"]["spans"]] == ["save"]
+    assert saved["trace"]["spans"][0]["duration"] is not None
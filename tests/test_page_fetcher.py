@@ -0,0 +1,113 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from github_page_fetcher import PageCache, PageFetcher
+
+PAGE = b"<html><body><nav>Menu</nav><article><p>Sequencing reads DNA in fragments.</p></article></body></html>"
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests = []
+
+    def do_GET(self):
+        Handler.requests.append((self.path, dict(self.headers)))
+        if self.path == "/page":
+            if self.headers.get("If-None-Match") == '"v1"':
+                return self._send(304, b"")
+            return self._send(200, PAGE, {"Content-Type": "text/html; charset=utf-8", "ETag": '"v1"'})
+        if self.path == "/old":
+            return self._send(301, b"", {"Location": "/new"})
+        if self.path == "/new":
+            return self._send(200, PAGE, {"Content-Type": "text/html", "ETag": '"new"'})
+        if self.path == "/latin":
+            return self._send(200, "<p>Café au lait</p>".encode("latin-1"),
+                              {"Content-Type": "text/html; charset=iso-8859-1"})
+        if self.path == "/image":
+            return self._send(200, b"\x89PNG\r\n", {"Content-Type": "image/png"})
+        self._send(404, b"")
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    Handler.requests = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def requests_to(path):
+    return [headers for request_path, headers in Handler.requests if request_path == path]
+
+
+def test_changed_page_is_fetched_then_revalidated_with_304(server, tmp_path):
+    # A negative TTL makes every cached entry stale, so each fetch revalidates
+    fetcher = PageFetcher(cache=PageCache(str(tmp_path / "pages.sqlite3"), ttl=-1))
+    try:
+        first = fetcher.fetch_all([f"{server}/page"])
+        second = fetcher.fetch_all([f"{server}/page"])
+        stats = fetcher.stats()
+    finally:
+        fetcher.close()
+
+    assert first[f"{server}/page"] == "Sequencing reads DNA in fragments."
+    assert second == first
+    assert stats["fetched"] == 1 and stats["not_modified"] == 1
+    assert "If-None-Match" not in requests_to("/page")[0]
+    assert requests_to("/page")[1]["If-None-Match"] == '"v1"'
+
+
+def test_redirect_is_followed_without_the_original_validators(server, tmp_path):
+    cache = PageCache(str(tmp_path / "pages.sqlite3"), ttl=-1)
+    cache.set(f"{server}/old", "stale text", etag='"old"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    fetcher = PageFetcher(cache=cache)
+    try:
+        pages = fetcher.fetch_all([f"{server}/old"])
+        entry = cache.get(f"{server}/old")
+    finally:
+        fetcher.close()
+
+    assert pages[f"{server}/old"] == "Sequencing reads DNA in fragments."
+    assert requests_to("/old")[0]["If-None-Match"] == '"old"'
+    target_headers = requests_to("/new")[0]
+    assert "If-None-Match" not in target_headers and "If-Modified-Since" not in target_headers
+    # The target's ETag must not be replayed against the original URL
+    assert entry["text"] == "Sequencing reads DNA in fragments." and entry["etag"] is None
+
+
+def test_declared_charset_is_used(server):
+    fetcher = PageFetcher()
+    try:
+        pages = fetcher.fetch_all([f"{server}/latin"])
+    finally:
+        fetcher.close()
+
+    assert pages[f"{server}/latin"] == "Café au lait"
+
+
+def test_non_text_content_type_is_rejected(server):
+    fetcher = PageFetcher()
+    try:
+        pages = fetcher.fetch_all([f"{server}/image", f"{server}/missing"])
+        stats = fetcher.stats()
+    finally:
+        fetcher.close()
+
+    assert pages == {f"{server}/image": None, f"{server}/missing": None}
+    assert stats["failed"] == 2 and stats["fetched"] == 0
@@ -0,0 +1,162 @@
+import threading
+import time
+
+import pytest
+
+from github_pipeline import PipelineRunner
+
+
+class StubWorkflow:
+    """Workflow with the stage methods the pipeline calls, recording each call."""
+
+    def __init__(self, research_delay=None, draft_gate=None, fail_research=(), fail_draft=(), reused=()):
+        self.research_delay = research_delay or (lambda query: 0)
+        self.draft_gate = draft_gate
+        self.fail_research = set(fail_research)
+        self.fail_draft = set(fail_draft)
+        self.reused = set(reused)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def _record(self, stage, state):
+        with self.lock:
+            self.calls.append((stage, state["query"]))
+
+    def new_state(self, query):
+        return {"query": query, "status": "pending"}
+
+    def reuse_stage(self, state):
+        if state["query"] not in self.reused:
+            return False
+        self._record("reuse", state)
+        state["answer"] = "stored"
+        state["status"] = "completed"
+        return True
+
+    def research_stage(self, state):
+        self._record("research", state)
+        time.sleep(self.research_delay(state["query"]))
+        if state["query"] in self.fail_research:
+            raise RuntimeError("search failed")
+        state["research_results"] = {"query": state["query"]}
+
+    def draft_stage(self, state):
+        if self.draft_gate is not None:
+            self.draft_gate.wait()
+        self._record("draft", state)
+        if state["query"] in self.fail_draft:
+            raise RuntimeError("drafting failed")
+        state["answer"] = f"answer to {state['query']}"
+        state["status"] = "completed"
+
+    def remember_stage(self, state):
+        self._record("remember", state)
+
+
+def run_with_timeout(function, timeout=10):
+    outcome = {}
+
+    def target():
+        try:
+            outcome["value"] = function()
+        except Exception as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "pipeline did not finish"
+    return outcome
+
+
+def test_results_are_delivered_in_input_order():
+    queries = [f"q{i}" for i in range(8)]
+    # Earlier queries take longer, so they finish last
+    workflow = StubWorkflow(research_delay=lambda query: (8 - int(query[1:])) * 0.01)
+    runner = PipelineRunner(workflow, research_workers=4, drafting_workers=2, queue_size=2, ordered=True)
+
+    states = run_with_timeout(lambda: runner.run_all(queries))["value"]
+
+    assert [state["query"] for state in states] == queries
+    assert all(state["status"] == "completed" for state in states)
+
+
+def test_unordered_run_delivers_every_query():
+    queries = [f"q{i}" for i in range(8)]
+    workflow = StubWorkflow(research_delay=lambda query: (8 - int(query[1:])) * 0.01)
+    runner = PipelineRunner(workflow, research_workers=4, drafting_workers=2, ordered=False)
+
+    states = run_with_timeout(lambda: runner.run_all(queries))["value"]
+
+    assert sorted(state["query"] for state in states) == sorted(queries)
+
+
+def test_full_queues_stop_the_feeder():
+    consumed = []
+
+    def queries():
+        for i in range(50):
+            consumed.append(i)
+            yield f"q{i}"
+
+    gate = threading.Event()
+    runner = PipelineRunner(StubWorkflow(draft_gate=gate), research_workers=1, drafting_workers=1, queue_size=1)
+    outcome = {}
+    thread = threading.Thread(target=lambda: outcome.update(states=runner.run_all(queries())), daemon=True)
+    thread.start()
+    time.sleep(0.5)
+
+    # One query per worker and per queue slot, plus the one the feeder is blocked on
+    assert len(consumed) <= 6
+    gate.set()
+    thread.join(10)
+    assert not thread.is_alive()
+    assert len(outcome["states"]) == 50
+
+
+def test_failed_queries_do_not_affect_the_others():
+    workflow = StubWorkflow(fail_research={"q1"}, fail_draft={"q3"})
+    runner = PipelineRunner(workflow, research_workers=2, drafting_workers=2)
+
+    states = run_with_timeout(lambda: runner.run_all([f"q{i}" for i in range(5)]))["value"]
+
+    statuses = {state["query"]: state["status"] for state in states}
+    assert statuses == {"q0": "completed", "q1": "error", "q2": "completed", "q3": "error", "q4": "completed"}
+    assert states[1]["error"] == "search failed"
+    assert states[3]["error"] == "drafting failed"
+
+
+def test_queries_iterable_error_is_raised_after_queued_results():
+    def queries():
+        yield "q0"
+        raise ValueError("bad queries file")
+
+    runner = PipelineRunner(StubWorkflow(), research_workers=2, drafting_workers=2)
+    delivered = []
+
+    def consume():
+        for state in runner.run(queries()):
+            delivered.append(state)
+
+    outcome = run_with_timeout(consume)
+
+    assert isinstance(outcome["error"], ValueError)
+    assert [state["query"] for state in delivered] == ["q0"]
+
+
+def test_reused_queries_skip_research_and_new_answers_are_remembered():
+    workflow = StubWorkflow(reused={"q1"})
+    runner = PipelineRunner(workflow, research_workers=1, drafting_workers=1)
+
+    states = run_with_timeout(lambda: runner.run_all(["q0", "q1"]))["value"]
+
+    assert [state["answer"] for state in states] == ["answer to q0", "stored"]
+    assert ("research", "q1") not in workflow.calls
+    assert ("remember", "q0") in workflow.calls
+    assert ("remember", "q1") not in workflow.calls
+
+
+@pytest.mark.parametrize("workers", [0, -1])
+def test_each_stage_needs_a_worker(workers):
+    with pytest.raises(ValueError):
+        PipelineRunner(StubWorkflow(), research_workers=workers)
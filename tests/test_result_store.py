@@ -0,0 +1,39 @@
+import pytest
+
+from github_result_store import JsonlResultStore, iter_results
+
+
+class FailingIndex:
+    def add(self, results, location):
+        raise OSError("index is read-only")
+
+
+def test_written_results_can_be_read_back(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    with JsonlResultStore(path) as store:
+        store.write({"query": "a"})
+        store.write({"query": "b"})
+
+    assert [results["query"] for _, results in iter_results(path)] == ["a", "b"]
+
+
+def test_write_after_writer_failure_raises_with_the_cause(tmp_path):
+    store = JsonlResultStore(str(tmp_path / "results.jsonl"), archive_index=FailingIndex())
+    store.write({"query": "a"})
+    store._writer.join(5)
+    assert not store._writer.is_alive()
+
+    with pytest.raises(RuntimeError) as raised:
+        store.write({"query": "b"})
+    assert isinstance(raised.value.__cause__, OSError)
+
+
+def test_put_to_dead_writer_does_not_drop_the_result_silently(tmp_path):
+    store = JsonlResultStore(str(tmp_path / "results.jsonl"), archive_index=FailingIndex())
+    store.write({"query": "a"})
+    store._writer.join(5)
+
+    # The state write() sees when the writer dies between its check and the queue put
+    with pytest.raises(RuntimeError) as raised:
+        store._put({"query": "b"})
+    assert isinstance(raised.value.__cause__, OSError)
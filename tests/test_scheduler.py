@@ -0,0 +1,188 @@
+from email.utils import formatdate
+
+import pytest
+
+import github_scheduler
+from github_scheduler import AdaptiveLimiter, CallScheduler, ProviderState, TokenBucket, retry_info
+
+
+class FakeTime:
+    """Stand-in for the time module: the clock only moves when told to or when sleeping."""
+
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def perf_counter(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class Response:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+class HttpError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = Response(headers or {})
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(github_scheduler, "time", fake)
+    return fake
+
+
+def test_token_bucket_refills_at_its_rate(clock):
+    bucket = TokenBucket(per_minute=60)
+
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+    clock.advance(30)
+    # 30 units refilled, one of which pays back the overdraft
+    assert bucket.reserve(29) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+
+
+def test_token_bucket_never_exceeds_its_capacity(clock):
+    bucket = TokenBucket(per_minute=60)
+    clock.advance(3600)
+
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+
+
+def test_token_bucket_adjust_charges_the_real_cost(clock):
+    bucket = TokenBucket(per_minute=60)
+    bucket.reserve(10)
+    bucket.adjust(50)
+
+    assert bucket.reserve(1) == pytest.approx(1.0)
+
+
+def test_limiter_halves_on_throttle_and_grows_after_successes():
+    limiter = AdaptiveLimiter(initial=8, minimum=1, maximum=10, increase_after=5)
+
+    limiter.on_throttle()
+    assert limiter.limit == 4
+    for _ in range(3):
+        limiter.on_throttle()
+    assert limiter.limit == 1
+
+    for _ in range(4):
+        limiter.on_success()
+    assert limiter.limit == 1
+    limiter.on_success()
+    assert limiter.limit == 2
+
+
+def test_limiter_throttle_resets_the_success_run():
+    limiter = AdaptiveLimiter(initial=4, increase_after=3)
+    limiter.on_success()
+    limiter.on_success()
+    limiter.on_throttle()
+    limiter.on_success()
+
+    assert limiter.limit == 2
+
+
+def test_retry_after_seconds():
+    assert retry_info(HttpError(429, {"Retry-After": "7"})) == (True, True, 7.0)
+
+
+def test_retry_after_http_date(clock):
+    error = HttpError(503, {"Retry-After": formatdate(clock.now + 30, usegmt=True)})
+
+    retryable, throttled, retry_after = retry_info(error)
+
+    assert (retryable, throttled) == (True, False)
+    assert retry_after == pytest.approx(30, abs=1)
+
+
+def test_retry_after_date_in_the_past_is_zero(clock):
+    error = HttpError(429, {"Retry-After": formatdate(clock.now - 60, usegmt=True)})
+
+    assert retry_info(error)[2] == 0.0
+
+
+def test_retry_after_milliseconds_take_precedence():
+    assert retry_info(HttpError(429, {"retry-after-ms": "250", "Retry-After": "9"}))[2] == 0.25
+
+
+def test_unparseable_retry_after_is_ignored():
+    assert retry_info(HttpError(429, {"Retry-After": "soon"})) == (True, True, None)
+
+
+def test_client_errors_are_not_retried():
+    assert retry_info(HttpError(400)) == (False, False, None)
+
+
+def test_network_errors_are_retried():
+    assert retry_info(ConnectionResetError("reset")) == (True, False, None)
+    assert retry_info(ValueError("bad")) == (False, False, None)
+
+
+def test_call_honors_retry_after_and_backs_off_on_429(clock):
+    scheduler = CallScheduler({"github": ProviderState(initial_concurrency=8)}, base_delay=0.01)
+    errors = [HttpError(429, {"Retry-After": "3"}), HttpError(429, {"Retry-After": "3"})]
+
+    def call():
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    assert scheduler.call("github", call) == "ok"
+    assert clock.sleeps == [3.0, 3.0]
+    stats = scheduler.stats()["github"]
+    assert stats == {"calls": 3, "retries": 2, "throttled": 2, "failures": 0, "concurrency_limit": 2}
+
+
+def test_call_waits_for_the_request_bucket(clock):
+    scheduler = CallScheduler({"tavily": ProviderState(requests_per_minute=60)})
+    for _ in range(60):
+        scheduler.call("tavily", lambda: None)
+    assert clock.sleeps == []
+
+    scheduler.call("tavily", lambda: None)
+    assert clock.sleeps == [pytest.approx(1.0)]
+
+
+def test_call_raises_after_max_retries(clock):
+    scheduler = CallScheduler(max_retries=2, base_delay=0.01)
+
+    def call():
+        raise HttpError(503)
+
+    with pytest.raises(HttpError):
+        scheduler.call("github", call)
+    stats = scheduler.stats()["github"]
+    assert (stats["calls"], stats["retries"], stats["failures"]) == (3, 2, 1)
+
+
+def test_call_does_not_retry_client_errors(clock):
+    scheduler = CallScheduler()
+    calls = []
+
+    def call():
+        calls.append(1)
+        raise HttpError(401)
+
+    with pytest.raises(HttpError):
+        scheduler.call("github", call)
+    assert len(calls) == 1 and clock.sleeps == []
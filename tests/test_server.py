@@ -0,0 +1,75 @@
+import time
+
+from github_server import ResearchService
+
+
+class StubWorkflow:
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def process_query(self, query):
+        if self.fail:
+            raise RuntimeError("workflow crashed")
+        return {"query": query, "status": "completed", "answer": "done"}
+
+    def close(self):
+        pass
+
+
+class FailingOutput:
+    def __init__(self):
+        self.calls = 0
+
+    def export(self, state):
+        self.calls += 1
+        raise OSError("disk full")
+
+    write = export
+
+    def close(self):
+        pass
+
+
+def finish(service, query):
+    job, _ = service.submit(query)
+    job.future.exception(timeout=10)
+    return job
+
+
+def test_output_failures_are_recorded_and_the_job_finishes():
+    exporter, sink = FailingOutput(), FailingOutput()
+    service = ResearchService(StubWorkflow(), max_workers=1, sink=sink, exporters=[exporter, FailingOutput()])
+    try:
+        job = finish(service, "dna")
+        data = job.to_dict()
+    finally:
+        service.close()
+
+    assert job.status == "completed"
+    assert job.finished is not None
+    assert data["result"]["answer"] == "done"
+    assert exporter.calls == 1 and sink.calls == 1
+    assert data["output_errors"] == ["FailingOutput: disk full"] * 3
+
+
+def test_failed_workflow_still_finishes_the_job():
+    service = ResearchService(StubWorkflow(fail=True), max_workers=1)
+    try:
+        job = finish(service, "dna")
+    finally:
+        service.close()
+
+    assert job.status == "error"
+    assert job.finished is not None
+    assert job.to_dict()["error"] == "workflow crashed"
+
+
+def test_finished_jobs_expire():
+    service = ResearchService(StubWorkflow(), max_workers=1, job_ttl=0.0, exporters=[FailingOutput()])
+    try:
+        job = finish(service, "dna")
+        time.sleep(0.01)
+        service.submit("another query")[0].future.result(timeout=10)
+        assert service.get(job.id) is None
+    finally:
+        service.close()
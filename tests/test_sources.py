@@ -0,0 +1,111 @@
+import pytest
+
+from github_sources import SourceRegistry, canonical_url, clean_url
+
+PASSAGE = (
+    "CRISPR gene editing lets researchers cut DNA at a chosen location using a guide RNA and the "
+    "Cas9 enzyme, and the cell then repairs the break, which can disable a gene or insert a new "
+    "sequence supplied as a template alongside the editing components"
+)
+OTHER = (
+    "Solid state batteries replace the liquid electrolyte with a ceramic or polymer layer, which "
+    "promises higher energy density and fewer fires but is still hard to manufacture at scale"
+)
+
+
+def near_copy(text):
+    return text.replace("chosen location", "chosen position")
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://www.example.com/a", "example.com/a"),
+    ("http://Example.COM/a", "example.com/a"),
+    ("https://example.com:443/a", "example.com/a"),
+    ("http://example.com:80/a", "example.com/a"),
+    ("https://example.com:8443/a", "example.com:8443/a"),
+    ("https://example.com/a#section-2", "example.com/a"),
+    ("https://example.com/a/", "example.com/a"),
+    ("https://example.com/", "example.com"),
+    ("https://example.com/a?utm_source=news&fbclid=x&REF=y", "example.com/a"),
+    ("https://example.com/a?z=1&utm_medium=mail&a=2", "example.com/a?a=2&z=1"),
+])
+def test_canonical_url(url, expected):
+    assert canonical_url(url) == expected
+
+
+def test_clean_url_keeps_the_page_address():
+    assert (clean_url("https://www.example.com/a/?z=1&utm_source=x&a=2#top")
+            == "https://www.example.com/a/?z=1&a=2")
+
+
+def test_same_url_variants_within_a_batch_are_dropped():
+    registry = SourceRegistry()
+    results = registry.register([
+        {"url": "https://www.example.com/crispr/?utm_source=feed", "title": "CRISPR", "content": PASSAGE},
+        {"url": "http://example.com/crispr#history", "content": OTHER},
+    ])
+
+    assert len(results) == 1
+    assert results[0]["source_id"] == "S1"
+    assert results[0]["content"] == PASSAGE
+    assert registry.entries == [{"id": "S1", "title": "CRISPR", "url": "https://www.example.com/crispr/"}]
+    assert registry.stats()["url_duplicates"] == 1
+
+
+def test_near_duplicate_passages_within_a_batch_are_dropped():
+    registry = SourceRegistry()
+    results = registry.register([
+        {"url": "https://a.example/crispr", "content": PASSAGE},
+        {"url": "https://b.example/mirror", "content": near_copy(PASSAGE)},
+        {"url": "https://c.example/batteries", "content": OTHER},
+        "not a search result",
+    ])
+
+    assert [result["url"] if isinstance(result, dict) else result for result in results] == [
+        "https://a.example/crispr", "https://c.example/batteries", "not a search result",
+    ]
+    assert [result["source_id"] for result in results[:2]] == ["S1", "S2"]
+    assert registry.stats()["near_duplicates"] == 1
+    assert len(registry.entries) == 2
+
+
+def test_ids_are_stable_across_batches():
+    registry = SourceRegistry()
+    registry.register([
+        {"url": "https://a.example/crispr", "content": PASSAGE},
+        {"url": "https://c.example/batteries", "content": OTHER},
+    ])
+    results = registry.register([
+        {"url": "https://c.example/batteries/?utm_campaign=x", "content": OTHER},
+        {"url": "https://b.example/mirror", "content": near_copy(PASSAGE)},
+        {"url": "https://www.a.example/crispr", "content": PASSAGE},
+    ])
+
+    # Known URLs reuse their IDs; a near-identical passage at a new URL is a new, citable source
+    assert [result["source_id"] for result in results] == ["S2", "S3", "S1"]
+    assert registry.entries[2]["url"] == "https://b.example/mirror"
+    assert registry.stats()["near_duplicates"] == 0
+
+
+def test_resolve_maps_sources_to_entries():
+    registry = SourceRegistry()
+    registry.register([
+        {"url": "https://a.example/crispr", "title": "CRISPR", "content": PASSAGE},
+        {"url": "https://c.example/batteries", "content": OTHER},
+    ])
+    findings = registry.resolve({
+        "main_findings": ["x"],
+        "sources": ["[S1] CRISPR", "https://www.a.example/crispr/", {"source_id": "S2"}, "a book"],
+    })
+
+    assert findings["sources"] == [
+        {"id": "S1", "title": "CRISPR", "url": "https://a.example/crispr"},
+        {"id": "S2", "url": "https://c.example/batteries"},
+        "a book",
+    ]
+
+
+def test_non_list_results_are_returned_unchanged():
+    registry = SourceRegistry()
+    assert registry.register("search failed") == "search failed"
+    assert registry.entries == []